@@ -1,5 +1,6 @@
 import copy
 import inspect
+import io
 import re
 import warnings
 from typing import TYPE_CHECKING
@@ -15,25 +16,29 @@ from pyramid.httpexceptions import (
     HTTPServiceUnavailable,
     HTTPUnauthorized
 )
-from pyramid.request import Request
+from pyramid.request import Request, apply_request_extensions
 from pyramid.response import Response
 from pyramid_beaker import set_cache_regions_from_settings
 from requests.exceptions import HTTPError
-from six.moves.urllib.parse import parse_qsl, urlparse
+from six.moves.urllib.parse import parse_qsl, unquote, urlparse
 
 from magpie.__meta__ import __version__ as magpie_version
 from magpie.adapter.magpieowssecurity import MagpieOWSSecurity
 from magpie.adapter.magpieservice import MagpieServiceStore
 from magpie.api.exception import evaluate_call, raise_http, valid_http, verify_param
 from magpie.api.generic import get_request_info
+from magpie.api.home.home import get_metrics
 from magpie.api.schemas import SigninAPI
 from magpie.app import setup_magpie_configs
 from magpie.compat import LooseVersion
 from magpie.constants import get_constant
+from magpie.metrics import get_metrics_permission, is_metrics_enabled, setup_metrics
 from magpie.security import get_auth_config
+from magpie.timing import setup_request_timings
 from magpie.utils import (
     CONTENT_TYPE_JSON,
     SingletonMeta,
+    get_authenticate_headers,
     get_cookies,
     get_json,
     get_logger,
@@ -105,7 +110,7 @@ if LooseVersion(twitcher_version) == LooseVersion("0.6.0"):
     )
 
 if TYPE_CHECKING:
-    from typing import Optional, Union
+    from typing import Dict, List, Optional, Tuple, Union
 
     from pyramid.authentication import AuthTktCookieHelper
     from pyramid.config import Configurator
@@ -119,6 +124,7 @@ if TYPE_CHECKING:
         ServiceConfigItem,
         ServiceHookConfigItem,
         ServiceHookType,
+        ServicesSettings,
         Str
     )
 
@@ -128,6 +134,64 @@ if TYPE_CHECKING:
 LOGGER = get_logger("TWITCHER|{}".format(__name__))
 
 
+class ServiceHook(object):
+    """
+    Prepared definition of a :term:`Service Hook` that can be matched and called without any further resolution.
+
+    Patterns are compiled, the target is imported and the parameters to be passed to it are resolved only once.
+    """
+    __slots__ = ["config", "method", "path", "query", "target", "params"]
+
+    HOOK_PARAMS = ("service", "hook", "context")
+
+    def __init__(self, hook_config):
+        # type: (ServiceHookConfigItem) -> None
+        self.config = hook_config
+        self.method = hook_config["method"]
+        self.path = re.compile(normalize_field_pattern(hook_config["path"], escape=False))
+        self.query = re.compile(normalize_field_pattern(hook_config["query"], escape=False))
+        self.target = import_target(hook_config["target"], default_root=get_constant("MAGPIE_PROVIDERS_HOOKS_PATH"))
+        self.params = ()  # type: Tuple[Str, ...]
+        if self.target:
+            signature = inspect.signature(self.target)
+            if len(signature.parameters) > 1:
+                self.params = tuple(key for key in self.HOOK_PARAMS if key in signature.parameters)
+
+    def match(self, path, query):
+        # type: (Str, Str) -> bool
+        return bool(self.path.match(path) and self.query.match(query))
+
+
+class ServiceHookDispatcher(object):
+    """
+    Dispatch table of :term:`Service Hook` definitions by service name, hook type and request method.
+
+    Hooks are prepared once from the services configuration, and the ordered list of hooks applicable for a given
+    combination is resolved on first use to avoid filtering every hook on each request.
+    """
+
+    def __init__(self, services):
+        # type: (ServicesSettings) -> None
+        self.services = services
+        self._hooks = {}     # type: Dict[Tuple[Str, ServiceHookType], List[ServiceHook]]
+        self._dispatch = {}  # type: Dict[Tuple[Str, ServiceHookType, Str], List[ServiceHook]]
+        for svc_name, svc_config in (services or {}).items():
+            for hook_cfg in svc_config.get("hooks") or []:
+                self._hooks.setdefault((svc_name, hook_cfg["type"]), []).append(ServiceHook(hook_cfg))
+
+    def get_hooks(self, service_name, hook_type, method):
+        # type: (Str, ServiceHookType, Str) -> List[ServiceHook]
+        """
+        Obtains the hooks of the service applicable for the hook type and request method, in configuration order.
+        """
+        key = (service_name, hook_type, method)
+        hooks = self._dispatch.get(key)
+        if hooks is None:
+            hooks = [hook for hook in self._hooks.get((service_name, hook_type), []) if hook.method in ["*", method]]
+            self._dispatch[key] = hooks
+        return hooks
+
+
 def verify_user(request):
     # type: (Request) -> HTTPException
     """
@@ -199,6 +263,70 @@ def verify_user(request):
     return valid_http(HTTPOk, detail="Twitcher login verified successfully with Magpie login.")
 
 
+def authorize_request(request):
+    # type: (Request) -> Response
+    """
+    Resolves the access decision of a proxied request without forwarding it to the protected service.
+
+    Intended to be employed as target of the `Nginx` ``auth_request`` directive. The original request path and query
+    are provided by the ``X-Original-URI`` header (or ``uri`` query parameter), and its method by the optional
+    ``X-Original-Method`` header. The path is percent-decoded and must already be normalized, such that it refers to
+    the same location as the one selected by `Nginx` to forward the request. Cookies and ``Authorization`` headers of
+    the authorization request are employed to identify the user. The same service and :term:`ACL` resolution
+    (including caching) as for requests proxied by `Twitcher` is applied, but data is never transferred, leaving it to
+    `Nginx` to stream it directly from the service.
+
+    Because `Nginx` only accepts ``2xx``, ``401`` and ``403`` responses, any failure to resolve the targeted service,
+    resource or permission, or a path with ``.`` or ``..`` segments or empty segments, results into a denied access.
+    Responses are returned without body.
+
+    :param request: authorization request emitted by `Nginx`.
+    :return: empty HTTP response with status ``200`` if access is allowed, ``401`` or ``403`` otherwise.
+    """
+    original_uri = request.headers.get("X-Original-URI") or request.GET.get("uri")
+    original_method = request.headers.get("X-Original-Method") or request.method
+    ows_security = MagpieAdapter(request).owssecurity_factory(request)
+    path, _, query = (original_uri or "").partition("?")
+    # decoded path as defined by WSGI for 'PATH_INFO' (bytes mapped to characters), which must be already normalized
+    # since the reverse proxy selects and forwards the request based on the normalized path rather than the raw one
+    path = unquote(path, encoding="latin-1")
+    if not path.startswith(ows_security.twitcher_protected_path) or "//" in path or any(
+            segment in [".", ".."] for segment in path.split("/")):
+        LOGGER.debug("Authorization denied for unprotected, unnormalized or missing original URI [%s]", original_uri)
+        return Response(status=HTTPForbidden.code, headers={"Cache-Control": "no-store"})
+
+    # request copy with original path and query, but without body since 'auth_request' never forwards it
+    environ = dict(request.environ)
+    environ.update({"PATH_INFO": path, "SCRIPT_NAME": "", "QUERY_STRING": query,
+                    "REQUEST_METHOD": original_method.upper(), "CONTENT_LENGTH": "0", "wsgi.input": io.BytesIO()})
+    environ.pop("webob._parsed_query_vars", None)
+    environ.pop("webob._parsed_post_vars", None)
+    environ.pop("webob.is_body_seekable", None)
+    original = Request(environ)
+    original.registry = request.registry
+    apply_request_extensions(original)
+    original.db = request.db  # share the session and transaction managed for the authorization request
+
+    headers = {"Cache-Control": "no-store"}
+    status = HTTPOk.code
+    try:
+        ows_security.check_request(original)
+    except Exception as exc:  # pylint: disable=W0703
+        LOGGER.debug("Authorization denied for [%s %s] (%s)", original.method, original_uri, exc)
+        if original.user is None:
+            status = HTTPUnauthorized.code
+            headers.update(get_authenticate_headers(original) or {})
+        else:
+            status = HTTPForbidden.code
+    else:
+        max_age = get_constant("MAGPIE_AUTHORIZE_CACHE_MAX_AGE", request.registry, default_value=None,
+                               raise_missing=False, raise_not_set=False)
+        if max_age not in [None, ""] and int(max_age) > 0:
+            headers["Cache-Control"] = "private, max-age={}".format(int(max_age))
+            headers["Vary"] = "Cookie, Authorization"
+    return Response(status=status, headers=headers)
+
+
 @six.add_metaclass(SingletonMeta)
 class MagpieAdapter(AdapterInterface):
     # pylint: disable: W0223,W0612
@@ -207,12 +335,14 @@ class MagpieAdapter(AdapterInterface):
         # type: (AnySettingsContainer) -> None
         self._servicestore = None
         self._owssecurity = None
+        self._hooks = None  # type: Optional[ServiceHookDispatcher]
         super(MagpieAdapter, self).__init__(container)  # pylint: disable=E1101,no-member
 
     def reset(self):
         # type: () -> None
         self._servicestore = None
         self._owssecurity = None
+        self._hooks = None
 
     @property
     def name(self):
@@ -286,6 +416,7 @@ class MagpieAdapter(AdapterInterface):
             setup_providers=True,  # obtain "magpie.services" if any
             skip_registration=True,
         )
+        self._hooks = ServiceHookDispatcher(settings.get("magpie.services", {}))
 
         # disable rpcinterface which is conflicting with postgres db
         settings["twitcher.rpcinterface"] = False
@@ -295,51 +426,59 @@ class MagpieAdapter(AdapterInterface):
         config.include("pyramid_beaker")
         setup_pyramid_config(config)
         setup_session_config(config)
+        setup_request_timings(config)
+        setup_metrics(config)
 
         # add route to verify user token matching between Magpie/Twitcher
         config.add_route("verify-user", "/verify", request_method=("GET", "POST"))
         config.add_view(verify_user, route_name="verify-user")
 
+        # add route to resolve access decisions requested by a reverse proxy that streams the data itself
+        config.add_route("authorize-request", "/authorize")
+        config.add_view(authorize_request, route_name="authorize-request")
+
+        # add route to export metrics collected by the adapter, aggregated over workers if sharing their directory
+        if is_metrics_enabled():
+            config.add_route("metrics", "/metrics", request_method="GET")
+            config.add_view(get_metrics, route_name="metrics", permission=get_metrics_permission(config))
+
         return config
 
     def _apply_hooks(self, instance, service_name, hook_type, method, path, query):
         # type: (Union[Request, Response], Str, ServiceHookType, Str, Str, Str) -> Union[Request, Response]
         """
         Executes the hooks processing chain.
+
+        Hooks are obtained from the dispatch table prepared with the services configuration. Copies of the service and
+        hook configurations are only generated when a matched hook requests them.
         """
-        svc_config = self.settings.get("magpie.services", {}).get(service_name, {})
-        svc_hooks = svc_config.get("hooks", [])
-        # copy to avoid (un)intentional modifications to configurations
-        svc_config = copy.deepcopy(svc_config)
-        svc_config["name"] = service_name  # often useful reference, but not directly in definition since dict key
-        for hook_cfg in svc_hooks:
-            if hook_cfg["type"] != hook_type:
-                continue
-            if hook_cfg["method"] not in ["*", method]:
+        services = self.settings.get("magpie.services", {})
+        if self._hooks is None or self._hooks.services is not services:
+            self._hooks = ServiceHookDispatcher(services)
+        svc_config = None
+        for hook in self._hooks.get_hooks(service_name, hook_type, method):
+            if not hook.match(path, query):
                 continue
-            hook_path = normalize_field_pattern(hook_cfg["path"], escape=False)
-            if not re.match(hook_path, path):
-                continue
-            hook_query = normalize_field_pattern(hook_cfg["query"], escape=False)
-            if not re.match(hook_query, query):
-                continue
-            hook_target = import_target(hook_cfg["target"], default_root=get_constant("MAGPIE_PROVIDERS_HOOKS_PATH"))
+            hook_cfg = hook.config
             hook_qs = "?" + query if query else ""
-            if not hook_target:
+            if not hook.target:
                 LOGGER.warning("Hook matched %s (%s %s%s) but specified target [%s] could not be loaded.",
                                hook_type, method, path, hook_qs, hook_cfg["target"])
                 continue
             LOGGER.debug("Hook matched %s (%s %s%s) [%s]", hook_type, method, path, hook_qs, hook_cfg["target"])
-            signature = inspect.signature(hook_target)
             kwargs = {}
-            if len(signature.parameters) > 1:
-                hook = copy.deepcopy(hook_cfg)
-                ctx = HookContext(instance, self, svc_config, hook)
-                for key, val in [("service", svc_config), ("hook", hook), ("context", ctx)]:
-                    if key in signature.parameters:
-                        kwargs[key] = val
+            if hook.params:
+                if svc_config is None:
+                    # copy to avoid (un)intentional modifications to configurations
+                    svc_config = copy.deepcopy(services.get(service_name, {}))
+                    svc_config["name"] = service_name  # often useful reference, but not in definition since dict key
+                hook_copy = copy.deepcopy(hook_cfg)
+                hook_params = {"service": svc_config, "hook": hook_copy}
+                if "context" in hook.params:
+                    hook_params["context"] = HookContext(instance, self, svc_config, hook_copy)
+                kwargs = {key: hook_params[key] for key in hook.params}
             try:
-                instance = hook_target(instance, **kwargs)
+                instance = hook.target(instance, **kwargs)
             except Exception as exc:
                 LOGGER.error("Hook failed %s (%s %s%s) [%s]",
                              hook_type, method, path, hook_qs, hook_cfg["target"], exc_info=exc)
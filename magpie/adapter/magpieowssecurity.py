@@ -15,12 +15,15 @@ from six.moves.urllib.parse import urlparse
 
 from magpie.api.exception import evaluate_call, verify_param
 from magpie.api.schemas import ProviderSigninAPI
+from magpie.cache import poll_cache_events
 from magpie.compat import LooseVersion
 from magpie.constants import get_constant
 from magpie.db import get_connected_session
+from magpie.metrics import set_request_service_type
 from magpie.models import Service
 from magpie.permissions import Permission
-from magpie.services import invalidate_service, service_factory
+from magpie.services import apply_cache_events, invalidate_service, service_factory
+from magpie.timing import record_cache, timed
 from magpie.utils import CONTENT_TYPE_JSON, get_authenticate_headers, get_logger, get_magpie_url, get_settings
 
 # WARNING:
@@ -128,8 +131,10 @@ class MagpieOWSSecurity(OWSSecurityInterface):
         #   (this avoids SQLAlchemy running lazy-loading of pre-fetched data, since it is readily available)
         # - reapply the request which contains the methods to retrieve database session and request user from it
         #   (this ensures that any other places using the request/db/user will use the current one instead of cached)
-        if service_impl.request is not request:
-            LOGGER.warning("Using cached service")
+        cached = service_impl.request is not request
+        record_cache("service", cached)
+        if cached:
+            LOGGER.debug("Using cached service")
             service_cached = Service()
             service_cached.populate_obj(service_data)
             service_impl.service = service_cached
@@ -149,6 +154,20 @@ class MagpieOWSSecurity(OWSSecurityInterface):
         service_impl = copy(service_impl)
         return service_impl
 
+    def sync_cache_events(self, request):  # noqa: R0201
+        # type: (Request) -> None
+        """
+        Invalidates cached references according to modifications recorded by `Magpie` since the last verification.
+
+        Verifications are applied at most once every :envvar:`MAGPIE_CACHE_EVENTS_INTERVAL` seconds.
+        Nothing is done if the interval is not defined.
+        """
+        interval = get_constant("MAGPIE_CACHE_EVENTS_INTERVAL", request, default_value=None,
+                                raise_missing=False, raise_not_set=False)
+        if interval in [None, ""] or float(interval) <= 0:
+            return
+        apply_cache_events(poll_cache_events(request.db, float(interval)))
+
     def verify_request(self, request):
         # type: (Request) -> bool
         """
@@ -192,16 +211,20 @@ class MagpieOWSSecurity(OWSSecurityInterface):
         """
         if request.path.startswith(self.twitcher_protected_path):
             request.db = get_connected_session(request)
+            self.sync_cache_events(request)
 
             # each service implementation defines their ACL and permission resolution using request definition
-            service_impl = self.get_service(request)
+            with timed("service"):
+                service_impl = self.get_service(request)
+            set_request_service_type(request, service_impl.service_type)
             LOGGER.debug("Using service: [%s]", service_impl)
 
             perm_exc = None
             try:
                 LOGGER.debug("Resolving requested permission based on parsing implementation of service...")
                 # parse request (GET/POST) to get the permission requested for that service
-                permission_requested = service_impl.permission_requested()
+                with timed("permission"):
+                    permission_requested = service_impl.permission_requested()
                 # convert permission enum to str for comparison
                 permission_requested = Permission.get(permission_requested).value if permission_requested else None
             except HTTPBadRequest as exc:
@@ -232,7 +255,8 @@ class MagpieOWSSecurity(OWSSecurityInterface):
                 authn_policy = request.registry.queryUtility(IAuthenticationPolicy)  # noqa
                 authz_policy = request.registry.queryUtility(IAuthorizationPolicy)   # noqa
                 principals = authn_policy.effective_principals(request)
-                has_permission = authz_policy.permits(service_impl, principals, permission_requested)
+                with timed("acl"):
+                    has_permission = authz_policy.permits(service_impl, principals, permission_requested)
 
                 if LOGGER.isEnabledFor(logging.DEBUG):
                     LOGGER.debug("%s - AUTHN policy configurations:", type(self).__name__)
@@ -0,0 +1,29 @@
+"""
+Resource Child Name Index
+
+Revision ID: d1a7c9b2e4f0
+Revises: 5e5acc33adce
+Create Date: 2023-03-01 10:12:31.418264
+"""
+
+from alembic import op
+from sqlalchemy import text
+
+# Revision identifiers, used by Alembic.
+# pylint: disable=C0103,invalid-name  # revision control variables not uppercase
+revision = "d1a7c9b2e4f0"
+down_revision = "5e5acc33adce"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        "ix_resources_parent_id_lower_resource_name",
+        "resources",
+        ["parent_id", text("lower(resource_name)")],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_resources_parent_id_lower_resource_name", "resources")
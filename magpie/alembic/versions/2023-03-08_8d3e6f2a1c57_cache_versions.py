@@ -0,0 +1,30 @@
+"""
+Cache Versions
+
+Revision ID: 8d3e6f2a1c57
+Revises: d1a7c9b2e4f0
+Create Date: 2023-03-08 14:27:05.913402
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+# pylint: disable=C0103,invalid-name  # revision control variables not uppercase
+revision = "8d3e6f2a1c57"
+down_revision = "d1a7c9b2e4f0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    cache_versions = op.create_table(
+        "cache_versions",
+        sa.Column("name", sa.Unicode(32), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, default=0),
+    )
+    op.bulk_insert(cache_versions, [{"name": "permissions", "version": 0}])
+
+
+def downgrade():
+    op.drop_table("cache_versions")
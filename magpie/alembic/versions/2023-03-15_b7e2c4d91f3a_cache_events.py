@@ -0,0 +1,33 @@
+"""
+Cache Events
+
+Revision ID: b7e2c4d91f3a
+Revises: 8d3e6f2a1c57
+Create Date: 2023-03-15 10:42:37.204816
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+# pylint: disable=C0103,invalid-name  # revision control variables not uppercase
+revision = "b7e2c4d91f3a"
+down_revision = "8d3e6f2a1c57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "cache_events",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("created", sa.DateTime, nullable=False, index=True),
+        sa.Column("scope", sa.Unicode(16), nullable=False),
+        sa.Column("service_id", sa.Integer, nullable=True),
+        sa.Column("service_name", sa.Unicode(100), nullable=True),
+        sa.Column("user_id", sa.Integer, nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_table("cache_events")
@@ -0,0 +1,48 @@
+"""
+Resources Closure
+
+Revision ID: 3f5c8a9e6b21
+Revises: b7e2c4d91f3a
+Create Date: 2023-03-22 09:27:51.631940
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+# pylint: disable=C0103,invalid-name  # revision control variables not uppercase
+revision = "3f5c8a9e6b21"
+down_revision = "b7e2c4d91f3a"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "resources_closure",
+        sa.Column("ancestor_id", sa.Integer,
+                  sa.ForeignKey("resources.resource_id", onupdate="CASCADE", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("descendant_id", sa.Integer,
+                  sa.ForeignKey("resources.resource_id", onupdate="CASCADE", ondelete="CASCADE"),
+                  primary_key=True),
+        sa.Column("depth", sa.Integer, nullable=False),
+    )
+    op.create_index("ix_resources_closure_descendant_id_depth", "resources_closure", ["descendant_id", "depth"])
+
+    # relate every existing resource to itself and to all its parents
+    op.execute(sa.text("""
+        INSERT INTO resources_closure (ancestor_id, descendant_id, depth)
+        WITH RECURSIVE closure(ancestor_id, descendant_id, depth) AS (
+                SELECT resource_id, resource_id, 0 FROM resources
+            UNION ALL
+                SELECT closure.ancestor_id, resources.resource_id, closure.depth + 1
+                FROM closure JOIN resources ON resources.parent_id = closure.descendant_id
+        )
+        SELECT ancestor_id, descendant_id, depth FROM closure
+    """))
+
+
+def downgrade():
+    op.drop_index("ix_resources_closure_descendant_id_depth", "resources_closure")
+    op.drop_table("resources_closure")
@@ -0,0 +1,32 @@
+"""
+Permissions Indexes
+
+Revision ID: a4d9e2c7f815
+Revises: 3f5c8a9e6b21
+Create Date: 2023-03-29 14:06:12.482395
+"""
+
+from alembic import op
+
+# Revision identifiers, used by Alembic.
+# pylint: disable=C0103,invalid-name  # revision control variables not uppercase
+revision = "a4d9e2c7f815"
+down_revision = "3f5c8a9e6b21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # primary keys start with the group, memberships of a user must be searchable without it
+    op.create_index("ix_users_groups_user_id_group_id", "users_groups", ["user_id", "group_id"])
+    # primary keys start with the principal, permissions applied on a resource must be searchable without it
+    op.create_index("ix_users_resources_permissions_resource_id_user_id", "users_resources_permissions",
+                    ["resource_id", "user_id", "perm_name"])
+    op.create_index("ix_groups_resources_permissions_resource_id_group_id", "groups_resources_permissions",
+                    ["resource_id", "group_id", "perm_name"])
+
+
+def downgrade():
+    op.drop_index("ix_groups_resources_permissions_resource_id_group_id", "groups_resources_permissions")
+    op.drop_index("ix_users_resources_permissions_resource_id_user_id", "users_resources_permissions")
+    op.drop_index("ix_users_groups_user_id_group_id", "users_groups")
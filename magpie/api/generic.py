@@ -173,7 +173,8 @@ def validate_accept_header_tween(handler, registry):    # noqa: F811
         routes that require more content-types than the ones supported by the API for displaying purposes of other
         elements (styles, images, etc.).
         """
-        if not is_magpie_ui_path(request):
+        # metrics are returned in their own format regardless of the one requested by the monitoring system
+        if not is_magpie_ui_path(request) and request.path_info != s.MetricsAPI.path:
             accept, _ = guess_target_format(request)
             http_msg = s.NotAcceptableResponseSchema.description
             content = get_request_info(request, default_message=http_msg)
@@ -1,8 +1,10 @@
 from pyramid.security import NO_PERMISSION_REQUIRED
+from pyramid.settings import asbool
 
 from magpie.api import schemas as s
-from magpie.api.home.home import get_homepage
+from magpie.api.home.home import get_homepage, get_metrics
 from magpie.constants import get_constant
+from magpie.metrics import get_metrics_permission
 from magpie.utils import get_logger
 
 LOGGER = get_logger(__name__)
@@ -15,4 +17,10 @@ def includeme(config):
         LOGGER.info("Adding API homepage...")
         config.add_route(s.HomepageAPI.name, s.HomepageAPI.path)
         config.add_view(get_homepage, route_name=s.HomepageAPI.name, permission=NO_PERMISSION_REQUIRED)
+    if asbool(get_constant("MAGPIE_METRICS", config, default_value=False,
+                           raise_missing=False, raise_not_set=False)):
+        LOGGER.info("Adding API metrics...")
+        config.add_route(s.MetricsAPI.name, s.MetricsAPI.path)
+        config.add_view(get_metrics, route_name=s.MetricsAPI.name, request_method="GET",
+                        permission=get_metrics_permission(config))
     config.scan()
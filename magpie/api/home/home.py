@@ -2,6 +2,7 @@ import logging
 from copy import deepcopy
 
 from pyramid.httpexceptions import HTTPOk
+from pyramid.response import Response
 from pyramid.security import NO_PERMISSION_REQUIRED
 from pyramid.view import view_config
 
@@ -9,6 +10,7 @@ from magpie import __meta__
 from magpie.api import exception as ax
 from magpie.api import schemas as s
 from magpie.db import get_database_revision
+from magpie.metrics import get_metrics as generate_metrics
 from magpie.utils import CONTENT_TYPE_JSON, get_logger, get_magpie_url, print_log
 
 LOGGER = get_logger(__name__)
@@ -46,3 +48,14 @@ def get_version(request):
     }
     return ax.valid_http(http_success=HTTPOk, content=version, content_type=CONTENT_TYPE_JSON,
                          detail=s.Version_GET_OkResponseSchema.description)
+
+
+@s.MetricsAPI.get(tags=[s.APITag], api_security=s.SecurityEveryoneAPI, response_schemas=s.Metrics_GET_responses)
+def get_metrics(request):
+    """
+    Metrics of the application in Prometheus text exposition format (only if metrics are enabled).
+
+    Access is restricted to administrators if :envvar:`MAGPIE_METRICS_PROTECTED` is enabled.
+    """
+    body, content_type = generate_metrics()
+    return Response(body=body, headers={"Content-Type": content_type})
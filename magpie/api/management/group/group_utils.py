@@ -21,29 +21,35 @@ from magpie.api.management.group.group_formats import format_group
 from magpie.api.management.resource.resource_formats import format_resource
 from magpie.api.management.resource.resource_utils import check_valid_service_or_resource_permission
 from magpie.api.management.service import service_formats as sf
+from magpie.api.pagination import paginate_query, paginate_results
 from magpie.api.webhooks import WebhookAction, get_permission_update_params, process_webhook_requests
+from magpie.cache import emit_cache_event
 from magpie.permissions import PermissionSet, PermissionType, format_permissions
 from magpie.services import SERVICE_TYPE_DICT
 
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import Iterable, List, Optional
+    from typing import Iterable, List, Optional, Tuple
 
     from pyramid.httpexceptions import HTTPException
     from sqlalchemy.orm.session import Session
 
+    from magpie.api.pagination import Pagination
     from magpie.typedefs import JSON, ResourcePermissionMap, ServiceOrResourceType, Str
 
 
-def get_all_group_names(db_session):
-    # type: (Session) -> List[Str]
+def get_all_group_names(db_session, pagination=None):
+    # type: (Session, Optional[Pagination]) -> Tuple[List[Str], Optional[Str]]
     """
-    Get all existing group names from the database.
+    Get existing group names from the database ordered by name, optionally limited to the requested page.
+
+    :returns: group names, and cursor of the next page if pagination was requested and another page follows.
     """
-    group_names = ax.evaluate_call(
-        lambda: [grp.group_name for grp in GroupService.all(models.Group, db_session=db_session)],
+    groups = ax.evaluate_call(
+        lambda: list(paginate_query(db_session.query(models.Group.group_name), models.Group.group_name, pagination)),
         http_error=HTTPForbidden, msg_on_fail=s.Groups_GET_ForbiddenResponseSchema.description)
-    return group_names
+    group_names, cursor = paginate_results([grp.group_name for grp in groups], pagination, key=lambda name: name)
+    return group_names, cursor
 
 
 def get_group_resources(group, db_session, service_types=None):
@@ -190,6 +196,7 @@ def create_group_resource_permission_response(group, resource, permission, db_se
     ax.evaluate_call(lambda: db_session.add(new_perm), fallback=lambda: db_session.rollback(),
                      http_error=HTTPForbidden, content=perm_content,
                      msg_on_fail=s.GroupResourcePermissions_POST_ForbiddenAddResponseSchema.description)
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_GROUP, resource=resource)
     webhook_params = get_permission_update_params(group, resource, permission)
     process_webhook_requests(WebhookAction.CREATE_GROUP_PERMISSION, webhook_params)
     return ax.valid_http(http_success=http_success, content=perm_content, detail=http_detail)
@@ -277,6 +284,7 @@ def delete_group_resource_permission_response(group, resource, permission, db_se
     ax.evaluate_call(lambda: db_session.delete(del_perm), fallback=lambda: db_session.rollback(),
                      http_error=HTTPForbidden, content=perm_content,
                      msg_on_fail=s.GroupServicePermission_DELETE_ForbiddenResponseSchema.description)
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_GROUP, resource=resource)
     webhook_params = get_permission_update_params(group, resource, permission)
     process_webhook_requests(WebhookAction.DELETE_GROUP_PERMISSION, webhook_params)
     return ax.valid_http(http_success=HTTPOk, detail=s.GroupServicePermission_DELETE_OkResponseSchema.description)
@@ -9,19 +9,22 @@ from magpie.api import schemas as s
 from magpie.api.management.group import group_formats as gf
 from magpie.api.management.group import group_utils as gu
 from magpie.api.management.service import service_utils as su
+from magpie.api.pagination import add_pagination_content, get_pagination
+from magpie.cache import emit_cache_event
 from magpie.constants import get_constant
-from magpie.models import TemporaryToken, TokenOperation, UserGroupStatus
+from magpie.models import CacheEvent, TemporaryToken, TokenOperation, UserGroupStatus
 
 
-@s.GroupsAPI.get(tags=[s.GroupsTag], response_schemas=s.Groups_GET_responses)
+@s.GroupsAPI.get(schema=s.Groups_GET_RequestSchema, tags=[s.GroupsTag], response_schemas=s.Groups_GET_responses)
 @view_config(route_name=s.GroupsAPI.name, request_method="GET")
 def get_groups_view(request):
     """
     Get list of group names.
     """
-    group_names = gu.get_all_group_names(request.db)
+    pagination = get_pagination(request)
+    group_names, cursor = gu.get_all_group_names(request.db, pagination=pagination)
     return ax.valid_http(http_success=HTTPOk, detail=s.Groups_GET_OkResponseSchema.description,
-                         content={"group_names": group_names})
+                         content=add_pagination_content({"group_names": group_names}, pagination, cursor))
 
 
 @s.GroupsAPI.post(schema=s.Groups_POST_RequestSchema, tags=[s.GroupsTag], response_schemas=s.Groups_POST_responses)
@@ -110,6 +113,7 @@ def delete_group_view(request):
     ax.evaluate_call(lambda: request.db.delete(group),
                      fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
                      msg_on_fail=s.Group_DELETE_ForbiddenResponseSchema.description)
+    emit_cache_event(request.db, CacheEvent.SCOPE_GROUP)  # permissions of the group on any service
     return ax.valid_http(http_success=HTTPOk, detail=s.Group_DELETE_OkResponseSchema.description)
 
 
@@ -1,4 +1,5 @@
 from magpie.api import schemas as s
+from magpie.models import LoggedUserFactory
 from magpie.utils import get_logger
 
 LOGGER = get_logger(__name__)
@@ -8,6 +9,7 @@ def includeme(config):
     LOGGER.info("Adding API resource...")
     # Add all the rest api routes
     config.add_route(**s.service_api_route_info(s.PermissionsAPI))
+    config.add_route(**s.service_api_route_info(s.PermissionsCheckAPI, factory=LoggedUserFactory))
     config.add_route(**s.service_api_route_info(s.ResourcesAPI))
     config.add_route(**s.service_api_route_info(s.ResourceAPI))
     config.add_route(**s.service_api_route_info(s.ResourcePermissionsAPI))
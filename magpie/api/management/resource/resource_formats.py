@@ -1,3 +1,4 @@
+import json
 from typing import TYPE_CHECKING
 
 from pyramid.httpexceptions import HTTPInternalServerError
@@ -8,11 +9,12 @@ from magpie.permissions import PermissionType, format_permissions
 from magpie.services import SERVICE_TYPE_DICT
 
 if TYPE_CHECKING:
-    from typing import Collection, List, Optional
+    from typing import Any, Collection, Dict, Iterable, Iterator, List, Optional, Tuple
 
     from sqlalchemy.orm.session import Session
 
     from magpie.models import Resource, Service
+    from magpie.permissions import Permission
     from magpie.typedefs import (
         JSON,
         AnyPermissionType,
@@ -178,3 +180,96 @@ def format_resources_nested(resource, nested_resources, nesting_key, db_session)
         nested_resources, nesting_key=nesting_key, db_session=db_session
     )
     return resource_formatted
+
+
+def get_resource_types_permissions(service_types):
+    # type: (Iterable[Str]) -> Dict[Str, Dict[Str, List[Permission]]]
+    """
+    Obtains the :term:`Allowed Permissions <Allowed Permission>` of every resource type nested under each service type.
+
+    Formatting functions of multiple services trees employ this mapping to look up permissions of each resource
+    directly, instead of resolving its root service and the permissions of its type node by node.
+    """
+    return {
+        svc_type: {
+            res_type.resource_type_name: perms
+            for res_type, perms in SERVICE_TYPE_DICT[svc_type].resource_types_permissions.items()
+        }
+        for svc_type in service_types
+    }
+
+
+def format_services_resources(services, resources, service_types):
+    # type: (Iterable[Tuple[Service, JSON]], Iterable[Any], Iterable[Str]) -> JSON
+    """
+    Formats services with their complete tree of resources, all assembled in a single pass over their resources.
+
+    The result is equivalent to the one of :func:`format_service_resources` with all children and their
+    :term:`Allowed Permissions <Allowed Permission>` for every service, nested by service type and name.
+    Resources must be provided in the order of :func:`magpie.models.find_services_resources`, such that parents are
+    always formatted before their children.
+
+    :param services: Services with their formatted details (without resources).
+    :param resources: Resources of all services, ordered with parents preceding their children.
+    :param service_types: Service types to include, even if no service of that type is provided.
+    :returns: Formatted services with their resources nested by service type and name.
+    """
+    res_perms = get_resource_types_permissions(service_types)
+    services_json = {svc_type: {} for svc_type in service_types}  # type: JSON
+    children = {}  # type: Dict[int, JSON]  # nested children of every formatted service and resource by their ID
+    svc_types = {}  # type: Dict[int, Str]
+    for service, svc_fmt in services:
+        svc_fmt["resources"] = children[service.resource_id] = {}
+        svc_types[service.resource_id] = service.type
+        services_json.setdefault(service.type, {})[service.resource_name] = svc_fmt
+    for resource in resources:
+        perms = res_perms[svc_types[resource.root_service_id]].get(resource.resource_type, [])
+        res_fmt = format_resource(resource, perms)
+        res_fmt["children"] = children[resource.resource_id] = {}
+        children[resource.parent_id][resource.resource_id] = res_fmt
+    return services_json
+
+
+def iter_format_services_resources(services, resources, service_types):
+    # type: (Iterable[Tuple[Service, JSON]], Iterable[Any], Iterable[Str]) -> Iterator[Str]
+    """
+    Generates incrementally the JSON representation of formatted services with their complete tree of resources.
+
+    The generated contents are equivalent to the result of :func:`format_service_resources` with all children and
+    their :term:`Allowed Permissions <Allowed Permission>` for every service, nested by service type and name.
+    Resources must be provided in the order of :func:`magpie.models.find_services_resources` for services ordered
+    in the same manner (by type, and then name). Only the parents of the resource being generated are tracked, such
+    that the whole tree never needs to be loaded at once.
+
+    :param services: Services with their formatted details (without resources).
+    :param resources: Resources of all services with their depth, ordered for depth-first traversal by service.
+    :param service_types: Service types to include, even if no service of that type is provided.
+    :returns: Successive fragments of the JSON object.
+    """
+    services_by_type = {svc_type: [] for svc_type in service_types}  # type: Dict[Str, List[Tuple[Service, JSON]]]
+    for service, svc_fmt in services:
+        services_by_type.setdefault(service.type, []).append((service, svc_fmt))
+
+    res_perms = get_resource_types_permissions(services_by_type)
+    resources = iter(resources)
+    pending = next(resources, None)
+    yield "{"
+    for type_index, svc_type in enumerate(sorted(services_by_type)):
+        yield "{}{}: {{".format(", " if type_index else "", json.dumps(svc_type))
+        for svc_index, (service, svc_fmt) in enumerate(services_by_type[svc_type]):
+            yield "{}{}: {}, \"resources\": {{".format(
+                ", " if svc_index else "", json.dumps(service.resource_name), json.dumps(svc_fmt)[:-1])
+            siblings = [0]  # quantity of resources already generated at each level of currently opened parents
+            while pending is not None and pending.root_service_id == service.resource_id:
+                while len(siblings) > pending.depth:  # close children and parent objects of completed subtrees
+                    siblings.pop()
+                    yield "}}"
+                res_fmt = format_resource(pending, res_perms[svc_type].get(pending.resource_type, []))
+                yield "{}{}: {}, \"children\": {{".format(
+                    ", " if siblings[-1] else "", json.dumps(str(pending.resource_id)), json.dumps(res_fmt)[:-1])
+                siblings[-1] += 1
+                siblings.append(0)
+                pending = next(resources, None)
+            yield "}}" * len(siblings)  # remaining subtrees, and resources and service objects
+        yield "}"
+    yield "}"
@@ -18,13 +18,15 @@ from magpie.api import exception as ax
 from magpie.api import requests as ar
 from magpie.api import schemas as s
 from magpie.api.management.resource.resource_formats import format_resource
-from magpie.permissions import Permission
+from magpie.cache import bump_resource_tree_version, emit_cache_event
+from magpie.constants import get_constant
+from magpie.permissions import Access, Permission
 from magpie.register import sync_services_phoenix
 from magpie.services import SERVICE_TYPE_DICT, service_factory
 
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import List, Optional, Tuple, Type, Union
+    from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
     from pyramid.httpexceptions import HTTPException
     from pyramid.request import Request
@@ -32,7 +34,7 @@ if TYPE_CHECKING:
     from ziggurat_foundations.models.services.resource_tree import ResourceTreeService
 
     from magpie.services import ServiceInterface
-    from magpie.typedefs import NestedResourceNodes, ServiceOrResourceType, Str
+    from magpie.typedefs import JSON, NestedResourceNodes, ServiceOrResourceType, Str
 
 
 def check_valid_service_or_resource_permission(permission_name, service_or_resource, db_session):
@@ -344,6 +346,8 @@ def create_resource(resource_name, resource_display_name, resource_type, parent_
     ax.evaluate_call(lambda: add_resource_in_tree(new_resource, db_session),
                      fallback=lambda: db_session.rollback(),
                      http_error=HTTPForbidden, msg_on_fail=s.Resources_POST_ForbiddenResponseSchema.description)
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_RESOURCE, resource=root_service)
+    bump_resource_tree_version(root_service.resource_id)
     return ax.valid_http(http_success=HTTPCreated, detail=s.Resources_POST_CreatedResponseSchema.description,
                          content={"resource": format_resource(new_resource, basic_info=True)})
 
@@ -352,6 +356,7 @@ def delete_resource(request):
     resource = ar.get_resource_matchdict_checked(request)
     service_push = asbool(ar.get_multiformat_body(request, "service_push", default=False))
     res_content = {"resource": format_resource(resource, basic_info=True)}
+    emit_cache_event(request.db, models.CacheEvent.SCOPE_RESOURCE, resource=resource)
     ax.evaluate_call(
         lambda: models.RESOURCE_TREE_SERVICE.delete_branch(resource_id=resource.resource_id, db_session=request.db),
         fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
@@ -368,4 +373,97 @@ def delete_resource(request):
     ax.evaluate_call(lambda: remove_service_magpie_and_phoenix(resource, service_push, request.db),
                      fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
                      msg_on_fail=s.Resource_DELETE_ForbiddenResponseSchema.description, content=res_content)
+    bump_resource_tree_version(resource.root_service_id or resource.resource_id)
     return ax.valid_http(http_success=HTTPOk, detail=s.Resource_DELETE_OkResponseSchema.description)
+
+
+def _get_check_target(check, request, services):
+    # type: (JSON, Request, Dict[Str, models.Service]) -> Tuple[models.Service, ServiceOrResourceType, bool]
+    """
+    Obtains the service, the resource and the match indicator onto which the access of a permission check applies.
+
+    When a resource path is provided, the closest existing parent is employed if the full path cannot be matched,
+    using the same resolution as requests accessed through the proxy (i.e.: only recursive permissions apply).
+    """
+    resource_id = check.get("resource_id")
+    if resource_id is not None:
+        ax.verify_param(resource_id, is_type=True, param_compare=int, param_name="resource_id",
+                        http_error=HTTPBadRequest, param_content={"value": check},
+                        msg_on_fail=s.PermissionsCheck_POST_BadRequestResponseSchema.description)
+        resource = ax.evaluate_call(lambda: ResourceService.by_resource_id(resource_id, db_session=request.db),
+                                    fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
+                                    msg_on_fail=s.Resource_MatchDictCheck_ForbiddenResponseSchema.description)
+        ax.verify_param(resource, not_none=True, param_name="resource_id", http_error=HTTPNotFound,
+                        param_content={"value": check},
+                        msg_on_fail=s.PermissionsCheck_POST_NotFoundResponseSchema.description)
+        return get_resource_root_service(resource, request.db), resource, True
+
+    service_name = check.get("service_name")
+    ax.verify_param(service_name, not_none=True, not_empty=True, param_name="service_name",
+                    http_error=HTTPBadRequest, param_content={"value": check},
+                    msg_on_fail=s.PermissionsCheck_POST_BadRequestResponseSchema.description)
+    if service_name not in services:
+        service = ax.evaluate_call(lambda: models.Service.by_service_name(service_name, db_session=request.db),
+                                   fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
+                                   msg_on_fail=s.Service_MatchDictCheck_ForbiddenResponseSchema.description)
+        ax.verify_param(service, not_none=True, param_name="service_name", http_error=HTTPNotFound,
+                        param_content={"value": check},
+                        msg_on_fail=s.PermissionsCheck_POST_NotFoundResponseSchema.description)
+        services[service_name] = service
+    service = services[service_name]
+    path_parts = [part for part in str(check.get("resource_path") or "").split("/") if part]
+    if not path_parts:
+        return service, service, True
+    resource, matched = models.find_resource_by_path(path_parts, service.resource_id, db_session=request.db)
+    return service, resource or service, matched == len(path_parts)
+
+
+def check_permissions_access(checks, request):
+    # type: (List[JSON], Request) -> List[JSON]
+    """
+    Resolves the access of users onto resources for every requested permission check.
+
+    Checks are grouped by service and user to be resolved together with
+    :meth:`magpie.services.ServiceInterface.effective_permissions_many`, such that the ancestors shared by the
+    resources and the groups of the user are retrieved only once per group. Resolution of any other user than the
+    logged user or the anonymous user requires administrator access.
+
+    :returns: Each check with the resolved access and :term:`Effective Permission` details, in the same order.
+    """
+    logged_name = get_constant("MAGPIE_LOGGED_USER", request)
+    anonymous_name = get_constant("MAGPIE_ANONYMOUS_USER", request)
+    is_admin = None
+    users = {}      # type: Dict[Str, models.User]
+    services = {}   # type: Dict[Str, models.Service]
+    batches = {}    # type: Dict[Tuple[int, int], Tuple[ServiceInterface, models.User, List[Tuple[int, Any]]]]
+    for index, check in enumerate(checks):
+        ax.verify_param(check, is_type=True, param_compare=dict, http_error=HTTPBadRequest,
+                        param_content={"value": check},
+                        msg_on_fail=s.PermissionsCheck_POST_BadRequestResponseSchema.description)
+        user_name = check.get("user_name") or logged_name
+        if user_name not in users:
+            if user_name not in [logged_name, anonymous_name] and getattr(request.user, "user_name", None) != user_name:
+                if is_admin is None:
+                    is_admin = ar.has_admin_access(request)
+                ax.verify_param(is_admin, is_true=True, param_name="user_name", http_error=HTTPForbidden,
+                                param_content={"value": user_name},
+                                msg_on_fail=s.PermissionsCheck_POST_ForbiddenResponseSchema.description)
+            users[user_name] = ar.get_user(request, user_name)
+        user = users[user_name]
+        permission = Permission.get(check.get("permission_name"))
+        ax.verify_param(permission, not_none=True, param_name="permission_name", http_error=HTTPBadRequest,
+                        param_content={"value": check},
+                        msg_on_fail=s.PermissionsCheck_POST_BadRequestResponseSchema.description)
+        service, resource, allow_match = _get_check_target(check, request, services)
+        batch_key = (service.resource_id, user.id)
+        if batch_key not in batches:
+            batches[batch_key] = (service_factory(service, request), user, [])
+        batches[batch_key][2].append((index, (resource, [permission], allow_match)))
+
+    results = [None] * len(checks)  # type: List[Optional[JSON]]
+    for service_impl, user, targets in batches.values():
+        resolved = service_impl.effective_permissions_many(user, [target for _, target in targets])
+        for (index, _), perms in zip(targets, resolved):
+            perm = perms[0]
+            results[index] = dict(checks[index], allowed=perm.access == Access.ALLOW, permission=perm.json())
+    return results
@@ -1,8 +1,12 @@
+import itertools
+import json
 from typing import TYPE_CHECKING
 
 from pyramid.httpexceptions import HTTPBadRequest, HTTPConflict, HTTPForbidden, HTTPInternalServerError, HTTPOk
+from pyramid.response import Response
 from pyramid.settings import asbool
 from pyramid.view import view_config
+from sqlalchemy.orm.session import Session
 from ziggurat_foundations.models.services.group import GroupService
 from ziggurat_foundations.models.services.user import UserService
 
@@ -10,36 +14,103 @@ from magpie import models
 from magpie.api import exception as ax
 from magpie.api import requests as ar
 from magpie.api import schemas as s
+from magpie.api.generic import get_request_info
 from magpie.api.management.resource import resource_formats as rf
 from magpie.api.management.resource import resource_utils as ru
-from magpie.api.management.service.service_formats import format_service_resources
-from magpie.api.management.service.service_utils import get_services_by_type
+from magpie.api.management.service.service_formats import format_service
+from magpie.api.management.service.service_utils import get_services_page
 from magpie.api.management.user import user_utils as uu
+from magpie.api.pagination import add_pagination_content, get_pagination
+from magpie.cache import bump_resource_tree_version, emit_cache_event
+from magpie.constants import MAGPIE_LOGGED_PERMISSION
 from magpie.permissions import PermissionType, format_permissions
 from magpie.register import magpie_register_permissions_from_config, sync_services_phoenix
 from magpie.services import SERVICE_TYPE_DICT, get_resource_child_allowed
+from magpie.utils import CONTENT_TYPE_JSON
 
 if TYPE_CHECKING:
-    from magpie.typedefs import NestingKeyType
+    from typing import List, Optional
 
+    from pyramid.request import Request
 
-@s.ResourcesAPI.get(tags=[s.ResourcesTag], response_schemas=s.Resources_GET_responses)
+    from magpie.api.pagination import Pagination
+    from magpie.typedefs import NestingKeyType, Str
+
+# rows fetched at once from the database, and minimum size of body chunks sent, when streaming the resources listing
+RESOURCES_STREAM_ROWS = 1000
+RESOURCES_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@s.ResourcesAPI.get(schema=s.Resources_GET_RequestSchema, tags=[s.ResourcesTag],
+                    response_schemas=s.Resources_GET_responses)
 @view_config(route_name=s.ResourcesAPI.name, request_method="GET")
 def get_resources_view(request):
     """
     List all registered resources.
+
+    When paginated, the limit applies to services, each one being returned with its complete tree of resources.
     """
-    res_json = {}
-    for svc_type in SERVICE_TYPE_DICT:
-        services = get_services_by_type(svc_type, db_session=request.db)
-        res_json[svc_type] = {}
-        for svc in services:
-            res_json[svc_type][svc.resource_name] = format_service_resources(
-                svc, request.db, show_all_children=True, show_private_url=False)
-    res_json = {"resources": res_json}
+    pagination = get_pagination(request)
+    services, cursor = get_services_page(SERVICE_TYPE_DICT, db_session=request.db, pagination=pagination)
+    if asbool(ar.get_query_param(request, "stream", False)):
+        return stream_resources_response(request, services, pagination, cursor)
+    services = [(svc, format_service(svc, show_private_url=False)) for svc in services]
+    res_json = ax.evaluate_call(
+        lambda: rf.format_services_resources(
+            services,
+            models.find_services_resources([svc.resource_id for svc, _ in services], request.db),
+            SERVICE_TYPE_DICT,
+        ),
+        fallback=lambda: request.db.rollback(), http_error=HTTPInternalServerError,
+        msg_on_fail=s.Resource_GET_InternalServerErrorResponseSchema.description
+    )
+    res_json = add_pagination_content({"resources": res_json}, pagination, cursor)
     return ax.valid_http(http_success=HTTPOk, detail=s.Resources_GET_OkResponseSchema.description, content=res_json)
 
 
+def stream_resources_response(request, services, pagination, cursor):
+    # type: (Request, List[models.Service], Optional[Pagination], Optional[Str]) -> Response
+    """
+    Generates the response of all resources of the services, sending the JSON body incrementally as it is generated.
+
+    Services are formatted before the response is returned, since the request transaction is completed before the
+    body is sent. Their resources are then retrieved by a dedicated database session while the body is iterated,
+    using a single query that streams the rows ordered for depth-first generation of the trees.
+    """
+    engine = request.db.get_bind()
+    services = sorted(services, key=lambda svc: svc.type)  # stable sort preserves name order within types
+    services = [(svc, format_service(svc, show_private_url=False)) for svc in services]
+    service_ids = [svc.resource_id for svc, _ in services]
+    content = add_pagination_content({}, pagination, cursor)
+    content.update({"code": HTTPOk.code, "detail": s.Resources_GET_OkResponseSchema.description,
+                    "type": CONTENT_TYPE_JSON})
+    content.update({key: val for key, val in get_request_info(request).items() if key not in content})
+
+    def generate():
+        db_session = Session(bind=engine)
+        try:
+            resources = models.find_services_resources(service_ids, db_session).yield_per(RESOURCES_STREAM_ROWS)
+            fragments = itertools.chain(
+                ["{\"resources\": "],
+                rf.iter_format_services_resources(services, resources, SERVICE_TYPE_DICT),
+                [", ", json.dumps(content)[1:]],
+            )
+            chunk = []
+            size = 0
+            for fragment in fragments:
+                chunk.append(fragment)
+                size += len(fragment)
+                if size >= RESOURCES_STREAM_CHUNK_SIZE:
+                    yield "".join(chunk).encode("utf-8")
+                    chunk = []
+                    size = 0
+            yield "".join(chunk).encode("utf-8")
+        finally:
+            db_session.close()
+
+    return Response(app_iter=generate(), content_type=CONTENT_TYPE_JSON, charset="UTF-8")
+
+
 @s.ResourceAPI.get(schema=s.Resource_GET_RequestSchema, tags=[s.ResourcesTag],
                    response_schemas=s.Resource_GET_responses)
 @view_config(route_name=s.ResourceAPI.name, request_method="GET")
@@ -156,11 +227,14 @@ def update_resource(request):
         if is_res_svc and service_push:
             sync_services_phoenix(all_services)
 
+    # emit before rename such that caches referring to the previous service name are also invalidated
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_RESOURCE, resource=resource)
     ax.evaluate_call(lambda: rename_service_magpie_and_phoenix(),
                      fallback=lambda: db_session.rollback(), http_error=HTTPForbidden,
                      msg_on_fail=s.Resource_PATCH_ForbiddenResponseSchema.description,
                      content={"resource_id": resource.resource_id, "resource_name": resource.resource_name,
                               "old_resource_name": res_old_name, "new_resource_name": res_new_name})
+    bump_resource_tree_version(resource.root_service_id or resource.resource_id)
     return ax.valid_http(http_success=HTTPOk, detail=s.Resource_PATCH_OkResponseSchema.description,
                          content={"resource_id": resource.resource_id, "resource_name": resource.resource_name,
                                   "old_resource_name": res_old_name, "new_resource_name": res_new_name})
@@ -217,6 +291,24 @@ def get_resource_types_view(request):
                          detail=s.ResourceTypes_GET_OkResponseSchema.description)
 
 
+@s.PermissionsCheckAPI.post(schema=s.PermissionsCheck_POST_RequestSchema, tags=[s.PermissionTag],
+                            response_schemas=s.PermissionsCheck_POST_responses, api_security=s.SecurityAuthenticatedAPI)
+@view_config(route_name=s.PermissionsCheckAPI.name, request_method="POST", permission=MAGPIE_LOGGED_PERMISSION)
+def check_permissions_view(request):
+    """
+    Resolve the effective access of users onto resources for a batch of permissions.
+
+    Any logged user can resolve its own access or the one of the anonymous user. Administrator access is required
+    to resolve the access of other users.
+    """
+    checks = ar.get_value_multiformat_body_checked(request, "checks", check_type=list)
+    ax.verify_param(checks, not_empty=True, http_error=HTTPBadRequest, param_name="checks",
+                    msg_on_fail=s.PermissionsCheck_POST_BadRequestResponseSchema.description)
+    results = ru.check_permissions_access(checks, request)
+    return ax.valid_http(http_success=HTTPOk, content={"checks": results},
+                         detail=s.PermissionsCheck_POST_OkResponseSchema.description)
+
+
 @s.PermissionsAPI.patch(schema=s.Permissions_PATCH_RequestSchema, tags=[s.PermissionTag],
                         response_schema=s.Permissions_PATCH_responses)
 @view_config(route_name=s.PermissionsAPI.name, request_method="PATCH")
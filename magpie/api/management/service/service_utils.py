@@ -17,6 +17,7 @@ from magpie.api import exception as ax
 from magpie.api import schemas as s
 from magpie.api.management.group.group_utils import create_group_resource_permission_response
 from magpie.api.management.service.service_formats import format_service
+from magpie.api.pagination import paginate_query, paginate_results
 from magpie.constants import get_constant
 from magpie.permissions import Permission
 from magpie.register import SERVICES_PHOENIX_ALLOWED, sync_services_phoenix
@@ -25,11 +26,12 @@ from magpie.utils import get_logger
 
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import Iterable, List, Optional
+    from typing import Iterable, List, Optional, Tuple
 
     from pyramid.httpexceptions import HTTPException
     from sqlalchemy.orm.session import Session
 
+    from magpie.api.pagination import Pagination
     from magpie.typedefs import JSON, Str
 
 LOGGER = get_logger(__name__)
@@ -110,6 +112,18 @@ def get_services_by_type(service_type, db_session):
     return sorted(services, key=lambda svc: svc.resource_name)
 
 
+def get_services_page(service_types, db_session, pagination=None):
+    # type: (Iterable[Str], Session, Optional[Pagination]) -> Tuple[List[models.Service], Optional[Str]]
+    """
+    Obtains services of all requested service-types ordered by name, optionally limited to the requested page.
+
+    :returns: services, and cursor of the next page if pagination was requested and another page follows.
+    """
+    query = db_session.query(models.Service).filter(models.Service.type.in_(list(service_types)))
+    query = paginate_query(query, models.Service.resource_name, pagination)
+    return paginate_results(query, pagination, key=lambda svc: svc.resource_name)
+
+
 def add_service_getcapabilities_perms(service, db_session, group_name=None):
     if service.type in SERVICES_PHOENIX_ALLOWED and \
             Permission.GET_CAPABILITIES in SERVICE_TYPE_DICT[service.type].permissions:
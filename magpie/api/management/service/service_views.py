@@ -18,6 +18,8 @@ from magpie.api import schemas as s
 from magpie.api.management.resource import resource_utils as ru
 from magpie.api.management.service import service_formats as sf
 from magpie.api.management.service import service_utils as su
+from magpie.api.pagination import add_pagination_content, get_pagination
+from magpie.cache import bump_resource_tree_version, emit_cache_event
 from magpie.permissions import Permission, PermissionType, format_permissions
 from magpie.register import SERVICES_PHOENIX_ALLOWED, sync_services_phoenix
 from magpie.services import SERVICE_TYPE_DICT, invalidate_service, service_factory
@@ -83,28 +85,28 @@ def get_services_runner(request):
                         content={"service_type": str(service_type_filter)}, content_type=CONTENT_TYPE_JSON)
         service_types = [service_type_filter]
 
-    svc_content = [] if services_as_list else {}  # type: Union[List[JSON], JSON]
-    for service_type in service_types:
-        if service_type not in known_service_types:
-            continue
-        services = su.get_services_by_type(service_type, db_session=request.db)
-        if not services_as_list:
-            svc_content[service_type] = {}
-        for service in services:
-            svc_fmt = sf.format_service(service, show_private_url=True)
-            if services_as_list:
-                svc_content.append(svc_fmt)  # pylint: disable=E1101
-            else:
-                svc_content[service_type][service.resource_name] = svc_fmt
-
-    # sort result
+    service_types = [svc_type for svc_type in service_types if svc_type in known_service_types]
+    pagination = get_pagination(request)
+    services, cursor = su.get_services_page(service_types, db_session=request.db, pagination=pagination)
+    svc_content = []  # type: Union[List[JSON], JSON]
+    if not services_as_list:
+        svc_content = {svc_type: {} for svc_type in service_types}
+    for service in services:
+        svc_fmt = sf.format_service(service, show_private_url=True)
+        if services_as_list:
+            svc_content.append(svc_fmt)  # pylint: disable=E1101
+        else:
+            svc_content[service.type][service.resource_name] = svc_fmt
+
+    # sort result (pages are already ordered by the database)
     if services_as_list:
-        svc_content = list(sorted(svc_content, key=lambda svc: svc["service_name"]))
+        if pagination is None:
+            svc_content = list(sorted(svc_content, key=lambda svc: svc["service_name"]))
     else:
         svc_content = {svc_type: dict(sorted(svc_items.items())) for svc_type, svc_items in sorted(svc_content.items())}
 
-    return ax.valid_http(http_success=HTTPOk, content={"services": svc_content},
-                         detail=s.Services_GET_OkResponseSchema.description)
+    content = add_pagination_content({"services": svc_content}, pagination, cursor)
+    return ax.valid_http(http_success=HTTPOk, content=content, detail=s.Services_GET_OkResponseSchema.description)
 
 
 @s.ServicesAPI.post(schema=s.Services_POST_RequestBodySchema, tags=[s.ServicesTag],
@@ -186,6 +188,7 @@ def update_service_view(request):
 
     old_svc_content = sf.format_service(service, show_private_url=True)
     err_svc_content = {"service": old_svc_content, "new_service_name": svc_name, "new_service_url": svc_url}
+    emit_cache_event(request.db, models.CacheEvent.SCOPE_RESOURCE, resource=service)
     ax.evaluate_call(lambda: update_service_magpie_and_phoenix(service, svc_name, svc_url, service_push, request.db),
                      fallback=lambda: request.db.rollback(),
                      http_error=HTTPForbidden, msg_on_fail=s.Service_PATCH_ForbiddenResponseSchema.description,
@@ -222,6 +225,7 @@ def unregister_service_view(request):
     svc_content = sf.format_service(service, show_private_url=True)
     svc_res_id = service.resource_id
     svc_name = service.resource_name
+    emit_cache_event(request.db, models.CacheEvent.SCOPE_RESOURCE, resource=service)
     ax.evaluate_call(lambda: models.RESOURCE_TREE_SERVICE.delete_branch(resource_id=svc_res_id, db_session=request.db),
                      fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
                      msg_on_fail="Delete service from resource tree failed.", content=svc_content)
@@ -234,6 +238,7 @@ def unregister_service_view(request):
     ax.evaluate_call(lambda: remove_service_magpie_and_phoenix(service, service_push, request.db),
                      fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
                      msg_on_fail=s.Service_DELETE_ForbiddenResponseSchema.description, content=svc_content)
+    bump_resource_tree_version(svc_res_id)
     invalidate_service(svc_name)
     return ax.valid_http(http_success=HTTPOk, detail=s.Service_DELETE_OkResponseSchema.description)
 
@@ -33,6 +33,7 @@ from magpie.api.webhooks import (
     get_permission_update_params,
     process_webhook_requests
 )
+from magpie.cache import emit_cache_event
 from magpie.constants import get_constant
 from magpie.models import TemporaryToken, TokenOperation
 from magpie.permissions import PermissionSet, PermissionType, format_permissions
@@ -310,6 +311,7 @@ def create_user_resource_permission_response(user, resource, permission, db_sess
     ax.evaluate_call(lambda: db_session.add(new_perm), fallback=lambda: db_session.rollback(),
                      http_error=HTTPForbidden, content=err_content,
                      msg_on_fail=s.UserResourcePermissions_POST_ForbiddenResponseSchema.description)
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_USER, resource=resource, user_id=user.id)
     webhook_params = get_permission_update_params(user, resource, permission)
     process_webhook_requests(WebhookAction.CREATE_USER_PERMISSION, webhook_params)
     return ax.valid_http(http_success=http_success, content=err_content, detail=http_detail)
@@ -330,6 +332,7 @@ def assign_user_group(user, group, db_session):
                      fallback=lambda: db_session.rollback(), http_error=HTTPForbidden,
                      msg_on_fail=s.UserGroups_POST_RelationshipForbiddenResponseSchema.description,
                      content={"user_name": user.user_name, "group_name": group.group_name})
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_USER, user_id=user.id)
 
 
 def send_group_terms_email(user, group, db_session):
@@ -439,6 +442,7 @@ def delete_user_group(user, group, db_session):
     ax.evaluate_call(lambda: del_usr_grp(user, group), fallback=lambda: db_session.rollback(),
                      http_error=HTTPNotFound, msg_on_fail=s.UserGroup_DELETE_NotFoundResponseSchema.description,
                      content={"user_name": user.user_name, "group_name": group.group_name})
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_USER, user_id=user.id)
 
 
 def delete_user_resource_permission_response(user, resource, permission, db_session, similar=True):
@@ -470,6 +474,7 @@ def delete_user_resource_permission_response(user, resource, permission, db_sess
     ax.evaluate_call(lambda: db_session.delete(del_perm), fallback=lambda: db_session.rollback(),
                      http_error=HTTPNotFound, content=err_content,
                      msg_on_fail=s.UserResourcePermissionName_DELETE_NotFoundResponseSchema.description)
+    emit_cache_event(db_session, models.CacheEvent.SCOPE_USER, resource=resource, user_id=user.id)
     webhook_params = get_permission_update_params(user, resource, permission)
     process_webhook_requests(WebhookAction.DELETE_USER_PERMISSION, webhook_params)
     return ax.valid_http(http_success=HTTPOk, detail=s.UserResourcePermissionName_DELETE_OkResponseSchema.description)
@@ -853,6 +858,26 @@ def get_user_service_resources_permissions_dict(user, service, request,
                                                resolve_groups_permissions=resolve_groups_permissions)
 
 
+def get_user_service_resources_effective_permissions(user, service, request):
+    # type: (models.User, models.Service, Request) -> Tuple[List[PermissionSet], ResourcePermissionMap]
+    """
+    Resolves the :term:`Effective Permissions <Effective Permission>` of the user for the :term:`Service` and every
+    :term:`Resource` nested under it.
+
+    All permissions are resolved at once in a single top-down pass over the resource tree.
+
+    .. seealso::
+        :meth:`magpie.services.ServiceInterface.effective_permissions_tree`
+
+    :returns: effective permissions of the service, and dictionary of resource IDs with their effective permissions.
+    """
+    service_impl = service_factory(service, request)
+    tree = ru.get_resource_children(service, request.db)
+    effective_perms = service_impl.effective_permissions_tree(user, service, tree)
+    service_perms = effective_perms.pop(service.resource_id)
+    return service_perms, effective_perms
+
+
 def check_user_info(user_name=None, email=None, password=None, group_name=None,  # required unless disabled explicitly
                     check_name=True, check_email=True, check_password=True, check_group=True):
     # type: (Str, Str, Str, Str, bool, bool, bool, bool) -> None
@@ -15,6 +15,7 @@ from magpie.api.management.service import service_formats as sf
 from magpie.api.management.service import service_utils as su
 from magpie.api.management.user import user_formats as uf
 from magpie.api.management.user import user_utils as uu
+from magpie.api.pagination import add_pagination_content, get_pagination, paginate_results
 from magpie.api.webhooks import WebhookAction, process_webhook_requests
 from magpie.constants import MAGPIE_CONTEXT_PERMISSION, MAGPIE_LOGGED_PERMISSION, get_constant
 from magpie.models import UserGroupStatus
@@ -39,14 +40,25 @@ def get_users_view(request):
                         param_content={"compare": allowed},  # provide literals in error response
                         http_error=HTTPBadRequest, msg_on_fail=s.Users_GET_BadRequestSchema.description)
     detail = asbool(request.params.get("detail", False))
-    user_list = ax.evaluate_call(lambda: models.UserSearchService.by_status(status, db_session=request.db),
-                                 fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
-                                 msg_on_fail=s.Users_GET_ForbiddenResponseSchema.description)
+    pagination = get_pagination(request)
+    if pagination is None:
+        user_list = ax.evaluate_call(lambda: models.UserSearchService.by_status(status, db_session=request.db),
+                                     fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
+                                     msg_on_fail=s.Users_GET_ForbiddenResponseSchema.description)
+        user_list = sorted(user_list, key=lambda user: user.user_name)
+    else:
+        user_list = ax.evaluate_call(
+            lambda: models.UserSearchService.by_status_page(
+                status, after=pagination.after, limit=pagination.limit + 1 if pagination.limit else None,
+                db_session=request.db),
+            fallback=lambda: request.db.rollback(), http_error=HTTPForbidden,
+            msg_on_fail=s.Users_GET_ForbiddenResponseSchema.description)
+    user_list, cursor = paginate_results(user_list, pagination, key=lambda user: user.user_name)
     if detail:
-        data = {"users": list(sorted([uf.format_user(user, basic_info=True) for user in user_list],
-                                     key=lambda user: user["user_name"]))}
+        data = {"users": [uf.format_user(user, basic_info=True) for user in user_list]}
     else:
-        data = {"user_names": list(sorted(user.user_name for user in user_list))}
+        data = {"user_names": [user.user_name for user in user_list]}
+    data = add_pagination_content(data, pagination, cursor)
     return ax.valid_http(http_success=HTTPOk, content=data, detail=s.Users_GET_OkResponseSchema.description)
 
 
@@ -477,25 +489,34 @@ def delete_user_service_permission_name_view(request):
 def get_user_service_resources_view(request):
     """
     List all resources under a service a user has permission on.
+
+    When effective permissions are requested, all resources under the service are listed with their resolved access.
     """
     inherit_groups_perms = asbool(ar.get_query_param(request, ["inherit", "inherited"]))
     resolve_groups_perms = asbool(ar.get_query_param(request, ["resolve", "resolved"]))
+    effective_perms = asbool(ar.get_query_param(request, "effective"))
     user = ar.get_user_matchdict_checked_or_logged(request)
     service = ar.get_service_matchdict_checked(request)
-    service_perms = uu.get_user_service_permissions(
-        user, service, request=request,
-        inherit_groups_permissions=inherit_groups_perms,
-        resolve_groups_permissions=resolve_groups_perms)
-    resources_perms_dict = uu.get_user_service_resources_permissions_dict(
-        user, service, request=request,
-        inherit_groups_permissions=inherit_groups_perms,
-        resolve_groups_permissions=resolve_groups_perms)
+    if effective_perms:
+        service_perms, resources_perms_dict = uu.get_user_service_resources_effective_permissions(
+            user, service, request=request)
+        perm_type = PermissionType.EFFECTIVE
+    else:
+        service_perms = uu.get_user_service_permissions(
+            user, service, request=request,
+            inherit_groups_permissions=inherit_groups_perms,
+            resolve_groups_permissions=resolve_groups_perms)
+        resources_perms_dict = uu.get_user_service_resources_permissions_dict(
+            user, service, request=request,
+            inherit_groups_permissions=inherit_groups_perms,
+            resolve_groups_permissions=resolve_groups_perms)
+        perm_type = PermissionType.INHERITED if inherit_groups_perms else PermissionType.DIRECT
     user_svc_res_json = sf.format_service_resources(
         service=service,
         db_session=request.db,
         service_perms=service_perms,
         resources_perms_dict=resources_perms_dict,
-        permission_type=PermissionType.INHERITED if inherit_groups_perms else PermissionType.DIRECT,
+        permission_type=perm_type,
         show_all_children=False,
         show_private_url=False,
     )
@@ -7,6 +7,7 @@ from mako.template import Template
 from pyramid.settings import asbool
 
 from magpie.constants import get_constant
+from magpie.metrics import measure_dispatch
 from magpie.utils import get_logger, get_magpie_url, get_settings, raise_log
 
 if TYPE_CHECKING:
@@ -207,7 +208,8 @@ def send_email(recipient, container, template, parameters=None):
         LOGGER.debug("Sending email to: [%s] using template [%s]", recipient, template.filename)
         # result of sendmail is returned only if at least one of many recipients succeeds,
         # but here we use just one, so it should either succeed completely or raise
-        result = server.sendmail(config["sender"], [recipient], message)
+        with measure_dispatch("email"):
+            result = server.sendmail(config["sender"], [recipient], message)
     except Exception as exc:
         LOGGER.error("Failure during notification email to: [%s] using template [%s]. "
                      "Error: %r", recipient, template.filename, exc)
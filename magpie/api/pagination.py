@@ -0,0 +1,138 @@
+"""
+Keyset pagination of listing requests.
+
+Items are ordered by a unique column in the database, and each page is retrieved with a filter on values following the
+last item of the previous page (the *cursor*) rather than with an offset. The page is therefore obtained by an indexed
+search regardless of its position in the listing, and items inserted or deleted before the cursor between requests do
+not shift the following pages.
+"""
+import base64
+import json
+from typing import TYPE_CHECKING
+
+import six
+from pyramid.httpexceptions import HTTPBadRequest
+
+from magpie.api import exception as ax
+from magpie.api import schemas as s
+from magpie.api.requests import get_query_param
+from magpie.constants import get_constant
+
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+    from pyramid.request import Request
+    from sqlalchemy.orm.query import Query
+    from sqlalchemy.sql.elements import ColumnElement
+
+    from magpie.typedefs import JSON, Str
+
+
+class Pagination(object):
+    """
+    Pagination parameters of a listing request.
+    """
+    def __init__(self, limit=None, after=None):
+        # type: (Optional[int], Optional[Any]) -> None
+        self.limit = limit  # maximum items of the page, all remaining items if None
+        self.after = after  # key value of the last item of the previous page, first page if None
+
+
+def encode_cursor(value):
+    # type: (Any) -> Str
+    """
+    Encodes the key value of the last item of a page into an opaque cursor employed to request the next page.
+    """
+    data = json.dumps([value], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("utf-8").rstrip("=")
+
+
+def decode_cursor(cursor):
+    # type: (Str) -> Any
+    """
+    Decodes the key value referred to by a cursor obtained with :func:`encode_cursor`.
+
+    :raises ValueError: if the cursor is not valid.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value = json.loads(data.decode("utf-8"))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor: {!s}".format(exc))
+    if not isinstance(value, list) or len(value) != 1:
+        raise ValueError("Invalid cursor contents.")
+    return value[0]
+
+
+def get_pagination(request):
+    # type: (Request) -> Optional[Pagination]
+    """
+    Obtains the pagination parameters from ``limit`` and ``cursor`` query parameters.
+
+    The ``limit`` is reduced to :envvar:`MAGPIE_PAGE_SIZE_MAX` if it exceeds it, and defaults to it when only the
+    ``cursor`` is specified, such that every page remains bounded.
+
+    :returns: pagination parameters, or ``None`` if neither of them are specified to list every item at once.
+    :raises HTTPBadRequest: if any of the parameters is invalid.
+    """
+    limit = get_query_param(request, "limit")
+    cursor = get_query_param(request, "cursor")
+    if limit is None and cursor is None:
+        return None
+    max_limit = int(get_constant("MAGPIE_PAGE_SIZE_MAX", request))
+    if limit is not None:
+        ax.verify_param(limit, matches=True, param_compare=r"^[1-9][0-9]*$", param_name="limit",
+                        http_error=HTTPBadRequest, msg_on_fail=s.Pagination_BadRequestResponseSchema.description)
+        limit = min(int(limit), max_limit)
+    else:
+        limit = max_limit
+    after = None
+    if cursor:
+        after = ax.evaluate_call(lambda: decode_cursor(cursor), http_error=HTTPBadRequest,
+                                 msg_on_fail=s.Pagination_BadRequestResponseSchema.description,
+                                 content={"param": {"name": "cursor", "value": cursor}})
+        # keys of all paginated listings are names, any other type would fail the comparison in the database
+        ax.verify_param(after, is_type=True, param_compare=six.string_types, param_name="cursor",
+                        http_error=HTTPBadRequest, msg_on_fail=s.Pagination_BadRequestResponseSchema.description)
+    return Pagination(limit, after)
+
+
+def paginate_query(query, column, pagination):
+    # type: (Query, ColumnElement, Optional[Pagination]) -> Query
+    """
+    Orders the query by the unique key column, and restricts it to items of the page (plus one).
+
+    The additional item retrieved beyond the limit indicates if another page follows (see :func:`paginate_results`).
+    """
+    query = query.order_by(column)
+    if pagination is None:
+        return query
+    if pagination.after is not None:
+        query = query.filter(column > pagination.after)
+    if pagination.limit is not None:
+        query = query.limit(pagination.limit + 1)
+    return query
+
+
+def paginate_results(items, pagination, key):
+    # type: (Iterable[Any], Optional[Pagination], Callable[[Any], Any]) -> Tuple[List[Any], Optional[Str]]
+    """
+    Obtains the items of the page retrieved with :func:`paginate_query` and the cursor of the following one.
+
+    :returns: items of the page, and cursor of the next page or ``None`` if it is the last one.
+    """
+    items = list(items)
+    if pagination is None or pagination.limit is None or len(items) <= pagination.limit:
+        return items, None
+    items = items[:pagination.limit]
+    return items, encode_cursor(key(items[-1]))
+
+
+def add_pagination_content(content, pagination, cursor):
+    # type: (JSON, Optional[Pagination], Optional[Str]) -> JSON
+    """
+    Adds the cursor of the next page to the response content of a paginated listing request.
+    """
+    if pagination is not None:
+        content["next_cursor"] = cursor
+    return content
@@ -201,6 +201,9 @@ GroupResourcePermissionAPI = Service(
 PermissionsAPI = Service(
     path="/permissions",
     name="Permissions")
+PermissionsCheckAPI = Service(
+    path="/permissions/check",
+    name="PermissionsCheck")
 RegisterGroupsAPI = Service(
     path="/register/groups",
     name="RegisterGroups")
@@ -273,6 +276,9 @@ VersionAPI = Service(
 HomepageAPI = Service(
     path="/",
     name="homepage")
+MetricsAPI = Service(
+    path="/metrics",
+    name="Metrics")
 TemporaryUrlAPI = Service(
     path="/tmp/{token}",  # nosec: B108
     name="temporary_url")
@@ -587,6 +593,37 @@ class QueryFilterServiceType(colander.MappingSchema):
     )
 
 
+class QueryPagination(colander.MappingSchema):
+    limit = colander.SchemaNode(
+        colander.Integer(), name="limit", missing=colander.drop,
+        validator=colander.Range(min=1),
+        description=(
+            "Maximum number of items to return. When specified, items are ordered by name and the response provides "
+            "a 'next_cursor' value to request the following page, or null if it is the last one. "
+            "All items are returned if neither 'limit' nor 'cursor' are specified. Values above the maximum page size "
+            "configured by the server are reduced to it, which is also the default when only 'cursor' is specified."
+        )
+    )
+    cursor = colander.SchemaNode(
+        colander.String(), name="cursor", missing=colander.drop,
+        description=(
+            "Opaque value of 'next_cursor' returned by the previous page to obtain items following it. "
+            "Pages remain consistent when items are created or removed between requests."
+        )
+    )
+
+
+class QueryPaginationSchema(QueryRequestSchemaAPI, QueryPagination):
+    pass
+
+
+class NextCursorSchema(colander.SchemaNode):
+    schema_type = colander.String
+    name = "next_cursor"
+    description = "Cursor to request the next page with the same parameters, or null if it is the last one."
+    missing = colander.drop
+
+
 class PhoenixServicePushOption(colander.SchemaNode):
     schema_type = colander.Boolean
     description = "Push service update to Phoenix if applicable"
@@ -730,6 +767,11 @@ class BadRequestResponseSchema(BaseResponseSchemaAPI):
     body = ErrorResponseBodySchema(code=HTTPBadRequest.code, description=description)
 
 
+class Pagination_BadRequestResponseSchema(BaseResponseSchemaAPI):
+    description = "Invalid pagination parameters. Limit must be a positive integer and cursor a returned value."
+    body = ErrorResponseBodySchema(code=HTTPBadRequest.code, description=description)
+
+
 class UnauthorizedResponseBodySchema(ErrorResponseBodySchema):
     def __init__(self, **kw):
         # type: (Any) -> None
@@ -925,6 +967,90 @@ class Permissions_PATCH_ForbiddenResponseSchema(BaseResponseSchemaAPI):
     body = ErrorResponseBodySchema(code=HTTPForbidden.code, description=description)
 
 
+class PermissionCheckObjectSchema(colander.MappingSchema):
+    user_name = colander.SchemaNode(
+        colander.String(),
+        description="User for which to resolve access. Uses the logged user (or anonymous) if omitted.",
+        example="toto",
+        missing=colander.drop
+    )
+    service_name = colander.SchemaNode(
+        colander.String(),
+        description="Service under which the resource path is resolved. Required unless 'resource_id' is provided.",
+        example="thredds",
+        missing=colander.drop
+    )
+    resource_path = colander.SchemaNode(
+        colander.String(),
+        description="Names of children resources under the service to resolve, as when accessed through the proxy. "
+                    "Access of the closest existing parent resource is resolved if the full path does not exist.",
+        example="/birdhouse/dataset.nc",
+        missing=colander.drop
+    )
+    resource_id = colander.SchemaNode(
+        colander.Integer(),
+        description="Resource onto which to resolve access, instead of 'service_name' and 'resource_path'.",
+        example=123,
+        missing=colander.drop
+    )
+    permission_name = colander.SchemaNode(
+        colander.String(),
+        description="Permission name for which to resolve access.",
+        example=Permission.READ.value
+    )
+
+
+class PermissionCheckListSchema(colander.SequenceSchema):
+    check = PermissionCheckObjectSchema()
+
+
+class PermissionsCheck_POST_RequestBodySchema(colander.MappingSchema):
+    checks = PermissionCheckListSchema()
+
+
+class PermissionsCheck_POST_RequestSchema(BaseRequestSchemaAPI):
+    body = PermissionsCheck_POST_RequestBodySchema()
+
+
+class PermissionCheckResultSchema(PermissionCheckObjectSchema):
+    allowed = colander.SchemaNode(
+        colander.Boolean(),
+        description="Indicates if the user is granted access to the resource for the permission.",
+        example=True
+    )
+    permission = PermissionObjectTypeSchema(
+        description="Effective permission resolved for the user on the resource."
+    )
+
+
+class PermissionCheckResultListSchema(colander.SequenceSchema):
+    check = PermissionCheckResultSchema()
+
+
+class PermissionsCheck_POST_ResponseBodySchema(BaseResponseBodySchema):
+    checks = PermissionCheckResultListSchema()
+
+
+class PermissionsCheck_POST_OkResponseSchema(BaseResponseSchemaAPI):
+    description = "Resolve permissions access successful."
+    body = PermissionsCheck_POST_ResponseBodySchema(code=HTTPOk.code, description=description)
+
+
+class PermissionsCheck_POST_BadRequestResponseSchema(BaseResponseSchemaAPI):
+    description = "Missing or invalid parameters for permissions access resolution."
+    body = ErrorResponseBodySchema(code=HTTPBadRequest.code, description=description)
+
+
+class PermissionsCheck_POST_ForbiddenResponseSchema(BaseResponseSchemaAPI):
+    description = "Administrator access is required to resolve permissions access of other users."
+    body = ErrorResponseBodySchema(code=HTTPForbidden.code, description=description)
+
+
+class PermissionsCheck_POST_NotFoundResponseSchema(BaseResponseSchemaAPI):
+    description = "Could not find specified user, service or resource for permissions access resolution."
+    body = ErrorResponseBodySchema(code=HTTPNotFound.code, description=description)
+
+
 class BaseUserInfoSchema(colander.MappingSchema):
     user_name = UserNameParameter
     email = colander.SchemaNode(
@@ -1197,6 +1323,25 @@ class Resources_ResponseBodySchema(BaseResponseBodySchema):
     resources = ResourcesSchemaNode()
 
 
+class Resources_GET_QuerySchema(QueryPaginationSchema):
+    stream = colander.SchemaNode(
+        colander.Boolean(), name="stream", default=False, missing=colander.drop,
+        description=(
+            "Generate the JSON response incrementally while resources are retrieved instead of building it completely "
+            "beforehand, in order to limit memory usage with large resource trees. The response is then sent in "
+            "chunks, always in JSON format, and an error occurring while it is generated can only truncate it."
+        )
+    )
+
+
+class Resources_GET_RequestSchema(BaseRequestSchemaAPI):
+    querystring = Resources_GET_QuerySchema(description="Pagination applies to services with all their resources.")
+
+
+class Resources_GET_ResponseBodySchema(Resources_ResponseBodySchema):
+    next_cursor = NextCursorSchema()
+
+
 class Resource_GET_RequestQuerySchema(QueryRequestSchemaAPI, QueryParentResources):
     pass
 
@@ -1310,7 +1455,7 @@ class Resource_DELETE_ForbiddenResponseSchema(BaseResponseSchemaAPI):
 
 class Resources_GET_OkResponseSchema(BaseResponseSchemaAPI):
     description = "Get resources successful."
-    body = Resources_ResponseBodySchema(code=HTTPOk.code, description=description)
+    body = Resources_GET_ResponseBodySchema(code=HTTPOk.code, description=description)
 
 
 class Resources_POST_RequestBodySchema(colander.MappingSchema):
@@ -1559,7 +1704,7 @@ class Service_CheckConfig_UnprocessableEntityResponseSchema(BaseResponseSchemaAP
     body = ErrorResponseBodySchema(code=HTTPUnprocessableEntity.code, description=description)
 
 
-class ServicesQuerySchema(QueryRequestSchemaAPI, QueryFlattenServices, QueryFilterServiceType):
+class ServicesQuerySchema(QueryRequestSchemaAPI, QueryFlattenServices, QueryFilterServiceType, QueryPagination):
     pass
 
 
@@ -1584,6 +1729,7 @@ class Services_GET_ResponseBodySchema(BaseResponseBodySchema):
     # FIXME: add support schema OneOf(ServicesCategorizedSchemaNode, ServicesListingSchemaNode)
     #        requires https://github.com/fmigneault/cornice.ext.swagger/tree/oneOf-objects
     services = ServicesCategorizedSchemaNode()
+    next_cursor = NextCursorSchema()
 
 
 class Services_GET_OkResponseSchema(BaseResponseSchemaAPI):
@@ -1910,7 +2056,7 @@ class ServiceTypeResourceTypes_GET_NotFoundResponseSchema(BaseResponseSchemaAPI)
     body = ErrorResponseBodySchema(code=HTTPNotFound.code, description=description)
 
 
-class UsersQuery(QueryRequestSchemaAPI):
+class UsersQuery(QueryRequestSchemaAPI, QueryPagination):
     status = colander.SchemaNode(
         colander.Integer(),
         missing=colander.drop,
@@ -1936,6 +2082,7 @@ class Users_GET_RequestSchema(BaseRequestSchemaAPI):
 class Users_GET_ResponseBodySchema(BaseResponseBodySchema):
     user_names = UserNamesListSchema(missing=colander.drop, description="User names when no detail is requested.")
     users = UserDetailListSchema(missing=colander.drop, description="List of user details when it is requested.")
+    next_cursor = NextCursorSchema()
 
 
 class Users_GET_OkResponseSchema(BaseResponseSchemaAPI):
@@ -2537,7 +2684,8 @@ class UserServiceResources_GET_OkResponseSchema(BaseResponseSchemaAPI):
 class UserServiceResources_GET_QuerySchema(
     QueryRequestSchemaAPI,
     QueryInheritGroupsPermissions,
-    QueryResolvedUserGroupsPermissions
+    QueryResolvedUserGroupsPermissions,
+    QueryEffectivePermissions
 ):
     pass
 
@@ -2658,8 +2806,13 @@ class Groups_CheckInfo_ForbiddenResponseSchema(BaseResponseSchemaAPI):
     body = ErrorResponseBodySchema(code=HTTPForbidden.code, description=description)
 
 
+class Groups_GET_RequestSchema(BaseRequestSchemaAPI):
+    querystring = QueryPaginationSchema()
+
+
 class Groups_GET_ResponseBodySchema(BaseResponseBodySchema):
     group_names = GroupNamesListSchema()
+    next_cursor = NextCursorSchema()
 
 
 class Groups_GET_OkResponseSchema(BaseResponseSchemaAPI):
@@ -3478,6 +3631,12 @@ class Homepage_GET_OkResponseSchema(BaseResponseSchemaAPI):
     body = BaseResponseBodySchema(code=HTTPOk.code, description=description)
 
 
+class Metrics_GET_OkResponseSchema(colander.MappingSchema):
+    description = "Get metrics successful."
+    body = colander.SchemaNode(colander.String(), description="Metrics in Prometheus text exposition format.",
+                               example="magpie_cache_requests_total{region=\"acl\",result=\"hit\"} 42.0")
+
+
 class SwaggerAPI_GET_OkResponseSchema(colander.MappingSchema):
     description = TitleAPI
     header = RequestHeaderSchemaUI()
@@ -3507,6 +3666,7 @@ Resource_PATCH_responses = {
 }
 Resources_GET_responses = {
     "200": Resources_GET_OkResponseSchema(),
+    "400": Pagination_BadRequestResponseSchema(),
     "401": UnauthorizedResponseSchema(),
     "406": NotAcceptableResponseSchema(),
     "500": Resource_GET_InternalServerErrorResponseSchema(),
@@ -3672,6 +3832,15 @@ Permissions_PATCH_responses = {
     "406": NotAcceptableResponseSchema(),
     "500": InternalServerErrorResponseSchema(),
 }
+PermissionsCheck_POST_responses = {
+    "200": PermissionsCheck_POST_OkResponseSchema(),
+    "400": PermissionsCheck_POST_BadRequestResponseSchema(),
+    "401": UnauthorizedResponseSchema(),
+    "403": PermissionsCheck_POST_ForbiddenResponseSchema(),
+    "404": PermissionsCheck_POST_NotFoundResponseSchema(),
+    "406": NotAcceptableResponseSchema(),
+    "500": InternalServerErrorResponseSchema(),
+}
 Users_GET_responses = {
     "200": Users_GET_OkResponseSchema(),
     "400": Users_GET_BadRequestSchema(),
@@ -3978,6 +4147,7 @@ LoggedUserServicePermissions_DELETE_responses = LoggedUserResourcePermissions_DE
 LoggedUserServicePermissionName_DELETE_responses = LoggedUserResourcePermissionName_DELETE_responses
 Groups_GET_responses = {
     "200": Groups_GET_OkResponseSchema(),
+    "400": Pagination_BadRequestResponseSchema(),
     "401": UnauthorizedResponseSchema(),
     "403": Groups_GET_ForbiddenResponseSchema(),  # FIXME: https://github.com/Ouranosinc/Magpie/issues/359
     "406": NotAcceptableResponseSchema(),
@@ -4225,6 +4395,12 @@ Homepage_GET_responses = {
     "406": NotAcceptableResponseSchema(),
     "500": InternalServerErrorResponseSchema(),
 }
+Metrics_GET_responses = {
+    "200": Metrics_GET_OkResponseSchema(),
+    "401": UnauthorizedResponseSchema(),
+    "403": HTTPForbiddenResponseSchema(),
+    "500": InternalServerErrorResponseSchema(),
+}
 SwaggerAPI_GET_responses = {
     "200": SwaggerAPI_GET_OkResponseSchema(),
     "500": InternalServerErrorResponseSchema(),
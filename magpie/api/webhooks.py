@@ -18,6 +18,7 @@ from magpie.api.management.service.service_formats import format_service
 from magpie.api.management.user.user_formats import format_user
 from magpie.constants import get_constant
 from magpie.db import get_db_session_from_config_ini
+from magpie.metrics import measure_dispatch
 from magpie.register import get_all_configs
 from magpie.utils import (
     CONTENT_TYPE_JSON,
@@ -282,7 +283,8 @@ def send_webhook_request(webhook_config, params, update_user_status_on_error=Fal
         headers = {"Content-Type": ctype}
         data = replace_template(params, webhook_config["payload"])
         data_kw = {"json": data} if ctype == CONTENT_TYPE_JSON else {"data": data}  # json parsing error using 'data'
-        resp = requests.request(webhook_config["method"], webhook_config["url"], headers=headers, **data_kw)
+        with measure_dispatch("webhook"):
+            resp = requests.request(webhook_config["method"], webhook_config["url"], headers=headers, **data_kw)
         resp.raise_for_status()
     except Exception as exception:
         LOGGER.error("An exception has occurred with the webhook request : %s", webhook_config["name"])
@@ -24,8 +24,10 @@ from magpie.api.webhooks import setup_webhooks as setup_webhooks_config
 from magpie.cli.register_defaults import register_defaults
 from magpie.constants import get_constant
 from magpie.db import get_db_session_from_config_ini, run_database_migration_when_ready, set_sqlalchemy_log_level
+from magpie.metrics import setup_metrics
 from magpie.register import magpie_register_permissions_from_config, magpie_register_services_from_config
 from magpie.security import get_auth_config
+from magpie.timing import setup_request_timings
 from magpie.utils import (
     fully_qualified_name,
     get_logger,
@@ -165,6 +167,8 @@ def main(global_config=None, **settings):  # noqa: F811
         tween_name = fully_qualified_name(log_exception_tween)
         config.add_tween(tween_name, under=tween_position)
     config.add_tween(fully_qualified_name(validate_accept_header_tween), under=EXCVIEW, over=MAIN)
+    setup_request_timings(config)
+    setup_metrics(config)
 
     config.include("cornice")
     config.include("cornice_swagger")
@@ -0,0 +1,576 @@
+"""
+In-process caching utilities employed to reduce database requests when resolving protected resources.
+
+The resource tree index keeps, for each :term:`Service`, a compact map of its children :term:`Resource` names
+that allows resolving the requested path of a proxied request without querying the database. Each index is stamped
+with the version of the :term:`Service` tree it was built from, and is lazily rebuilt whenever that version is
+incremented by an operation that modifies the tree (creation, deletion or renaming of a :term:`Resource`).
+
+The :mod:`beaker` backend :data:`CACHE_TYPE_LRU` provides a bounded in-memory storage with least-recently-used
+eviction and expiration of entries, which can be employed by the ``acl`` and ``service`` caching regions.
+
+The anonymous access map precomputes, for every :term:`Resource` of a :term:`Service`, the :term:`Effective Permissions
+<Effective Permission>` of the anonymous user in order to resolve unauthenticated requests without database queries.
+
+Modifications that affect cached results are recorded as :class:`magpie.models.CacheEvent` in the database, which
+other processes poll to invalidate only the affected entries of their own caches.
+"""
+import datetime
+import itertools
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+from beaker.cache import clsmap
+from beaker.container import AbstractDictionaryNSManager
+
+from magpie import models
+from magpie.permissions import Access, PermissionSet, Scope
+from magpie.utils import get_logger
+
+if TYPE_CHECKING:
+    # pylint: disable=W0611,unused-import
+    from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+    from sqlalchemy.orm.session import Session
+
+    from magpie.permissions import Permission
+    from magpie.typedefs import Str
+
+    # resolved access of direct user permission and inherited group permission respectively, by permission name
+    AnonymousPermissions = Dict[Permission, Tuple[Optional[Access], Optional[Access]]]
+
+LOGGER = get_logger(__name__)
+
+CACHE_TYPE_LRU = "magpie:lru"
+CACHE_MAX_ENTRIES = 1000
+CACHE_EVENTS_RETENTION = 86400  # seconds
+
+_RESOURCE_TREE_LOCK = threading.RLock()
+_RESOURCE_TREE_VERSIONS = {}  # type: Dict[int, int]
+_RESOURCE_TREE_INDEXES = {}   # type: Dict[int, ResourceTreeIndex]
+_ANONYMOUS_ACCESS_MAPS = {}   # type: Dict[int, AnonymousAccessMap]
+
+_CACHE_EVENTS_LOCK = threading.Lock()
+_CACHE_EVENTS_STATE = {"last_id": None, "last_poll": 0.0}  # type: Dict[Str, Optional[float]]
+
+
+class ResourceTreeIndex(object):
+    """
+    Mapping of the :term:`Resource` hierarchy under a :term:`Service` for name-based path resolution.
+    """
+    __slots__ = ["service_id", "version", "created", "children", "parents"]
+
+    def __init__(self, service_id, version, nodes):
+        # type: (int, int, Iterable[Tuple[int, Optional[int], Str]]) -> None
+        """
+        Build the index from ``(resource_id, parent_id, resource_name)`` nodes of the service tree.
+        """
+        self.service_id = service_id
+        self.version = version
+        self.created = time.time()
+        self.children = {}  # type: Dict[int, Dict[Str, int]]
+        self.parents = {}   # type: Dict[int, Optional[int]]
+        for res_id, parent_id, res_name in nodes:
+            self.parents[res_id] = parent_id
+            if parent_id is not None:
+                self.children.setdefault(parent_id, {})[res_name.lower()] = res_id
+
+    def find(self, path_parts):
+        # type: (List[Str]) -> Tuple[Optional[int], int]
+        """
+        Obtains the deepest resource matching the successive names of the path parts under the service.
+
+        :returns:
+            Identifier of the deepest matched resource (``None`` if none matched) and the quantity of matched parts.
+        """
+        found_id = None
+        depth = 0
+        parent_id = self.service_id
+        for part in path_parts:
+            child_id = self.children.get(parent_id, {}).get(part.lower())
+            if child_id is None:
+                break
+            found_id = parent_id = child_id
+            depth += 1
+        return found_id, depth
+
+
+def get_resource_tree_version(service_id):
+    # type: (int) -> int
+    """
+    Obtains the current version of the :term:`Resource` tree under the :term:`Service`.
+    """
+    return _RESOURCE_TREE_VERSIONS.get(service_id, 0)
+
+
+def bump_resource_tree_version(service_id):
+    # type: (Optional[int]) -> None
+    """
+    Increments the version of the :term:`Resource` tree under the :term:`Service` to invalidate its index.
+
+    Must be called by any operation that modifies the hierarchy or the names of children resources of the service.
+    """
+    if service_id is None:
+        return
+    with _RESOURCE_TREE_LOCK:
+        _RESOURCE_TREE_VERSIONS[service_id] = _RESOURCE_TREE_VERSIONS.get(service_id, 0) + 1
+
+
+def get_resource_tree_index(service_id, db_session, expire=None):
+    # type: (int, Session, Optional[float]) -> ResourceTreeIndex
+    """
+    Obtains the index of the :term:`Resource` tree under the :term:`Service`, rebuilding it if outdated.
+
+    The index is rebuilt if the service tree version was incremented since its creation, or if it is older than
+    the :paramref:`expire` delay in seconds (if provided) in order to handle modifications applied by other processes.
+    """
+    version = get_resource_tree_version(service_id)
+    index = _RESOURCE_TREE_INDEXES.get(service_id)
+    if index is not None and index.version == version and (not expire or time.time() - index.created < expire):
+        return index
+    with _RESOURCE_TREE_LOCK:
+        index = _RESOURCE_TREE_INDEXES.get(service_id)
+        version = get_resource_tree_version(service_id)
+        if index is not None and index.version == version and (not expire or time.time() - index.created < expire):
+            return index  # rebuilt by another thread while waiting on lock
+        LOGGER.debug("Building resource tree index of service [%s] (version: %s)", service_id, version)
+        res_table = models.Resource.__table__
+        nodes = db_session.query(res_table.c.resource_id, res_table.c.parent_id, res_table.c.resource_name).filter(
+            res_table.c.root_service_id == service_id
+        )
+        index = ResourceTreeIndex(service_id, version, nodes)
+        _RESOURCE_TREE_INDEXES[service_id] = index
+    return index
+
+
+def invalidate_resource_tree_indexes():
+    # type: () -> None
+    """
+    Removes every :term:`Resource` tree index to force their rebuild on next use.
+    """
+    with _RESOURCE_TREE_LOCK:
+        _RESOURCE_TREE_INDEXES.clear()
+
+
+class AnonymousAccessMap(object):
+    """
+    Effective access of the anonymous user to each :term:`Resource` under a :term:`Service`.
+
+    The map is compiled in a single top-down pass over the tree, propagating to children the closest `recursive`
+    permissions applied directly to the anonymous user and to the anonymous group, while `match` permissions are
+    kept for the resource they are applied on. As for :meth:`magpie.services.ServiceInterface.effective_permissions`,
+    the closest direct permission has priority over any group permission, and the closest group permission otherwise
+    applies. Anything left unresolved is denied.
+    """
+    __slots__ = ["service_id", "version", "created", "applicable", "recursive", "matched"]
+
+    def __init__(self, service_id, version, nodes, permissions, applicable=True):
+        # type: (int, int, Iterable[Tuple[int, Optional[int]]], Iterable[Tuple[int, Str, bool]], bool) -> None
+        """
+        Build the map from ``(resource_id, parent_id)`` nodes and ``(resource_id, perm_name, is_direct)`` permissions.
+
+        A map that is not :paramref:`applicable` remembers that normal resolution must be employed for the service.
+        """
+        self.service_id = service_id
+        self.version = version
+        self.created = time.time()
+        self.applicable = applicable
+        self.recursive = {}  # type: Dict[int, AnonymousPermissions]
+        self.matched = {}    # type: Dict[int, AnonymousPermissions]
+
+        applied = {}  # type: Dict[int, List[Tuple[PermissionSet, bool]]]
+        for res_id, perm_name, is_direct in permissions:
+            applied.setdefault(res_id, []).append((PermissionSet(perm_name), is_direct))
+        children = {}  # type: Dict[Optional[int], List[int]]
+        for res_id, parent_id in nodes:
+            children.setdefault(parent_id, []).append(res_id)
+
+        pending = [(service_id, {})]  # type: List[Tuple[int, AnonymousPermissions]]
+        while pending:
+            res_id, inherited = pending.pop()
+            if res_id in applied:
+                inherited = dict(inherited)  # children without permissions share the mapping of their parent
+                matched = {}  # type: AnonymousPermissions
+                for perm, is_direct in applied[res_id]:
+                    target = matched if perm.scope == Scope.MATCH else inherited
+                    access = list(target.get(perm.name, (None, None)))
+                    access[0 if is_direct else 1] = perm.access
+                    target[perm.name] = tuple(access)
+                if matched:
+                    self.matched[res_id] = matched
+            self.recursive[res_id] = inherited
+            pending.extend((child_id, inherited) for child_id in children.get(res_id, []))
+
+    def access(self, resource_id, permission, is_target):
+        # type: (int, Permission, bool) -> Optional[Access]
+        """
+        Obtains the effective access of the anonymous user to the resource.
+
+        :param resource_id: Identifier of the resource.
+        :param permission: Permission to resolve.
+        :param is_target: Whether the resource was explicitly matched, such that `match` permissions apply.
+        :returns: Resolved access, or ``None`` if the resource is not part of the map.
+        """
+        inherited = self.recursive.get(resource_id)
+        if inherited is None:
+            return None
+        direct, group = inherited.get(permission, (None, None))
+        if is_target:
+            match_direct, match_group = self.matched.get(resource_id, {}).get(permission, (None, None))
+            direct = direct if match_direct is None else match_direct
+            group = group if match_group is None else match_group
+        if direct is not None:
+            return direct
+        if group is not None:
+            return group
+        return Access.DENY
+
+
+def get_anonymous_access_map(service_id, db_session, anonymous_user, anonymous_group, expire=None):
+    # type: (int, Session, Str, Str, Optional[float]) -> Optional[AnonymousAccessMap]
+    """
+    Obtains the anonymous access map of the :term:`Service`, rebuilding it if outdated.
+
+    The map is rebuilt if the service tree version was incremented, if it was removed following modified permissions
+    (see :func:`invalidate_anonymous_access_maps`), or if it is older than the :paramref:`expire` delay in seconds.
+
+    :returns:
+        Map of the service, or ``None`` if it cannot be employed because the anonymous user is a member of other
+        groups than the anonymous group. This outcome is retained under the same conditions as a built map.
+    """
+    def is_valid(cached_map, current_version):
+        # type: (Optional[AnonymousAccessMap], int) -> bool
+        return cached_map is not None and cached_map.version == current_version and (
+            not expire or time.time() - cached_map.created < expire)
+
+    version = get_resource_tree_version(service_id)
+    access_map = _ANONYMOUS_ACCESS_MAPS.get(service_id)
+    if is_valid(access_map, version):
+        return access_map if access_map.applicable else None
+    with _RESOURCE_TREE_LOCK:
+        version = get_resource_tree_version(service_id)
+        access_map = _ANONYMOUS_ACCESS_MAPS.get(service_id)
+        if is_valid(access_map, version):
+            return access_map if access_map.applicable else None  # rebuilt by another thread while waiting on lock
+        LOGGER.debug("Building anonymous access map of service [%s] (version: %s)", service_id, version)
+        memberships = db_session.query(models.User.id, models.Group.id, models.Group.group_name).filter(
+            models.User.user_name == anonymous_user
+        ).join(models.UserGroup, models.UserGroup.user_id == models.User.id).join(
+            models.Group, models.Group.id == models.UserGroup.group_id
+        ).all()
+        if not memberships or any(grp_name != anonymous_group for _, _, grp_name in memberships):
+            # remember that the map is not applicable to avoid repeating the lookup on every anonymous request
+            log = LOGGER.warning if access_map is None or access_map.applicable else LOGGER.debug
+            log("Cannot build anonymous access map of service [%s] with anonymous user memberships: %s",
+                service_id, [grp_name for _, _, grp_name in memberships])
+            _ANONYMOUS_ACCESS_MAPS[service_id] = AnonymousAccessMap(service_id, version, [], [], applicable=False)
+            return None
+        user_id, group_id, _ = memberships[0]
+
+        # owned resources are not mapped, such that they and their children fallback to normal resolution
+        res_table = models.Resource.__table__
+        in_service = sa.or_(res_table.c.root_service_id == service_id, res_table.c.resource_id == service_id)
+        nodes = db_session.query(res_table.c.resource_id, res_table.c.parent_id).filter(
+            in_service, res_table.c.owner_user_id.is_(None), res_table.c.owner_group_id.is_(None)
+        )
+        user_perms = db_session.query(
+            models.UserResourcePermission.resource_id, models.UserResourcePermission.perm_name
+        ).join(res_table, res_table.c.resource_id == models.UserResourcePermission.resource_id).filter(
+            in_service, models.UserResourcePermission.user_id == user_id
+        )
+        group_perms = db_session.query(
+            models.GroupResourcePermission.resource_id, models.GroupResourcePermission.perm_name
+        ).join(res_table, res_table.c.resource_id == models.GroupResourcePermission.resource_id).filter(
+            in_service, models.GroupResourcePermission.group_id == group_id
+        )
+        permissions = itertools.chain(
+            ((res_id, perm_name, True) for res_id, perm_name in user_perms),
+            ((res_id, perm_name, False) for res_id, perm_name in group_perms),
+        )
+        access_map = AnonymousAccessMap(service_id, version, nodes, permissions)
+        _ANONYMOUS_ACCESS_MAPS[service_id] = access_map
+    return access_map
+
+
+def invalidate_anonymous_access_maps(service_id=None):
+    # type: (Optional[int]) -> None
+    """
+    Removes the anonymous access map of the :term:`Service`, or of every service if not specified.
+    """
+    with _RESOURCE_TREE_LOCK:
+        if service_id is None:
+            _ANONYMOUS_ACCESS_MAPS.clear()
+        else:
+            _ANONYMOUS_ACCESS_MAPS.pop(service_id, None)
+
+
+def emit_cache_event(db_session, scope, resource=None, user_id=None):
+    # type: (Session, Str, Optional[models.Resource], Optional[int]) -> None
+    """
+    Records a modification that must invalidate cached results of other processes.
+
+    The event is added to the active transaction, such that it is only visible once the modification it describes is
+    committed. Events older than :data:`CACHE_EVENTS_RETENTION` are removed at the same time.
+
+    :param db_session: Database session of the operation applying the modification.
+    :param scope: One of the :class:`models.CacheEvent` scopes.
+    :param resource: Service or resource affected by the modification. Events are limited to its root service.
+    :param user_id: User affected by the modification, if it only applies to a single user.
+    """
+    service_id = service_name = None
+    if resource is not None:
+        service_id = resource.root_service_id or resource.resource_id
+        if service_id == resource.resource_id:
+            service_name = resource.resource_name
+        else:
+            service_name = db_session.query(models.Resource.resource_name).filter(
+                models.Resource.resource_id == service_id
+            ).scalar()
+    db_session.add(models.CacheEvent(scope=scope, service_id=service_id, service_name=service_name, user_id=user_id))
+    if scope != models.CacheEvent.SCOPE_RESOURCE:
+        invalidate_anonymous_access_maps(service_id)
+    outdated = datetime.datetime.utcnow() - datetime.timedelta(seconds=CACHE_EVENTS_RETENTION)
+    db_session.query(models.CacheEvent).filter(models.CacheEvent.created < outdated).delete(synchronize_session=False)
+
+
+def poll_cache_events(db_session, interval):
+    # type: (Session, float) -> List[models.CacheEvent]
+    """
+    Obtains the :class:`models.CacheEvent` recorded since the previous poll of this process.
+
+    Events are retrieved at most once every :paramref:`interval` seconds. Calls within that delay, or while another
+    thread is already polling, return immediately without any database request. The first poll only initializes the
+    reference to the latest event since nothing was cached before it.
+    """
+    if time.time() - _CACHE_EVENTS_STATE["last_poll"] < interval or not _CACHE_EVENTS_LOCK.acquire(False):
+        return []
+    try:
+        _CACHE_EVENTS_STATE["last_poll"] = time.time()
+        last_id = _CACHE_EVENTS_STATE["last_id"]
+        if last_id is None:
+            last_id = db_session.query(sa.func.max(models.CacheEvent.id)).scalar() or 0
+            _CACHE_EVENTS_STATE["last_id"] = last_id
+            return []
+        events = db_session.query(models.CacheEvent).filter(
+            models.CacheEvent.id > last_id
+        ).order_by(models.CacheEvent.id).all()
+        if events:
+            _CACHE_EVENTS_STATE["last_id"] = events[-1].id
+            LOGGER.debug("Retrieved %s cache events since event [%s]", len(events), last_id)
+        return events
+    finally:
+        _CACHE_EVENTS_LOCK.release()
+
+
+class _SingleFlightLock(object):
+    """
+    Creation lock of a cache entry that counts callers waiting for the value computed by another one.
+    """
+    __slots__ = ["_lock", "_store", "__weakref__"]
+
+    def __init__(self, store):
+        # type: (LRUCacheStore) -> None
+        self._lock = threading.RLock()
+        self._store = store
+
+    def acquire(self, wait=True):
+        # type: (bool) -> bool
+        if self._lock.acquire(False):
+            return True
+        if not wait:
+            return False
+        self._store.count("coalesced")
+        return self._lock.acquire()
+
+    def release(self):
+        # type: () -> None
+        self._lock.release()
+
+
+class LRUCacheStore(object):
+    """
+    Thread-safe mapping bounded to a maximum amount of entries with least-recently-used eviction and expiration.
+
+    Statistics of the storage usage are accumulated with the following counters:
+
+    - ``hits``: retrieved values that were still available.
+    - ``misses``: values that had to be computed because they were missing, expired or evicted.
+    - ``evictions``: values removed to respect the maximum amount of entries, or because they expired.
+    - ``coalesced``: callers that waited for the computation of a missing value by another concurrent caller
+      instead of computing it themselves.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES):
+        # type: (int) -> None
+        self.max_entries = max(int(max_entries), 1)
+        self._entries = OrderedDict()  # type: OrderedDict[Hashable, Tuple[Any, Optional[float]]]
+        self._lock = threading.RLock()
+        self._creation_locks = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "coalesced": 0}  # type: Dict[Str, int]
+
+    def count(self, counter):
+        # type: (Str) -> None
+        with self._lock:
+            self._counters[counter] += 1
+
+    def statistics(self):
+        # type: () -> Dict[Str, int]
+        with self._lock:
+            stats = dict(self._counters)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        return stats
+
+    def _get_entry(self, key):
+        # type: (Hashable) -> Tuple[Any, Optional[float]]
+        value, expires = self._entries[key]
+        if expires is not None and time.time() >= expires:
+            del self._entries[key]
+            self._counters["evictions"] += 1
+            raise KeyError(key)
+        return value, expires
+
+    def __getitem__(self, key):
+        # type: (Hashable) -> Any
+        with self._lock:
+            value, _ = self._get_entry(key)
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def __contains__(self, key):
+        # type: (Hashable) -> bool
+        with self._lock:
+            try:
+                self._get_entry(key)
+            except KeyError:
+                return False
+            return True
+
+    def __setitem__(self, key, value):
+        # type: (Hashable, Any) -> None
+        self.set(key, value)
+
+    def __delitem__(self, key):
+        # type: (Hashable) -> None
+        with self._lock:
+            del self._entries[key]
+
+    def __iter__(self):
+        # type: () -> Iterator[Hashable]
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self):
+        # type: () -> int
+        return len(self._entries)
+
+    def set(self, key, value, expire=None):
+        # type: (Hashable, Any, Optional[float]) -> None
+        """
+        Stores the value, evicting the least recently used entries if the maximum amount of entries is exceeded.
+
+        :param key: Key of the entry.
+        :param value: Value to store.
+        :param expire: Delay in seconds after which the entry expires. Never expires if not provided.
+        """
+        expires = time.time() + expire if expire else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            self._counters["misses"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def pop(self, key, default=None):
+        # type: (Hashable, Any) -> Any
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def keys(self):
+        # type: () -> List[Hashable]
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        # type: () -> None
+        with self._lock:
+            self._entries.clear()
+
+    def creation_lock(self, key):
+        # type: (Hashable) -> _SingleFlightLock
+        """
+        Obtains the lock that must be held to compute the value of the entry.
+
+        The same lock is returned to all concurrent callers of a given key such that only a single one computes the
+        missing value, while others wait for it to be stored and reuse it (single-flight).
+        """
+        with self._lock:
+            lock = self._creation_locks.get(key)
+            if lock is None:
+                lock = _SingleFlightLock(self)
+                self._creation_locks[key] = lock
+            return lock
+
+
+class LRUCacheNamespaceManager(AbstractDictionaryNSManager):
+    """
+    :mod:`beaker` namespace manager that stores cached values in a :class:`LRUCacheStore`.
+
+    The backend is registered as :data:`CACHE_TYPE_LRU` and is configured per caching region as follows.
+
+    .. code-block:: ini
+
+        cache.acl.type = magpie:lru
+        cache.acl.max_entries = 1000
+
+    Stores are shared between all managers of a same namespace, which corresponds to a decorated function.
+    """
+    namespaces = {}  # type: Dict[Str, LRUCacheStore]
+    _namespaces_lock = threading.Lock()
+
+    def __init__(self, namespace, max_entries=CACHE_MAX_ENTRIES, **kwargs):  # noqa: W0613
+        # type: (Str, int, Any) -> None
+        AbstractDictionaryNSManager.__init__(self, namespace)
+        with LRUCacheNamespaceManager._namespaces_lock:
+            store = LRUCacheNamespaceManager.namespaces.get(self.namespace)
+            if store is None:
+                store = LRUCacheStore(max_entries)
+                LRUCacheNamespaceManager.namespaces[self.namespace] = store
+        self.dictionary = store
+
+    def get_creation_lock(self, key):
+        # type: (Hashable) -> _SingleFlightLock
+        return self.dictionary.creation_lock(key)
+
+    def set_value(self, key, value, expiretime=None):
+        # type: (Hashable, Any, Optional[float]) -> None
+        self.dictionary.set(key, value, expire=expiretime)
+
+
+def get_cache_statistics():
+    # type: () -> Dict[Str, Dict[Str, int]]
+    """
+    Obtains the usage statistics of every namespace stored with the :data:`CACHE_TYPE_LRU` backend.
+    """
+    with LRUCacheNamespaceManager._namespaces_lock:  # pylint: disable=W0212,protected-access
+        stores = dict(LRUCacheNamespaceManager.namespaces)
+    return {namespace: store.statistics() for namespace, store in stores.items()}
+
+
+def register_cache_backend():
+    # type: () -> None
+    """
+    Registers the :data:`CACHE_TYPE_LRU` backend to make it available for :mod:`beaker` caching regions.
+    """
+    # pylint: disable=W0212,protected-access  # beaker only provides registration by package entry points
+    clsmap._clsmap.setdefault(CACHE_TYPE_LRU, LRUCacheNamespaceManager)
+
+
+register_cache_backend()
@@ -23,6 +23,7 @@ from magpie import constants, db, models
 from magpie.api.management.resource.resource_utils import get_resource_children
 from magpie.cli.sync_services import SYNC_SERVICES_TYPES, SyncServiceDefault, is_valid_resource_schema
 from magpie.cli.utils import make_logging_options, setup_logger_from_options
+from magpie.metrics import enable_metrics, is_multiprocess, measure_sync
 from magpie.utils import get_logger
 
 if TYPE_CHECKING:
@@ -306,14 +307,15 @@ def fetch_single_service(service, session):
     if not service.sync_type:
         LOGGER.info("Skipping service [%s] with no sync type defined.", service.resource_name)
         return
-    LOGGER.info("Requesting remote resources")
-    remote_resources = _get_remote_resources(service)
-    service_id = service.resource_id
-    LOGGER.info("Deleting RemoteResource records for service: %s", service.resource_name)
-    _delete_records(service_id, session)
-    _ensure_sync_info_exists(service.resource_id, session)
-    LOGGER.info("Writing RemoteResource records to database")
-    _update_db(remote_resources, service_id, session)
+    with measure_sync(service.sync_type):
+        LOGGER.info("Requesting remote resources")
+        remote_resources = _get_remote_resources(service)
+        service_id = service.resource_id
+        LOGGER.info("Deleting RemoteResource records for service: %s", service.resource_name)
+        _delete_records(service_id, session)
+        _ensure_sync_info_exists(service.resource_id, session)
+        LOGGER.info("Writing RemoteResource records to database")
+        _update_db(remote_resources, service_id, session)
 
 
 def fetch(settings=None):
@@ -383,6 +385,8 @@ def main(args=None, parser=None, namespace=None):
 
     setup_cron_logger(args.log_level)
     LOGGER.info("Magpie cron started.")
+    if is_multiprocess():
+        enable_metrics()  # durations can only be collected by the application sharing the metrics directory
 
     try:
         db_ready = db.is_database_ready(container=settings)
@@ -105,12 +105,25 @@ MAGPIE_USERS_GROUP = os.getenv("MAGPIE_USERS_GROUP", "users")
 MAGPIE_CRON_LOG = os.getenv("MAGPIE_CRON_LOG", "~/magpie-cron.log")
 MAGPIE_DB_MIGRATION = asbool(os.getenv("MAGPIE_DB_MIGRATION", True))            # run db migration on startup
 MAGPIE_DB_MIGRATION_ATTEMPTS = int(os.getenv("MAGPIE_DB_MIGRATION_ATTEMPTS", 5))
+MAGPIE_RESOURCE_INDEX = asbool(os.getenv("MAGPIE_RESOURCE_INDEX", False))        # in-memory service resource tree
+MAGPIE_RESOURCE_INDEX_EXPIRE = os.getenv("MAGPIE_RESOURCE_INDEX_EXPIRE", None)  # seconds before tree rebuild
+MAGPIE_CACHE_VERSIONING = asbool(os.getenv("MAGPIE_CACHE_VERSIONING", False))    # ACL cache keys with DB version
+MAGPIE_CACHE_EVENTS_INTERVAL = os.getenv("MAGPIE_CACHE_EVENTS_INTERVAL", None)     # seconds between cache events polls
+MAGPIE_ANONYMOUS_ACCESS_MAP = asbool(os.getenv("MAGPIE_ANONYMOUS_ACCESS_MAP", False))  # precomputed anonymous ACL
+MAGPIE_ANONYMOUS_ACCESS_MAP_EXPIRE = os.getenv("MAGPIE_ANONYMOUS_ACCESS_MAP_EXPIRE", None)  # seconds before rebuild
+MAGPIE_OWS_BODY_MAX_SIZE = os.getenv("MAGPIE_OWS_BODY_MAX_SIZE", 1048576)           # bytes of OWS XML body parsed
+MAGPIE_AUTHORIZE_CACHE_MAX_AGE = os.getenv("MAGPIE_AUTHORIZE_CACHE_MAX_AGE", None)  # seconds of allowed decisions
+MAGPIE_REQUEST_TIMINGS = asbool(os.getenv("MAGPIE_REQUEST_TIMINGS", False))      # per-request timings breakdown
+MAGPIE_METRICS = asbool(os.getenv("MAGPIE_METRICS", False))                      # Prometheus metrics endpoint
+MAGPIE_METRICS_PROTECTED = asbool(os.getenv("MAGPIE_METRICS_PROTECTED", False))  # metrics endpoint for admins only
+MAGPIE_PAGE_SIZE_MAX = int(os.getenv("MAGPIE_PAGE_SIZE_MAX", 1000))                # maximum limit of paginated lists
 MAGPIE_LOG_LEVEL = os.getenv("MAGPIE_LOG_LEVEL", _get_default_log_level())      # log level to apply to the loggers
 MAGPIE_LOG_PRINT = asbool(os.getenv("MAGPIE_LOG_PRINT", False))                 # log also forces print to the console
 MAGPIE_LOG_REQUEST = asbool(os.getenv("MAGPIE_LOG_REQUEST", True))              # log detail of every incoming request
 MAGPIE_LOG_EXCEPTION = asbool(os.getenv("MAGPIE_LOG_EXCEPTION", True))          # log detail of generated exceptions
 MAGPIE_UI_ENABLED = asbool(os.getenv("MAGPIE_UI_ENABLED", True))
 MAGPIE_UI_THEME = os.getenv("MAGPIE_UI_THEME", "blue")
+MAGPIE_UI_PAGE_SIZE = int(os.getenv("MAGPIE_UI_PAGE_SIZE", 100))   # items per page of users and groups lists
 PHOENIX_USER = os.getenv("PHOENIX_USER", "phoenix")
 PHOENIX_PASSWORD = os.getenv("PHOENIX_PASSWORD", "qwerty")
 PHOENIX_HOST = os.getenv("PHOENIX_HOST")  # default None to use HOSTNAME
@@ -21,6 +21,7 @@ from zope.sqlalchemy import register
 from zope.sqlalchemy.datamanager import join_transaction
 
 from magpie.constants import get_constant
+from magpie.metrics import get_pool_class
 from magpie.utils import get_logger, get_settings, get_settings_from_config_ini, print_log, raise_log
 
 # import or define all models here to ensure they are attached to the
@@ -92,6 +93,9 @@ def get_engine(container=None, prefix="sqlalchemy.", **kwargs):
     settings.setdefault(prefix + "pool_pre_ping", True)
     kwargs = kwargs or {}
     kwargs["convert_unicode"] = True
+    pool_class = get_pool_class(settings, settings[prefix + "url"])
+    if pool_class is not None:
+        kwargs.setdefault("poolclass", pool_class)
     return engine_from_config(settings, prefix, **kwargs)
 
 
@@ -0,0 +1,282 @@
+"""
+Metrics of the application exported in the `Prometheus` text format for monitoring and capacity planning.
+
+When :envvar:`MAGPIE_METRICS` is enabled, a tween measures the latency of every request, and instrumented operations
+(caching regions, :term:`Effective Resolution`, database connection pool, notifications, resources synchronization)
+record their own observations. All of them are returned by the ``/metrics`` endpoint of `Magpie` and its `Twitcher`
+adapter.
+
+When running multiple workers (e.g.: with `Gunicorn`), the ``PROMETHEUS_MULTIPROC_DIR`` environment variable must
+refer to a directory shared by all processes of the same application, such that the values of every worker are
+aggregated when any of them is queried.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from pyramid.config import ConfigurationError
+from pyramid.security import NO_PERMISSION_REQUIRED
+from pyramid.settings import asbool
+from pyramid.tweens import INGRESS
+from sqlalchemy.pool import QueuePool
+
+from magpie.constants import get_constant
+from magpie.utils import fully_qualified_name, get_logger
+
+if TYPE_CHECKING:
+    # pylint: disable=W0611,unused-import
+    from typing import Any, Callable, Dict, Iterator, Optional, Tuple, Type
+
+    from pyramid.config import Configurator
+    from pyramid.registry import Registry
+    from pyramid.request import Request
+    from pyramid.response import Response
+
+    from magpie.typedefs import AnySettingsContainer, Str
+
+LOGGER = get_logger(__name__)
+
+_METRICS = {"enabled": False}
+_SERVICE_TYPE_KEY = "magpie.metrics.service_type"
+_COLLECTORS = {}  # type: Dict[Str, Any]
+_COLLECTORS_LOCK = threading.Lock()
+
+
+def get_collectors():
+    # type: () -> Dict[Str, Any]
+    """
+    Obtains the collectors of every metric, created on first use.
+
+    The :mod:`prometheus_client` package is imported only at that moment, such that it is not required unless
+    :envvar:`MAGPIE_METRICS` is enabled.
+    """
+    if _COLLECTORS:
+        return _COLLECTORS
+    with _COLLECTORS_LOCK:
+        if _COLLECTORS:
+            return _COLLECTORS
+        from prometheus_client import Counter, Gauge, Histogram  # pylint: disable=C0415
+
+        _COLLECTORS.update({
+            "request_duration": Histogram(
+                "magpie_request_duration_seconds",
+                "Duration of processed requests by matched route and requested service type (adapter only).",
+                ["route", "service_type"],
+            ),
+            "section_duration": Histogram(
+                "magpie_section_duration_seconds",
+                "Duration of request processing sections (e.g.: 'effective' permissions resolution).",
+                ["section"],
+            ),
+            "cache_requests": Counter(
+                "magpie_cache_requests_total",
+                "Retrievals from caching regions, either reusing a cached result ('hit') or computing it ('miss').",
+                ["region", "result"],
+            ),
+            "effective_tree_depth": Histogram(
+                "magpie_effective_tree_depth",
+                "Number of resources in the hierarchy rewound for effective permissions resolution.",
+                buckets=(1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, float("inf")),
+            ),
+            "pool_checkout_wait": Histogram(
+                "magpie_db_pool_checkout_wait_seconds",
+                "Duration waiting for a database connection to be available from the pool.",
+                buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+                         float("inf")),
+            ),
+            "pool_connections_in_use": Gauge(
+                "magpie_db_pool_connections_in_use",
+                "Number of database connections currently checked out from the pool.",
+                multiprocess_mode="livesum",
+            ),
+            "dispatch_duration": Histogram(
+                "magpie_dispatch_duration_seconds",
+                "Duration of notifications dispatched to external systems by kind ('webhook', 'email').",
+                ["kind"],
+            ),
+            "sync_duration": Histogram(
+                "magpie_sync_duration_seconds",
+                "Duration of remote resources synchronization of a service by synchronization type.",
+                ["sync_type"],
+                buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, float("inf")),
+            ),
+        })
+    return _COLLECTORS
+
+
+def is_metrics_enabled():
+    # type: () -> bool
+    return _METRICS["enabled"]
+
+
+def is_multiprocess():
+    # type: () -> bool
+    """
+    Indicates if metrics values are shared with other processes through files (see ``PROMETHEUS_MULTIPROC_DIR``).
+    """
+    return bool(os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir"))
+
+
+def enable_metrics():
+    # type: () -> None
+    """
+    Enables the collection of metrics.
+
+    :raises ImportError: if :mod:`prometheus_client` is not installed.
+    """
+    get_collectors()
+    _METRICS["enabled"] = True
+
+
+def get_metrics():
+    # type: () -> Tuple[bytes, Str]
+    """
+    Generates the metrics of the application, aggregated over all processes if running in multiprocess mode.
+
+    :returns: tuple of metrics contents and the corresponding content-type.
+    """
+    from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+
+    registry = REGISTRY
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def set_request_service_type(request, service_type):
+    # type: (Request, Str) -> None
+    """
+    Defines the type of the service requested to label the latency of the request.
+    """
+    request.environ[_SERVICE_TYPE_KEY] = service_type
+
+
+def observe_section(name, duration):
+    # type: (Str, float) -> None
+    if _METRICS["enabled"]:
+        get_collectors()["section_duration"].labels(section=name).observe(duration)
+
+
+def observe_cache(region, hit):
+    # type: (Str, bool) -> None
+    if _METRICS["enabled"]:
+        get_collectors()["cache_requests"].labels(region=region, result="hit" if hit else "miss").inc()
+
+
+def observe_tree_depth(depth):
+    # type: (int) -> None
+    if _METRICS["enabled"]:
+        get_collectors()["effective_tree_depth"].observe(depth)
+
+
+@contextmanager
+def measure_dispatch(kind):
+    # type: (Str) -> Iterator[None]
+    """
+    Measures the duration of a notification dispatched to an external system, whether it succeeded or not.
+    """
+    if not _METRICS["enabled"]:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_collectors()["dispatch_duration"].labels(kind=kind).observe(time.perf_counter() - start)
+
+
+@contextmanager
+def measure_sync(sync_type):
+    # type: (Str) -> Iterator[None]
+    """
+    Measures the duration of the remote resources synchronization of a service.
+    """
+    if not _METRICS["enabled"]:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        get_collectors()["sync_duration"].labels(sync_type=sync_type).observe(time.perf_counter() - start)
+
+
+class MeasuredQueuePool(QueuePool):
+    """
+    Connection pool that measures the waiting time of connection checkout and the number of connections in use.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super(MeasuredQueuePool, self)._do_get()
+        finally:
+            get_collectors()["pool_checkout_wait"].observe(time.perf_counter() - start)
+        get_collectors()["pool_connections_in_use"].inc()
+        return conn
+
+    def _do_return_conn(self, conn):  # pylint: disable=W0237  # parameter name differs between versions
+        get_collectors()["pool_connections_in_use"].dec()
+        super(MeasuredQueuePool, self)._do_return_conn(conn)
+
+
+def get_pool_class(settings, url):
+    # type: (AnySettingsContainer, Str) -> Optional[Type[QueuePool]]
+    """
+    Obtains the connection pool that should be employed by the database engine according to :envvar:`MAGPIE_METRICS`.
+
+    Only the pool employed by default for `PostgreSQL` connections is measured.
+    """
+    enabled = get_constant("MAGPIE_METRICS", settings, default_value=False, raise_missing=False, raise_not_set=False)
+    if asbool(enabled) and url.startswith("postgresql"):
+        return MeasuredQueuePool
+    return None
+
+
+def get_metrics_permission(container):
+    # type: (AnySettingsContainer) -> Str
+    """
+    Obtains the permission required to access the ``/metrics`` endpoint according to :envvar:`MAGPIE_METRICS_PROTECTED`.
+    """
+    protected = get_constant("MAGPIE_METRICS_PROTECTED", container, default_value=False,
+                             raise_missing=False, raise_not_set=False)
+    if asbool(protected):
+        return get_constant("MAGPIE_ADMIN_PERMISSION", container)
+    return NO_PERMISSION_REQUIRED
+
+
+def request_metrics_tween(handler, registry):  # noqa: W0613
+    # type: (Callable[[Request], Response], Registry) -> Callable[[Request], Response]
+    """
+    Tween that measures the latency of every request by matched route and requested service type.
+    """
+    def measure(request):
+        # type: (Request) -> Response
+        start = time.perf_counter()
+        try:
+            return handler(request)
+        finally:
+            route = request.matched_route.name if getattr(request, "matched_route", None) else ""
+            service_type = request.environ.get(_SERVICE_TYPE_KEY, "")
+            duration = time.perf_counter() - start
+            get_collectors()["request_duration"].labels(route=route, service_type=service_type).observe(duration)
+    return measure
+
+
+def setup_metrics(config):
+    # type: (Configurator) -> None
+    """
+    Enables the metrics of the application if requested by :envvar:`MAGPIE_METRICS`.
+    """
+    enabled = get_constant("MAGPIE_METRICS", config, default_value=False, raise_missing=False, raise_not_set=False)
+    if not asbool(enabled):
+        return
+    LOGGER.info("Enabling metrics (multiprocess: %s).", is_multiprocess())
+    try:
+        enable_metrics()
+    except ImportError as exc:
+        raise ConfigurationError("Package 'prometheus_client' is required by 'MAGPIE_METRICS' ({!r}).".format(exc))
+    config.add_tween(fully_qualified_name(request_metrics_tween), under=INGRESS)
@@ -1,6 +1,8 @@
 import datetime
+import itertools
 import math
 import uuid
+from collections import namedtuple
 from typing import TYPE_CHECKING
 
 import sqlalchemy as sa
@@ -9,7 +11,7 @@ from pyramid.security import ALL_PERMISSIONS, Allow, Authenticated, Everyone
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base, declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Session, relationship
 from sqlalchemy.sql import func
 from ziggurat_foundations import ziggurat_model_init
 from ziggurat_foundations.models.base import BaseModel, get_db_session
@@ -20,6 +22,7 @@ from ziggurat_foundations.models.group_resource_permission import GroupResourceP
 from ziggurat_foundations.models.resource import ResourceMixin
 from ziggurat_foundations.models.services import BaseService
 from ziggurat_foundations.models.services.group import GroupService
+from ziggurat_foundations.models.services.resource import ResourceService
 from ziggurat_foundations.models.services.resource_tree import ResourceTreeService
 from ziggurat_foundations.models.services.resource_tree_postgres import ResourceTreeServicePostgreSQL
 from ziggurat_foundations.models.services.user import UserService
@@ -27,7 +30,7 @@ from ziggurat_foundations.models.user import UserMixin
 from ziggurat_foundations.models.user_group import UserGroupMixin
 from ziggurat_foundations.models.user_permission import UserPermissionMixin
 from ziggurat_foundations.models.user_resource_permission import UserResourcePermissionMixin
-from ziggurat_foundations.permissions import permission_to_pyramid_acls
+from ziggurat_foundations.permissions import PermissionTuple, permission_to_pyramid_acls
 
 from magpie.api import exception as ax
 from magpie.constants import get_constant
@@ -36,11 +39,10 @@ from magpie.utils import ExtendedEnum, FlexibleNameEnum, decompose_enum_flags, g
 
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import Any, Dict, Iterable, List, Optional, Set, Type, Union
+    from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
 
     from pyramid.request import Request
     from sqlalchemy.orm.query import Query
-    from sqlalchemy.orm.session import Session
 
     from magpie.typedefs import JSON, AccessControlListType, AnySettingsContainer, GroupPriority, Str, TypeAlias
 
@@ -50,6 +52,8 @@ if TYPE_CHECKING:
     _UserGroupStatus = "UserGroupStatus"    # type: TypeAlias   # pylint: disable=C0103
     AnyUser = Union[_UserType, _UserPendingType]
     AnyUserStatus = Union[_UserGroupStatus, int, Str]
+    ResourceHierarchy = List[Tuple["Resource", List[PermissionTuple]]]
+    ResourcesPermissions = Dict[int, Tuple["Resource", List[PermissionTuple]]]
 
 # backward compat enums
 try:
@@ -170,6 +174,10 @@ class Resource(ResourceMixin, Base):
         return "<Resource: name={} type={} id={}>".format(self.resource_name, self.resource_type, self.resource_id)
 
 
+# case-insensitive lookup of a child resource by name under its parent, as performed when resolving request paths
+sa.Index("ix_resources_parent_id_lower_resource_name", Resource.parent_id, sa.func.lower(Resource.resource_name))
+
+
 class UserPermission(UserPermissionMixin, Base):
     pass
 
@@ -178,6 +186,15 @@ class UserResourcePermission(UserResourcePermissionMixin, Base):
     pass
 
 
+# Primary keys of the permission and membership tables start with the user or group identifier. Following indexes allow
+# lookups starting from the resource (permissions) or from the user (memberships), and cover their remaining columns.
+sa.Index("ix_users_groups_user_id_group_id", UserGroup.user_id, UserGroup.group_id)
+sa.Index("ix_users_resources_permissions_resource_id_user_id", UserResourcePermission.resource_id,
+         UserResourcePermission.user_id, UserResourcePermission.perm_name)
+sa.Index("ix_groups_resources_permissions_resource_id_group_id", GroupResourcePermission.resource_id,
+         GroupResourcePermission.group_id, GroupResourcePermission.perm_name)
+
+
 class User(UserMixin, Base):
     def __str__(self):
         return "<User: name={} id={}>".format(self.user_name, self.id)
@@ -468,6 +485,50 @@ class UserSearchService(UserService):
         users += list(query)
         return users
 
+    @classmethod
+    def by_status_page(cls, status=None, after=None, limit=None, db_session=None):
+        # type: (Optional[UserStatuses], Optional[Str], Optional[int], Optional[Session]) -> List[AnyUser]
+        """
+        Search users as with :meth:`by_status`, ordered by name, for a page of users following the specified name.
+
+        Ordering and filtering are accomplished by the database. When both :class:`User` and :class:`UserPending` are
+        requested, the distinct names of the page are first resolved from both tables at once such that the ordering
+        remains consistent with the comparison of names employed to obtain the following page. As for
+        :meth:`by_user_name`, the :class:`User` is returned if a name is found in both tables.
+
+        :param status: statuses of the users to search.
+        :param after: name of the last user of the previous page, or ``None`` for the first page.
+        :param limit: maximum number of users returned, or ``None`` for all users following the previous page.
+        :param db_session: database connection.
+        :returns: users of the page ordered by name.
+        """
+        db_session = get_db_session(db_session)
+        if status is None or status is UserStatuses.Pending or UserStatuses.Pending not in status:
+            model = UserPending if status is UserStatuses.Pending else cls.model
+            query = db_session.query(model)
+            if status is not None and model is cls.model:
+                query = query.filter(cls.model.status.in_([int(status_flag) for status_flag in status]))
+            if after is not None:
+                query = query.filter(model.user_name > after)
+            return list(query.order_by(model.user_name).limit(limit))
+
+        statuses = [int(status_flag) for status_flag in UserStatuses(status - UserStatuses.Pending)]
+        # distinct names, otherwise a name found in both tables would be repeated or skipped at page boundaries
+        names = sa.union(
+            sa.select([cls.model.user_name.label("user_name")]).where(cls.model.status.in_(statuses)),
+            sa.select([UserPending.user_name.label("user_name")]),
+        ).subquery()
+        query = sa.select([names.c.user_name])
+        if after is not None:
+            query = query.where(names.c.user_name > after)
+        page = [row[0] for row in db_session.execute(query.order_by(names.c.user_name).limit(limit))]
+        if not page:
+            return []
+        found = {user.user_name: user for user in db_session.query(UserPending).filter(UserPending.user_name.in_(page))}
+        found.update({user.user_name: user for user in db_session.query(cls.model).filter(
+            cls.model.user_name.in_(page), cls.model.status.in_(statuses))})
+        return [found[name] for name in page]
+
     @classmethod
     def by_user_name(cls, user_name, status=None, db_session=None):  # pylint: disable=W0237,W0221
         # type: (Str, Optional[UserStatuses], Optional[Session]) -> Optional[AnyUser]
@@ -623,6 +684,25 @@ class UserFactory(RootFactory):
         return acl
 
 
+class LoggedUserFactory(RootFactory):
+    @property
+    def __acl__(self):
+        # type: () -> AccessControlListType
+        """
+        Grant :py:data:`magpie.constants.MAGPIE_LOGGED_PERMISSION` to any authenticated :term:`Request User`.
+
+        Employed by routes without :term:`Context User` in their path, where the view itself verifies that details of
+        other users than the :term:`Request User` are only obtained with administrator access.
+
+        All ACL permissions from :class:`RootFactory` are applied on top of the permission added here.
+        """
+        user = self.request.user
+        acl = super(LoggedUserFactory, self).__acl__
+        if user:
+            acl += [(Allow, user.id, get_constant("MAGPIE_LOGGED_PERMISSION"))]
+        return acl
+
+
 class Service(Resource):
     """
     Resource of `service` type.
@@ -880,6 +960,99 @@ class RemoteResourceTreeServicePostgresSQL(ResourceTreeServicePostgreSQL):
         return root_elem
 
 
+ResourceTreeNode = namedtuple("ResourceTreeNode", ["Resource", "depth", "sorting", "path"])
+
+
+class ResourceTreeServiceClosure(ResourceTreeServicePostgreSQL):
+    """
+    Resource tree utilities that retrieve ancestors and subtrees with single queries using :class:`ResourceClosure`.
+
+    Other operations (e.g.: ordering, moves) are inherited. Changes they apply to the tree are reflected in
+    :class:`ResourceClosure` by the listeners of the :class:`Resource` model.
+    """
+
+    @classmethod
+    def path_upper(cls, object_id, limit_depth=1000000, db_session=None, *args, **kwargs):
+        """
+        Obtains the resource and all its parents ordered from the resource itself up to the root service.
+        """
+        db_session = get_db_session(db_session)
+        closure = ResourceClosure.__table__
+        query = (
+            db_session.query(cls.model)
+            .join(closure, closure.c.ancestor_id == cls.model.resource_id)
+            .filter(closure.c.descendant_id == object_id, closure.c.depth < limit_depth)
+            .order_by(closure.c.depth)
+        )
+        return query
+
+    @classmethod
+    def from_resource_deeper(cls, resource_id=None, limit_depth=1000000, db_session=None, *args, **kwargs):
+        """
+        Obtains the resource and all its children as ordered :class:`ResourceTreeNode` (depth ``1`` for itself).
+        """
+        return cls._get_subtree(resource_id, limit_depth, True, db_session)
+
+    @classmethod
+    def from_parent_deeper(cls, parent_id=None, limit_depth=1000000, db_session=None, *args, **kwargs):
+        """
+        Obtains all children of the parent as ordered :class:`ResourceTreeNode` (depth ``1`` for direct children).
+        """
+        if parent_id is None:  # top-level resources are not related to any common ancestor
+            return super(ResourceTreeServiceClosure, cls).from_parent_deeper(
+                parent_id=parent_id, limit_depth=limit_depth, db_session=db_session, *args, **kwargs
+            )
+        return cls._get_subtree(parent_id, limit_depth, False, db_session)
+
+    @classmethod
+    def _get_subtree(cls, resource_id, limit_depth, include_self, db_session):
+        # type: (int, int, bool, Session) -> List[ResourceTreeNode]
+        """
+        Retrieves the subtree of the resource and generates the same nodes as the recursive queries of `ziggurat`.
+
+        Node ``path`` (identifiers) and ``sorting`` (positions) are composed from the parent of each node, which is
+        always processed beforehand since the descendants are ordered by depth.
+        """
+        db_session = get_db_session(db_session)
+        closure = ResourceClosure.__table__
+        offset = 1 if include_self else 0
+        query = (
+            db_session.query(cls.model, closure.c.depth)
+            .join(closure, closure.c.descendant_id == cls.model.resource_id)
+            .filter(closure.c.ancestor_id == resource_id)
+            .filter(closure.c.depth >= 1 - offset, closure.c.depth + offset <= limit_depth)
+            .order_by(closure.c.depth)
+        )
+        nodes = {}  # type: Dict[int, ResourceTreeNode]
+        for resource, depth in query:
+            path = str(resource.resource_id)
+            sorting = "{:07d}".format(resource.ordering or 0)
+            parent = nodes.get(resource.parent_id)
+            if parent is not None:
+                path = "{}/{}".format(parent.path, path)
+                sorting = "{}/{}".format(parent.sorting, sorting)
+            nodes[resource.resource_id] = ResourceTreeNode(resource, depth + offset, sorting, path)
+        return sorted(nodes.values(), key=lambda node: node.sorting)
+
+    @classmethod
+    def delete_branch(cls, resource_id=None, db_session=None, *args, **kwargs):
+        """
+        Deletes the resource and all its children.
+        """
+        db_session = get_db_session(db_session)
+        resource = ResourceService.lock_resource_for_update(resource_id=resource_id, db_session=db_session)
+        parent_id = resource.parent_id
+        ordering = resource.ordering
+        closure = ResourceClosure.__table__
+        subtree = sa.select([closure.c.descendant_id]).where(closure.c.ancestor_id == resource_id)
+        subtree_ids = [row.descendant_id for row in db_session.execute(subtree)]
+        table = cls.model.__table__
+        db_session.execute(table.delete().where(table.c.resource_id.in_(subtree_ids)))
+        db_session.execute(closure.delete().where(closure.c.descendant_id.in_(subtree_ids)))
+        cls.shift_ordering_down(parent_id, ordering, db_session=db_session)
+        return True
+
+
 class TokenOperation(ExtendedEnum):
     """
     Supported operations by the temporary tokens.
@@ -996,11 +1169,206 @@ class TemporaryToken(BaseModel, Base):
         return {"token": str(self.token), "operation": str(self.operation.value)}
 
 
+class CacheVersion(BaseModel, Base):
+    """
+    Model that defines global counters incremented whenever definitions that affect cached results are modified.
+
+    Because the counters are stored in the database, they are shared between every worker and application (`Magpie`
+    and `Twitcher`) that employ caching, allowing them to detect outdated entries without waiting for their expiry.
+    """
+    __tablename__ = "cache_versions"
+
+    PERMISSIONS = "permissions"
+    """
+    Counter incremented on any modification of permissions, group memberships or resources.
+    """
+
+    name = sa.Column(sa.Unicode(32), primary_key=True)
+    version = sa.Column(sa.BigInteger(), nullable=False, default=0)
+
+    @staticmethod
+    def get(name, db_session):
+        # type: (Str, Session) -> int
+        """
+        Obtains the current version of the named counter.
+        """
+        version = db_session.query(CacheVersion.version).filter(CacheVersion.name == name).scalar()
+        return version or 0
+
+    @staticmethod
+    def bump(name, db_session):
+        # type: (Str, Session) -> None
+        """
+        Increments the version of the named counter within the active transaction.
+        """
+        table = CacheVersion.__table__
+        conn = db_session.connection()
+        updated = conn.execute(
+            table.update().where(table.c.name == name).values(version=table.c.version + 1)
+        )
+        if not updated.rowcount:
+            conn.execute(table.insert().values(name=name, version=1))
+
+
+class CacheEvent(BaseModel, Base):
+    """
+    Model that defines a change-log of modifications that must invalidate cached results of other applications.
+
+    Events are appended within the same transaction as the modification they describe. Applications that cache
+    results (e.g.: `Twitcher` with the :class:`magpie.adapter.MagpieAdapter`) poll new events to remove only the
+    affected entries, instead of waiting for their expiry or discarding everything.
+    """
+    __tablename__ = "cache_events"
+
+    SCOPE_USER = "user"
+    """
+    Permissions of the user were modified, optionally limited to a single service.
+    """
+    SCOPE_GROUP = "group"
+    """
+    Permissions of a group were modified for a single service, potentially affecting any of its member users.
+    """
+    SCOPE_RESOURCE = "resource"
+    """
+    Resources of the service were created, renamed or deleted, modifying its tree.
+    """
+
+    id = sa.Column(sa.Integer, primary_key=True, autoincrement=True)
+    created = sa.Column(sa.DateTime, default=datetime.datetime.utcnow, nullable=False, index=True)
+    scope = sa.Column(sa.Unicode(16), nullable=False)
+    service_id = sa.Column(sa.Integer, nullable=True)
+    service_name = sa.Column(sa.Unicode(100), nullable=True)
+    user_id = sa.Column(sa.Integer, nullable=True)
+
+
+class ResourceClosure(BaseModel, Base):
+    """
+    Model that defines the relationships between every resource and each of its ancestors (closure table).
+
+    Each resource is related to itself with depth ``0``, to its parent with depth ``1``, and so on up to the root
+    service. All parents or the whole subtree of a resource can therefore be retrieved with a single indexed query,
+    instead of recursive queries over ``parent_id``. Rows are maintained by the listeners of the :class:`Resource`
+    model whenever resources are created, moved under another parent or deleted.
+    """
+    __tablename__ = "resources_closure"
+    __table_args__ = (
+        sa.Index("ix_resources_closure_descendant_id_depth", "descendant_id", "depth"),
+    )
+
+    ancestor_id = sa.Column(sa.Integer(),
+                            sa.ForeignKey("resources.resource_id", onupdate="CASCADE", ondelete="CASCADE"),
+                            primary_key=True)
+    descendant_id = sa.Column(sa.Integer(),
+                              sa.ForeignKey("resources.resource_id", onupdate="CASCADE", ondelete="CASCADE"),
+                              primary_key=True)
+    depth = sa.Column(sa.Integer(), nullable=False)
+
+
+@sa.event.listens_for(Resource, "after_insert", propagate=True)
+def insert_resource_closure(mapper, connection, target):  # noqa: W0613
+    # type: (Any, sa.engine.Connection, Resource) -> None
+    """
+    Relates the created resource to itself and to every ancestor of its parent.
+    """
+    closure = ResourceClosure.__table__
+    connection.execute(closure.insert().values(ancestor_id=target.resource_id,
+                                               descendant_id=target.resource_id, depth=0))
+    if target.parent_id is not None:
+        connection.execute(closure.insert().from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            sa.select([
+                closure.c.ancestor_id,
+                sa.literal(target.resource_id, sa.Integer),
+                closure.c.depth + 1,
+            ]).where(closure.c.descendant_id == target.parent_id)
+        ))
+
+
+@sa.event.listens_for(Resource, "after_update", propagate=True)
+def move_resource_closure(mapper, connection, target):  # noqa: W0613
+    # type: (Any, sa.engine.Connection, Resource) -> None
+    """
+    Relates the subtree of a resource moved under another parent to the ancestors of its new location.
+
+    Relationships within the subtree itself are preserved, while those with the ancestors of the previous location
+    are replaced.
+    """
+    if not sa.inspect(target).attrs.parent_id.history.has_changes():
+        return
+    closure = ResourceClosure.__table__
+    subtree = closure.alias("subtree")
+    subtree_ids = sa.select([subtree.c.descendant_id]).where(subtree.c.ancestor_id == target.resource_id)
+    connection.execute(closure.delete().where(sa.and_(
+        closure.c.descendant_id.in_(subtree_ids),
+        closure.c.ancestor_id.notin_(subtree_ids),
+    )))
+    if target.parent_id is not None:
+        parents = closure.alias("parents")
+        connection.execute(closure.insert().from_select(
+            ["ancestor_id", "descendant_id", "depth"],
+            sa.select([
+                parents.c.ancestor_id,
+                subtree.c.descendant_id,
+                parents.c.depth + subtree.c.depth + 1,
+            ]).select_from(
+                parents.join(subtree, subtree.c.ancestor_id == target.resource_id)
+            ).where(parents.c.descendant_id == target.parent_id)
+        ))
+
+
+@sa.event.listens_for(Resource, "after_delete", propagate=True)
+def delete_resource_closure(mapper, connection, target):  # noqa: W0613
+    # type: (Any, sa.engine.Connection, Resource) -> None
+    """
+    Removes the relationships of the deleted resource in case foreign key cascades are not enforced by the database.
+    """
+    closure = ResourceClosure.__table__
+    connection.execute(closure.delete().where(sa.or_(
+        closure.c.ancestor_id == target.resource_id,
+        closure.c.descendant_id == target.resource_id,
+    )))
+
+
+CACHE_VERSIONED_MODELS = (UserResourcePermission, GroupResourcePermission, UserGroup, Resource, User, Group,
+                          CacheEvent)
+CACHE_VERSIONED_UPDATES = (UserResourcePermission, GroupResourcePermission, UserGroup, Resource)
+
+
+def bump_cache_versions(session, flush_context):  # noqa: W0613
+    # type: (Session, Any) -> None
+    """
+    Increments the :class:`CacheVersion` counters when any definition that affects their cached results is modified.
+
+    Updates of users and groups (e.g.: login date, description) are ignored since they do not affect permissions.
+    Objects only merged or reattached to the session without any change are also ignored.
+
+    .. seealso::
+        :func:`register_cache_versioning`
+    """
+    updated = (obj for obj in session.dirty
+               if isinstance(obj, CACHE_VERSIONED_UPDATES) and session.is_modified(obj, include_collections=False))
+    modified = itertools.chain(session.new, session.deleted, updated)
+    if any(isinstance(obj, CACHE_VERSIONED_MODELS) for obj in modified):
+        CacheVersion.bump(CacheVersion.PERMISSIONS, session)
+
+
+def register_cache_versioning():
+    # type: () -> None
+    """
+    Registers :func:`bump_cache_versions` with every database session, only once per process.
+
+    Should only be called when :envvar:`MAGPIE_CACHE_VERSIONING` is enabled, such that no counter is updated on each
+    modification when they are not employed by caching keys.
+    """
+    if not sa.event.contains(Session, "after_flush", bump_cache_versions):
+        sa.event.listen(Session, "after_flush", bump_cache_versions)
+
+
 ziggurat_model_init(User, Group, UserGroup, GroupPermission, UserPermission,
                     UserResourcePermission, GroupResourcePermission, Resource,
                     ExternalIdentity, passwordmanager=None)
 
-RESOURCE_TREE_SERVICE = ResourceTreeService(ResourceTreeServicePostgreSQL)
+RESOURCE_TREE_SERVICE = ResourceTreeService(ResourceTreeServiceClosure)
 REMOTE_RESOURCE_TREE_SERVICE = RemoteResourceTreeService(RemoteResourceTreeServicePostgresSQL)
 
 RESOURCE_TYPES = frozenset([Service, Directory, File, Layer, Workspace, Route, Process])
@@ -1024,7 +1392,275 @@ def resource_factory(**kwargs):
 
 def find_children_by_name(child_name, parent_id, db_session):
     # type: (Str, Optional[int], Session) -> Optional[Resource]
-    tree_struct = RESOURCE_TREE_SERVICE.from_parent_deeper(parent_id=parent_id, limit_depth=1, db_session=db_session)
-    tree_level_filtered = [node.Resource for node in list(tree_struct) if
-                           node.Resource.resource_name.lower() == child_name.lower()]
-    return tree_level_filtered.pop() if len(tree_level_filtered) else None
+    """
+    Obtains the immediate child resource of the parent matching the name, with case-insensitive comparison.
+
+    The lookup is done directly on ``(parent_id, lower(resource_name))`` in order to take advantage of the
+    corresponding functional index instead of loading every child resource under the parent.
+    """
+    parent_filter = Resource.parent_id.is_(None) if parent_id is None else Resource.parent_id == parent_id
+    query = db_session.query(Resource).filter(parent_filter)
+    query = query.filter(sa.func.lower(Resource.resource_name) == child_name.lower())
+    return query.first()
+
+
+def find_resource_by_path(path_parts, parent_id, db_session):
+    # type: (List[Str], int, Session) -> Tuple[Optional[Resource], int]
+    """
+    Obtains the deepest resource under the parent that matches the successive names of the path parts.
+
+    Instead of looking up each child by name one level at a time (see :func:`find_children_by_name`), the complete
+    path is resolved with a single recursive query where each iteration matches the child name (case-insensitive)
+    expected at the corresponding depth.
+
+    :param path_parts: Successive child resource names to match starting from the immediate children of the parent.
+    :param parent_id: Identifier of the resource (typically the service) from which to start resolving the path.
+    :param db_session: Database connection to retrieve resources.
+    :returns: Deepest matched resource (``None`` if not even the first part matched) and the quantity of matched parts.
+    """
+    if not path_parts:
+        return None, 0
+    res_table = Resource.__table__
+    names = [part.lower() for part in path_parts]
+    path = sa.select([
+        res_table.c.resource_id,
+        sa.literal(1).label("depth"),
+    ]).where(sa.and_(
+        res_table.c.parent_id == parent_id,
+        sa.func.lower(res_table.c.resource_name) == names[0],
+    )).cte("path", recursive=True)
+    if len(names) > 1:
+        children = res_table.alias("children")
+        level_name = sa.case([(path.c.depth == depth, name) for depth, name in enumerate(names[1:], start=1)])
+        path = path.union_all(
+            sa.select([
+                children.c.resource_id,
+                (path.c.depth + 1).label("depth"),
+            ]).where(sa.and_(
+                children.c.parent_id == path.c.resource_id,
+                sa.func.lower(children.c.resource_name) == level_name,
+                path.c.depth < len(names),
+            ))
+        )
+    query = (
+        db_session.query(Resource, path.c.depth)
+        .join(path, Resource.resource_id == path.c.resource_id)
+        .order_by(path.c.depth.desc())
+    )
+    found = query.first()
+    if not found:
+        return None, 0
+    return found.Resource, found.depth
+
+
+def find_services_resources(service_ids, db_session):
+    # type: (Iterable[int], Session) -> Query
+    """
+    Obtains all children resources of the services with a single query ordered for depth-first traversal of the trees.
+
+    Resources are grouped by their root service, ordered by service type and name, and each resource is immediately
+    followed by its complete subtree, with siblings ordered by their position. The trees can therefore be consumed
+    incrementally while only keeping track of the parents of the current resource.
+
+    The order is obtained with a recursive query composing the sorting key of each resource from the one of its parent,
+    using fixed-width segments of its position and identifier such that a parent always precedes its children.
+
+    :param service_ids: Identifiers of the services for which to retrieve children resources.
+    :param db_session: Database connection to retrieve resources.
+    :returns: Query of rows with the details of each resource and its ``depth`` (``1`` for direct children of services).
+    """
+    res_table = Resource.__table__
+
+    def sorting(table):
+        # fixed-width digits (up to 10^9 positions and identifiers) to compare keys as strings
+        return sa.cast(table.c.ordering + 1000000000, sa.Text) + sa.cast(table.c.resource_id + 1000000000, sa.Text)
+
+    tree = sa.select([
+        res_table.c.resource_id,
+        sa.literal(1).label("depth"),
+        sorting(res_table).label("sorting"),
+    ]).where(res_table.c.parent_id.in_(list(service_ids))).cte("tree", recursive=True)
+    children = res_table.alias("children")
+    tree = tree.union_all(
+        sa.select([
+            children.c.resource_id,
+            (tree.c.depth + 1).label("depth"),
+            (tree.c.sorting + sorting(children)).label("sorting"),
+        ]).where(children.c.parent_id == tree.c.resource_id)
+    )
+    services = Service.__table__
+    roots = res_table.alias("roots")
+    query = (
+        db_session.query(
+            Resource.resource_id,
+            Resource.resource_name,
+            Resource.resource_display_name,
+            Resource.resource_type,
+            Resource.parent_id,
+            Resource.root_service_id,
+            tree.c.depth,
+        )
+        .join(tree, Resource.resource_id == tree.c.resource_id)
+        .join(services, services.c.resource_id == Resource.root_service_id)
+        .join(roots, roots.c.resource_id == Resource.root_service_id)
+        .order_by(services.c.type, roots.c.resource_name, tree.c.sorting)
+    )
+    return query
+
+
+def find_children_by_names(children, db_session):
+    # type: (Dict[int, Iterable[Str]], Session) -> Dict[Tuple[int, Str], Resource]
+    """
+    Obtains the immediate children resources of multiple parents matching any of their names, with a single query.
+
+    Equivalent to calling :func:`find_children_by_name` for every combination of parent and name, while employing the
+    same functional index on ``(parent_id, lower(resource_name))``.
+
+    :param children: Names of children resources to find (case-insensitive) mapped by the identifier of their parent.
+    :param db_session: Database connection to retrieve resources.
+    :returns: Found resources mapped by their parent identifier and lowercase name.
+    """
+    filters = [
+        sa.and_(Resource.parent_id == parent_id, sa.func.lower(Resource.resource_name).in_(list(names)))
+        for parent_id, names in children.items() if names
+    ]
+    if not filters:
+        return {}
+    query = db_session.query(Resource).filter(sa.or_(*filters))
+    found = {}  # type: Dict[Tuple[int, Str], Resource]
+    for resource in query:
+        found.setdefault((resource.parent_id, resource.resource_name.lower()), resource)
+    return found
+
+
+def find_resource_hierarchy_permissions(resource_id, user, db_session, groups=None):
+    # type: (int, User, Session, Optional[Dict[int, Group]]) -> ResourceHierarchy
+    """
+    Obtains the resource and all its parents up to the root service, with permissions applied on them for the user.
+
+    The complete ancestor chain is retrieved with a single query on :class:`ResourceClosure` that is joined to the
+    :term:`Direct Permission` of the :term:`User` and the :term:`Inherited Permission` of its :term:`Group`
+    memberships. Permission tuples are generated in the same manner as :meth:`ResourceService.perms_for_user`
+    (including ownership of the resources) to allow their resolution in memory without further database requests.
+
+    :param resource_id: Identifier of the resource from which to start rewinding the hierarchy.
+    :param user: User for which to retrieve applied permissions, both directly and through its groups.
+    :param db_session: Database connection to retrieve resources and permissions.
+    :param groups: Groups of the user mapped by identifier, if already loaded. Otherwise, ``user.groups`` is loaded.
+    :returns: Resources ordered from the specified one up to the root service, each with applicable permissions.
+    """
+    hierarchies = find_resources_hierarchy_permissions([resource_id], user, db_session, groups=groups)
+    return hierarchies.get(resource_id, [])
+
+
+def _find_resources_permissions(resources, user, db_session, groups=None):
+    # type: (sa.sql.Selectable, User, Session, Optional[Dict[int, Group]]) -> ResourcesPermissions
+    """
+    Loads the resources selected by identifier with the permissions applied on them for the user and its groups.
+
+    Permissions of owned resources are completed with :data:`ALL_PERMISSIONS` of the owning user or group.
+    Resources without any permission are also returned with an empty list.
+    """
+    if groups is None:
+        groups = {group.id: group for group in user.groups}
+    user_perms = sa.select([
+        UserResourcePermission.resource_id,
+        UserResourcePermission.perm_name,
+        sa.literal("user").label("type"),
+        UserResourcePermission.user_id.label("owner_id"),
+    ]).where(UserResourcePermission.user_id == user.id)
+    group_perms = sa.select([
+        GroupResourcePermission.resource_id,
+        GroupResourcePermission.perm_name,
+        sa.literal("group").label("type"),
+        GroupResourcePermission.group_id.label("owner_id"),
+    ]).where(GroupResourcePermission.group_id.in_(list(groups)))
+    perms = sa.union_all(user_perms, group_perms).alias("perms")
+
+    query = (
+        db_session.query(Resource, perms.c.perm_name, perms.c.type, perms.c.owner_id)
+        .join(resources, Resource.resource_id == resources.c.resource_id)
+        .outerjoin(perms, perms.c.resource_id == Resource.resource_id)
+    )
+    resources_perms = {}  # type: ResourcesPermissions
+    for row in query:
+        resource = row.Resource
+        res_perms = resources_perms.setdefault(resource.resource_id, (resource, []))[1]
+        if row.perm_name is None:
+            continue  # no permission applied on this resource, but must preserve it in the hierarchy
+        group = groups.get(row.owner_id) if row.type == "group" else None
+        res_perms.append(PermissionTuple(user, row.perm_name, row.type, group, resource, False, True))
+
+    # include all permissions if user or one of its groups is the owner of the resource
+    for resource, res_perms in resources_perms.values():
+        if resource.owner_user_id == user.id:
+            res_perms.append(PermissionTuple(user, ALL_PERMISSIONS, "user", None, resource, True, True))
+        if resource.owner_group_id in groups:
+            group = groups[resource.owner_group_id]
+            res_perms.append(PermissionTuple(user, ALL_PERMISSIONS, "group", group, resource, True, True))
+
+    return resources_perms
+
+
+def find_resources_hierarchy_permissions(resource_ids, user, db_session, groups=None):
+    # type: (Iterable[int], User, Session, Optional[Dict[int, Group]]) -> Dict[int, ResourceHierarchy]
+    """
+    Obtains the hierarchies of multiple resources with permissions applied on them for the user, using a single query.
+
+    Ancestors shared by the resources (e.g.: a common parent and the root service) are retrieved only once, and their
+    permissions are reused in every hierarchy that contains them.
+
+    .. seealso::
+        :func:`find_resource_hierarchy_permissions` for details about retrieved permissions of each hierarchy.
+
+    :param resource_ids: Identifiers of the resources from which to start rewinding their hierarchy.
+    :param user: User for which to retrieve applied permissions, both directly and through its groups.
+    :param db_session: Database connection to retrieve resources and permissions.
+    :param groups: Groups of the user mapped by identifier, if already loaded. Otherwise, ``user.groups`` is loaded.
+    :returns: Mapping of each found resource identifier to its hierarchy, ordered from that resource up to the service.
+    """
+    resource_ids = list(resource_ids)
+    if not resource_ids:
+        return {}
+    closure = ResourceClosure.__table__
+    hierarchy = sa.select([  # distinct to retrieve common ancestors only once
+        closure.c.ancestor_id.label("resource_id"),
+    ]).where(closure.c.descendant_id.in_(resource_ids)).distinct().alias("hierarchy")
+
+    resources_perms = _find_resources_permissions(hierarchy, user, db_session, groups)
+
+    hierarchies = {}  # type: Dict[int, ResourceHierarchy]
+    for resource_id in resource_ids:
+        hierarchy_perms = []  # type: ResourceHierarchy
+        while resource_id in resources_perms:
+            resource, res_perms = resources_perms[resource_id]
+            hierarchy_perms.append((resource, res_perms))
+            resource_id = resource.parent_id
+        if hierarchy_perms:
+            hierarchies[hierarchy_perms[0][0].resource_id] = hierarchy_perms
+    return hierarchies
+
+
+def find_resource_subtree_permissions(resource_id, user, db_session, groups=None):
+    # type: (int, User, Session, Optional[Dict[int, Group]]) -> ResourcesPermissions
+    """
+    Obtains the resource, its parents and all its children with permissions applied on them for the user.
+
+    Both the parent chain up to the service and the whole children tree are retrieved using a single query, such that
+    :term:`Effective Permissions <Effective Permission>` of every resource in the tree can be resolved in memory.
+
+    .. seealso::
+        :func:`find_resource_hierarchy_permissions` for details about retrieved permissions of each resource.
+
+    :param resource_id: Identifier of the resource at the top of the tree.
+    :param user: User for which to retrieve applied permissions, both directly and through its groups.
+    :param db_session: Database connection to retrieve resources and permissions.
+    :param groups: Groups of the user mapped by identifier, if already loaded. Otherwise, ``user.groups`` is loaded.
+    :returns: Mapping of every found resource identifier to the resource and its applied permissions.
+    """
+    closure = ResourceClosure.__table__
+    subtree = sa.union(
+        sa.select([closure.c.ancestor_id.label("resource_id")]).where(closure.c.descendant_id == resource_id),
+        sa.select([closure.c.descendant_id.label("resource_id")]).where(closure.c.ancestor_id == resource_id),
+    ).alias("subtree")
+    return _find_resources_permissions(subtree, user, db_session, groups)
@@ -10,6 +10,7 @@ from typing import TYPE_CHECKING
 
 from magpie import xml_util
 from magpie.api.requests import get_multiformat_body
+from magpie.constants import get_constant
 from magpie.utils import CONTENT_TYPE_FORM, CONTENT_TYPE_JSON, CONTENT_TYPE_PLAIN, get_header, get_logger, is_json_body
 
 if TYPE_CHECKING:
@@ -47,6 +48,21 @@ def ows_parser_factory(request):
     return OWSGetParser(request)
 
 
+def get_request_parser(request):
+    # type: (Request) -> OWSParser
+    """
+    Retrieve the :class:`OWSParser` of the request, created once with :func:`ows_parser_factory` and then reused.
+
+    Parameters parsed by any :term:`OWS` service implementation that processes the same request are preserved, such
+    that resolving both the requested :term:`Permission` and :term:`Resource` does not parse the request again.
+    """
+    parser = getattr(request, "_ows_parser", None)
+    if parser is None or parser.request is not request:
+        parser = ows_parser_factory(request)
+        setattr(request, "_ows_parser", parser)
+    return parser
+
+
 class OWSParser(object):
 
     def __init__(self, request):
@@ -72,43 +88,181 @@ class OWSParser(object):
         raise NotImplementedError
 
 
+class LowerCaseParams(dict):
+    """
+    Parameters mapping that converts string values to lowercase only once they are accessed.
+    """
+
+    def __init__(self):
+        super(LowerCaseParams, self).__init__()
+        self._original = set()  # names of values that were not converted yet
+
+    def set_original(self, name, value):
+        dict.__setitem__(self, name, value)
+        if value is None:
+            self._original.discard(name)
+        else:
+            self._original.add(name)
+
+    def __getitem__(self, name):
+        value = dict.__getitem__(self, name)
+        if name in self._original:
+            self._original.discard(name)
+            value = value.lower()
+            dict.__setitem__(self, name, value)
+        return value
+
+    def __setitem__(self, name, value):
+        self._original.discard(name)
+        dict.__setitem__(self, name, value)
+
+    def __eq__(self, other):
+        return dict(self.items()) == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def copy(self):
+        return dict(self.items())
+
+
 class OWSGetParser(OWSParser):
     """
     Basically a case-insensitive query string parser.
+
+    Only query parameters named in the parsed list are retained, and their values are converted to lowercase only
+    when retrieved from :attr:`params`.
     """
 
     def __init__(self, request):
         super(OWSGetParser, self).__init__(request)
-        self._params = self._request_params()
+        self.params = LowerCaseParams()
 
-    def _request_params(self):
-        new_params = {}
-        for param in self.request.params:
-            new_params[param.lower()] = self.request.params[param].lower()
-        return new_params
+    def parse(self, param_list):
+        names = set(param_list) - set(self.params)
+        if not names:
+            return self.params
+        found = {}
+        for param, value in self.request.params.items():
+            param = param.lower()
+            if param in names:
+                found[param] = value  # last occurrence wins, as when retrieved from the multi-dict
+        for name in names:
+            self.params.set_original(name, found.get(name))
+        return self.params
 
     def _get_param_value(self, param):
-        if param in self._params:
-            return self._params[param]
-        return None
+        return self.params.get(param)
 
 
 class OWSPostParser(OWSParser):
+    """
+    Incremental parser of the :term:`XML` request body.
+
+    Only the root element and its first-level sections are needed to resolve typical :term:`OWS` parameters.
+    The body is fed by chunks to the parser until the root element and the first-level sections matching requested
+    parameters were found, or until :envvar:`MAGPIE_OWS_BODY_MAX_SIZE` bytes were processed. Contents that follow
+    (e.g.: large inline inputs of `WPS` ``Execute`` requests) are never parsed, and processed elements are discarded
+    as the parser advances to avoid building the complete document.
+    """
+    chunk_size = 65536
 
     def __init__(self, request):
         super(OWSPostParser, self).__init__(request)
-        self.document = xml_util.fromstring(self.request.body)
-        xml_util.strip_namespace(self.document)
+        max_size = get_constant("MAGPIE_OWS_BODY_MAX_SIZE", request.registry, default_value=None,
+                                raise_missing=False, raise_not_set=False)
+        self.max_size = int(max_size) if max_size not in [None, ""] and int(max_size) > 0 else None
+        self._reset(set())
+
+    def _reset(self, sections):
+        self.root_tag = None
+        self.root_attrib = {}
+        self.sections = {}
+        self._sections = sections
+        self._parser = xml_util.pull_parser()
+        self._offset = 0
+        self._depth = 0
+        self._done = False
+
+    def _resolved(self, param_list):
+        if self.root_tag is None:
+            return False
+        return all(param in self.root_attrib or param == "request" or param in self.sections for param in param_list)
+
+    def parse(self, param_list):
+        param_list = list(param_list)
+        sections = set(param_list)
+        if not sections.issubset(self._sections):
+            if self._offset:
+                # sections skipped previously must be looked for again, restart from the beginning of the body
+                self._reset(self._sections | sections)
+            else:
+                self._sections |= sections
+        self._scan(param_list)
+        return super(OWSPostParser, self).parse(param_list)
+
+    def _scan(self, param_list):
+        body = self.request.body
+        while not self._done and not self._resolved(param_list):
+            if self._offset >= len(body):
+                self._done = True
+                self._feed(None)
+            elif self.max_size is not None and self._offset >= self.max_size:
+                self._done = True
+                LOGGER.warning("Stopped parsing request body after limit of %s bytes, parameters %s not found.",
+                               self.max_size, [param for param in param_list if not self._resolved([param])])
+            else:
+                self._feed(body[self._offset:self._offset + self.chunk_size])
+                self._offset += self.chunk_size
+
+    def _feed(self, data):
+        try:
+            if data is None:
+                self._parser.close()
+            else:
+                self._parser.feed(data)
+            for event, node in self._parser.read_events():
+                if event == "start":
+                    self._depth += 1
+                    if self._depth == 1:
+                        self.root_tag = xml_util.local_name(node.tag)
+                        self.root_attrib = dict(node.attrib)
+                    continue
+                if self._depth == 2:
+                    name = xml_util.local_name(node.tag).lower()
+                    if name in self._sections and name not in self.sections:
+                        self.sections[name] = (node.text or "").strip()
+                if self._depth > 1:
+                    # drop processed elements to limit memory usage
+                    node.clear()
+                    parent = node.getparent()
+                    while node.getprevious() is not None:
+                        del parent[0]
+                self._depth -= 1
+        except xml_util.ParseError as exc:
+            LOGGER.warning("Stopped parsing invalid request body: [%s]", exc)
+            self._done = True
 
     def _get_param_value(self, param):
-        if param in self.document.attrib:
-            return self.document.attrib[param].lower()
+        if param in self.root_attrib:
+            return self.root_attrib[param].lower()
         if param == "request":
-            return self.document.tag.lower()
-        for section in self.document:
-            if param == section.tag.lower():
-                return section.text.strip()
-        return None
+            return self.root_tag.lower() if self.root_tag is not None else None
+        return self.sections.get(param)
 
 
 class MultiFormatParser(OWSParser):
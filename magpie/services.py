@@ -5,19 +5,26 @@ from typing import TYPE_CHECKING
 import six
 from beaker.cache import Cache, cache_region, cache_regions, region_invalidate
 from pyramid.httpexceptions import HTTPBadRequest, HTTPInternalServerError, HTTPNotImplemented
-from pyramid.security import ALL_PERMISSIONS, DENY_ALL
+from pyramid.security import ALL_PERMISSIONS, DENY_ALL, Allow, Deny, Everyone
+from pyramid.settings import asbool
 from sqlalchemy.inspection import inspect as sa_inspect
 from ziggurat_foundations.models.base import get_db_session
-from ziggurat_foundations.models.services.group import GroupService
 from ziggurat_foundations.models.services.resource import ResourceService
 from ziggurat_foundations.models.services.user import UserService
 from ziggurat_foundations.permissions import permission_to_pyramid_acls
 
 from magpie import models
 from magpie.api import exception as ax
+from magpie.cache import (
+    bump_resource_tree_version,
+    get_anonymous_access_map,
+    get_resource_tree_index,
+    invalidate_anonymous_access_maps
+)
 from magpie.constants import get_constant
 from magpie.db import get_connected_session
-from magpie.owsrequest import ows_parser_factory
+from magpie.metrics import observe_tree_depth
+from magpie.owsrequest import get_request_parser
 from magpie.permissions import (
     PERMISSION_REASON_ADMIN,
     PERMISSION_REASON_DEFAULT,
@@ -27,18 +34,22 @@ from magpie.permissions import (
     PermissionType,
     Scope
 )
+from magpie.timing import record_cache, timed
 from magpie.utils import classproperty, fully_qualified_name, get_logger, get_request_user
 
 LOGGER = get_logger(__name__)
+
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import Collection, Dict, List, Optional, Set, Tuple, Type, Union
+    from typing import Collection, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
 
     from pyramid.request import Request
+    from ziggurat_foundations.permissions import PermissionTuple
 
     from magpie.typedefs import (
         AccessControlListType,
         MultiResourceRequested,
+        NestedResourceNodes,
         PermissionRequested,
         ResourceTypePermissions,
         ServiceConfiguration,
@@ -153,7 +164,8 @@ class ServiceInterface(object):
         """
         self.service = service          # type: models.Service
         self.request = request          # type: Request
-        self._flag_acl_cached = {}      # type: Dict[Tuple[Str, Str, Str, Optional[int]], bool]
+        self._flag_acl_cached = {}      # type: Dict[Tuple[Str, Str, Str, Optional[int], Optional[int]], bool]
+        self._hierarchies_prefetched = None  # type: Optional[Dict[Tuple[int, int], models.ResourceHierarchy]]
 
     def __str__(self):
         return "<Service [{}] name={} type={} id={}>".format(
@@ -275,25 +287,51 @@ class ServiceInterface(object):
         Called by the configured Pyramid :class:`pyramid.authorization.ACLAuthorizationPolicy`.
 
         Caching is automatically handled according to configured application settings and whether the specific ACL
-        combination being requested was already processed recently.
+        combination being requested was already processed recently. The request reference employed for caching is
+        normalized by :meth:`acl_cache_key` to share results between requests that resolve to the same ACL.
+
+        When :envvar:`MAGPIE_CACHE_VERSIONING` is enabled, the permissions version stored in the database is also
+        part of the caching key, such that any modification of permissions immediately makes previous entries unused.
         """
         if "acl" not in cache_regions:
             cache_regions["acl"] = {"enabled": False}
         user_id = None if self.request.user is None else self.request.user.id
-        cache_keys = (self.service.resource_name, self.request.method, self.request.path_qs, user_id)
+        cache_version = None
+        versioning = get_constant("MAGPIE_CACHE_VERSIONING", self.request, default_value=False,
+                                  raise_missing=False, raise_not_set=False)
+        if asbool(versioning):
+            db_session = get_connected_session(self.request)
+            cache_version = models.CacheVersion.get(models.CacheVersion.PERMISSIONS, db_session)
+        cache_keys = (self.service.resource_name, self.request.method, self.acl_cache_key(), user_id, cache_version)
         LOGGER.debug("Cache keys: %s", list(cache_keys))
         self._flag_acl_cached[cache_keys] = True  # remains true if not reset by run '_get_acl_cached', hence cached
         if self.request.headers.get("Cache-Control") == "no-cache":
             LOGGER.debug("Cache invalidation requested. Removing items from ACL region: %s", list(cache_keys))
             region_invalidate(self._get_acl_cached, "acl", *cache_keys)
         acl = self._get_acl_cached(*cache_keys)
-        if self._flag_acl_cached[cache_keys]:
-            LOGGER.warning("Using cached ACL")
+        cached = self._flag_acl_cached[cache_keys]
+        record_cache("acl", cached)
+        if cached:
+            LOGGER.debug("Using cached ACL")
         return acl
 
+    def acl_cache_key(self):
+        # type: () -> Str
+        """
+        Obtains the normalized reference of the request employed as caching key of the resolved :term:`ACL`.
+
+        Only request components that can affect the result of :meth:`permission_requested` and
+        :meth:`resource_requested` should be considered, such that distinct requests that resolve to the same
+        combination of :term:`Resource` and :term:`Permission` can share the same cached :term:`ACL`.
+
+        By default, the complete request path and query string are employed. Implementations should override this
+        method to ignore any request component that is irrelevant for the resolution of their :term:`ACL`.
+        """
+        return self.request.path_qs
+
     @cache_region("acl")
-    def _get_acl_cached(self, service_name, request_method, request_path, user_id):
-        # type: (Str, Str, Str, Optional[int]) -> AccessControlListType
+    def _get_acl_cached(self, service_name, request_method, request_key, user_id, cache_version):
+        # type: (Str, Str, Str, Optional[int], Optional[int]) -> AccessControlListType
         """
         Cache this method with :py:mod:`beaker` based on the provided caching key parameters.
 
@@ -316,17 +354,19 @@ class ServiceInterface(object):
             - :meth:`ServiceInterface.resource_requested`
             - :meth:`ServiceInterface.user_requested`
         """
-        self._flag_acl_cached[(service_name, request_method, request_path, user_id)] = False
+        self._flag_acl_cached[(service_name, request_method, request_key, user_id, cache_version)] = False
 
         # attempt to catch any missing reconnect or detect closed transaction if needed for following steps
         # store in 'request.db' reference since service implementations don't always use 'get_connected_session'
         self.request.db = get_connected_session(self.request)
 
-        permissions = self.permission_requested()
+        with timed("permission"):
+            permissions = self.permission_requested()
         if permissions is None:
             return [DENY_ALL]
 
-        target_resources = self.resource_requested()
+        with timed("resource"):
+            target_resources = self.resource_requested()
         if not target_resources:
             return [DENY_ALL]
         if not isinstance(target_resources, list):
@@ -341,6 +381,10 @@ class ServiceInterface(object):
 
         if not isinstance(permissions, (list, set, tuple)):
             permissions = {permissions}
+        with timed("anonymous"):
+            acl = self._get_anonymous_acl(target_resources, permissions)
+        if acl is not None:
+            return acl
         user = self.user_requested()
 
         return self._get_acl(user, target_resources, permissions)
@@ -365,24 +409,213 @@ class ServiceInterface(object):
         """
         # avoid useless effective resolution re-computation if duplicates are found
         target_resources = list(dict.fromkeys(resources))  # set(), but preserving order
-        allowed_ace = []
-        for resource, is_target in target_resources:
-
-            # only 1 entry per (permission-name, resource) possible after effective resolution for each resource
-            # since distinct resources are being processed, user/group precedence and group priority doesn't matter
-            # resulting Allow/Deny for each case is the "highest priority" for each applicable resource individually
-            res_access_perms = self.effective_permissions(user, resource, permissions, is_target)
-            for perm in res_access_perms:
-                # if any resource or any permission indicates deny,
-                # break out to avoid useless computation (block all)
-                if perm.access == Access.DENY:
-                    return [perm.ace(self.request.user)]
-                allowed_ace.append(perm.ace(self.request.user))
+        if len(target_resources) > 1:
+            self._prefetch_hierarchies(user, [resource for resource, _ in target_resources])
+        try:
+            allowed_ace = []
+            for resource, is_target in target_resources:
+
+                # only 1 entry per (permission-name, resource) possible after effective resolution for each resource
+                # since distinct resources are being processed, user/group precedence and group priority doesn't matter
+                # resulting Allow/Deny for each case is the "highest priority" for each applicable resource individually
+                res_access_perms = self.effective_permissions(user, resource, permissions, is_target)
+                for perm in res_access_perms:
+                    # if any resource or any permission indicates deny,
+                    # break out to avoid useless computation (block all)
+                    if perm.access == Access.DENY:
+                        return [perm.ace(self.request.user)]
+                    allowed_ace.append(perm.ace(self.request.user))
+        finally:
+            self._hierarchies_prefetched = None
+
+        if not allowed_ace:
+            return [DENY_ALL]
+        return allowed_ace
+
+    def effective_permissions_many(self,
+                                   user,        # type: models.User
+                                   targets,     # type: List[Tuple[ServiceOrResourceType, Collection[Permission], bool]]
+                                   ):           # type: (...) -> List[List[PermissionSet]]
+        """
+        Obtains the :term:`Effective Resolution` of permissions the user has over multiple resources of the service.
+
+        Each target is resolved with :meth:`effective_permissions` using the specified resource, permissions and
+        ``allow_match`` flag, while the hierarchies of all resources and the groups of the user are loaded only once.
+
+        :returns: Resolved :term:`Effective Permission` of each target, in the same order.
+        """
+        resources = list(dict.fromkeys(target[0] for target in targets))
+        if len(resources) > 1:
+            self._prefetch_hierarchies(user, resources)
+        try:
+            return [
+                self.effective_permissions(user, resource, permissions, allow_match)
+                for resource, permissions, allow_match in targets
+            ]
+        finally:
+            self._hierarchies_prefetched = None
+
+    @timed("effective")
+    def effective_permissions_tree(self,
+                                   user,        # type: models.User
+                                   resource,    # type: ServiceOrResourceType
+                                   tree,        # type: NestedResourceNodes
+                                   ):           # type: (...) -> Dict[int, List[PermissionSet]]
+        """
+        Obtains the :term:`Effective Resolution` of permissions the user has over a resource and all its children.
+
+        Instead of rewinding the hierarchy of every resource individually with :meth:`effective_permissions`, the tree
+        is traversed top-down and permissions applied on each resource are propagated to its children. The parents of
+        the resource and the complete tree are loaded with their user and group permissions using a single query
+        (see :func:`magpie.models.find_resource_subtree_permissions`), and every resource is then resolved in memory
+        using the same priority rules. Only parents with applied permissions are considered by children resolution.
+
+        :param user: :term:`User` for which to perform :term:`Effective Resolution`.
+        :param resource: :term:`Service` or :term:`Resource` at the top of the tree.
+        :param tree:
+            Children of the :paramref:`resource` as nested nodes
+            (see :func:`magpie.api.management.resource.resource_utils.get_resource_children`).
+        :returns: Resolved :term:`Effective Permission` of all permissions allowed on each resource, mapped by ID.
+        """
+        user = self._get_connected_object(user)
+        resource = self._get_connected_object(resource)
+        groups = self._get_user_groups(user)
+        is_admin = self._is_admin_member(groups)
+        resources_perms = {}  # type: models.ResourcesPermissions
+        if not is_admin:
+            db_session = get_connected_session(self.request)
+            resources_perms = models.find_resource_subtree_permissions(resource.resource_id, user,
+                                                                       db_session=db_session, groups=groups)
+
+        def applied_permissions(res):
+            # type: (ServiceOrResourceType) -> List[PermissionTuple]
+            res_perms = resources_perms.get(res.resource_id, (res, []))[1]
+            return res_perms + permission_to_pyramid_acls(res.__acl__)
+
+        parents = []  # type: models.ResourceHierarchy
+        parent_id = resource.parent_id
+        while parent_id in resources_perms:
+            parent = resources_perms[parent_id][0]
+            parent_perms = applied_permissions(parent)
+            if parent_perms:
+                parents.append((parent, parent_perms))
+            parent_id = parent.parent_id
+
+        effective_perms = {}  # type: Dict[int, List[PermissionSet]]
+        pending = [(resource, tree, parents)]  # top-down traversal with permissions applied on parents of each node
+        while pending:
+            res, children, inherited = pending.pop()
+            permissions = self.allowed_permissions(res)
+            if is_admin:
+                effective_perms[res.resource_id] = [
+                    PermissionSet(perm, access=Access.ALLOW, scope=Scope.MATCH,
+                                  typ=PermissionType.EFFECTIVE, reason=PERMISSION_REASON_ADMIN)
+                    for perm in permissions
+                ]
+            else:
+                res_perms = applied_permissions(res)
+                hierarchy = [(res, res_perms)] + inherited
+                effective_perms[res.resource_id] = self._resolve_effective_permissions(hierarchy, permissions, True)
+                if res_perms:
+                    inherited = hierarchy  # shared by children since it is never modified by the resolution
+            pending.extend((child["node"], child["children"], inherited) for child in children.values())
+        return effective_perms
+
+    def _prefetch_hierarchies(self, user, resources):
+        # type: (models.User, List[ServiceOrResourceType]) -> None
+        """
+        Loads hierarchies and applied permissions of all resources at once for following :meth:`effective_permissions`.
+
+        Common ancestors of the resources (e.g.: the :term:`Service` and shared parents) are retrieved only once instead
+        of being loaded again for the resolution of every requested :term:`Resource`.
+        """
+        user = self._get_connected_object(user)
+        groups = self._get_user_groups(user)
+        if self._is_admin_member(groups):
+            return  # resolved without any hierarchy
+        resources = [self._get_connected_object(resource) for resource in resources]
+        resource_ids = [resource.resource_id for resource in resources if resource is not None]
+        db_session = get_connected_session(self.request)
+        hierarchies = models.find_resources_hierarchy_permissions(resource_ids, user, db_session, groups=groups)
+        self._hierarchies_prefetched = {(user.id, res_id): hierarchy for res_id, hierarchy in hierarchies.items()}
 
+    def _get_hierarchy(self, user, resource, groups):
+        # type: (models.User, ServiceOrResourceType, Dict[int, models.Group]) -> models.ResourceHierarchy
+        """
+        Obtains the hierarchy and applied permissions of the resource, from prefetched ones if available.
+        """
+        prefetched = self._hierarchies_prefetched or {}
+        hierarchy = prefetched.get((user.id, resource.resource_id))
+        if hierarchy is not None:
+            # copy permission lists that are shared between hierarchies, since they are extended during resolution
+            return [(res, list(res_perms)) for res, res_perms in hierarchy]
+        db_session = get_connected_session(self.request)
+        return models.find_resource_hierarchy_permissions(resource.resource_id, user,
+                                                          db_session=db_session, groups=groups)
+
+    def _get_anonymous_acl(self, resources, permissions):
+        # type: (MultiResourceRequested, Collection[Permission]) -> Optional[AccessControlListType]
+        """
+        Resolves the :term:`ACL` of an unauthenticated request using the anonymous access map of the service.
+
+        Applies the same rules as :meth:`_get_acl` with :term:`Effective Permissions <Effective Permission>` that were
+        precomputed for the whole service (see :class:`magpie.cache.AnonymousAccessMap`), which avoids any database
+        request until the map must be rebuilt.
+
+        :returns: Resolved :term:`ACL`, or ``None`` if it must be resolved normally.
+        """
+        enabled = get_constant("MAGPIE_ANONYMOUS_ACCESS_MAP", self.request, default_value=False,
+                               raise_missing=False, raise_not_set=False)
+        if not asbool(enabled) or self.request.user is not None or get_request_user(self.request) is not None:
+            return None
+        expire = get_constant("MAGPIE_ANONYMOUS_ACCESS_MAP_EXPIRE", self.request, default_value=None,
+                              raise_missing=False, raise_not_set=False)
+        access_map = get_anonymous_access_map(
+            self.service.resource_id, get_connected_session(self.request),
+            get_constant("MAGPIE_ANONYMOUS_USER", self.request), get_constant("MAGPIE_ANONYMOUS_GROUP", self.request),
+            expire=float(expire) if expire else None,
+        )
+        if access_map is None:
+            return None
+        allowed_ace = []
+        for resource, is_target in dict.fromkeys(resources):
+            for perm in permissions:
+                access = access_map.access(resource.resource_id, perm, is_target)
+                if access is None:
+                    return None
+                if access == Access.DENY:
+                    return [(Deny, Everyone, perm.value)]
+                allowed_ace.append((Allow, Everyone, perm.value))
         if not allowed_ace:
             return [DENY_ALL]
         return allowed_ace
 
+    def _get_user_groups(self, user):
+        # type: (models.User) -> Dict[int, models.Group]
+        """
+        Obtains the groups of the user mapped by identifier, loaded only once for all resolutions of the request.
+
+        The mapping is stored on the request such that the multiple resources resolved by :meth:`_get_acl`, or any
+        other service implementation processing the same request, reuse it instead of loading ``user.groups`` again.
+        """
+        prefetched = getattr(self.request, "_user_groups_prefetched", None)
+        if prefetched is None:
+            prefetched = {}  # type: Dict[int, Dict[int, models.Group]]
+            setattr(self.request, "_user_groups_prefetched", prefetched)
+        groups = prefetched.get(user.id)
+        if groups is None or any(sa_inspect(group).detached for group in groups.values()):
+            groups = {group.id: group for group in user.groups}
+            prefetched[user.id] = groups
+        return groups
+
+    def _is_admin_member(self, groups):
+        # type: (Dict[int, models.Group]) -> bool
+        """
+        Verifies if the administrator group is one of the groups of the user, already loaded with their names.
+        """
+        admin_name = get_constant("MAGPIE_ADMIN_GROUP", self.request)
+        return any(group.group_name == admin_name for group in groups.values())
+
     def _get_connected_object(self, obj):
         # type: (Union[ServiceOrResourceType, models.User]) -> Optional[ServiceOrResourceType]
         """
@@ -448,6 +681,34 @@ class ServiceInterface(object):
         svc_idx = path_parts.index(svc_name)
         return path_parts[svc_idx + 1:]
 
+    def _find_resource_by_path(self, path_parts):
+        # type: (List[Str]) -> Tuple[Optional[models.Resource], int]
+        """
+        Obtains the deepest children :term:`Resource` of the :term:`Service` matching successive path parts.
+
+        Uses the in-memory resource tree index when enabled by :envvar:`MAGPIE_RESOURCE_INDEX`, or otherwise resolves
+        the complete path with a single database query.
+
+        :returns:
+            Deepest matched resource (``None`` if not even the first part matched) and the quantity of matched parts.
+        """
+        db_session = get_connected_session(self.request)
+        svc_id = self.service.resource_id
+        use_index = get_constant("MAGPIE_RESOURCE_INDEX", self.request, default_value=False,
+                                 raise_missing=False, raise_not_set=False)
+        if asbool(use_index):
+            expire = get_constant("MAGPIE_RESOURCE_INDEX_EXPIRE", self.request, default_value=None,
+                                  raise_missing=False, raise_not_set=False)
+            index = get_resource_tree_index(svc_id, db_session, expire=float(expire) if expire else None)
+            res_id, depth = index.find(path_parts)
+            if res_id is None:
+                return None, 0
+            resource = ResourceService.by_resource_id(res_id, db_session=db_session)
+            if resource is not None:
+                return resource, depth
+            LOGGER.debug("Outdated resource tree index of service [%s], resolving path from database.", svc_id)
+        return models.find_resource_by_path(path_parts, svc_id, db_session)
+
     def get_config(self):
         # type: () -> ServiceConfiguration
         """
@@ -509,6 +770,7 @@ class ServiceInterface(object):
             return self.permissions
         return self.get_resource_permissions(resource.resource_type)
 
+    @timed("effective")
     def effective_permissions(self,
                               user,                     # type: models.User
                               resource,                 # type: ServiceOrResourceType
@@ -522,6 +784,8 @@ class ServiceInterface(object):
         resides under (or directly if the resource is the service) and retrieve permissions along the way that should be
         applied to children when using scoped-resource inheritance. Rewinding of the tree can terminate earlier when
         permissions can be immediately resolved such as when more restrictive conditions enforce denied access.
+        The whole parent chain and the corresponding user and group permissions are loaded with a single query
+        (see :func:`magpie.models.find_resource_hierarchy_permissions`) and then resolved in memory.
 
         Both user and group permission inheritance is resolved simultaneously to tree hierarchy with corresponding
         allow and deny conditions. User :term:`Direct Permissions <Direct Permission>` have priority over all its groups
@@ -548,18 +812,14 @@ class ServiceInterface(object):
         """
         if not permissions:
             permissions = self.allowed_permissions(resource)
-        requested_perms = set(permissions)  # type: Set[Permission]
-        effective_perms = {}                # type: Dict[Permission, PermissionSet]
 
-        db_session = get_connected_session(self.request)
         user = self._get_connected_object(user)  # groups dynamically populated fail if not connected (for admin check)
         LOGGER.debug("Resolving effective permission for: [user: %s, resource: %s, permissions: %s, match: %s]",
                      user, resource, list(permissions), allow_match)
 
         # immediately return all permissions if user is an admin
-        admin_group = get_constant("MAGPIE_ADMIN_GROUP", self.request)
-        admin_group = GroupService.by_group_name(admin_group, db_session=db_session)
-        if admin_group in user.groups:  # noqa
+        groups = self._get_user_groups(user)
+        if self._is_admin_member(groups):
             LOGGER.debug("Resolved by early detection of admin group membership. Full access granted.")
             return [
                 PermissionSet(perm, access=Access.ALLOW, scope=Scope.MATCH,
@@ -567,22 +827,49 @@ class ServiceInterface(object):
                 for perm in permissions
             ]
 
+        # retrieve the whole resource hierarchy with applied user/group permissions at once to resolve them in memory
+        resource = self._get_connected_object(resource)
+        if resource is None:
+            LOGGER.warning("Resource 'None' after reconnection attempt. Cannot run effective resolution loop.")
+            hierarchy = []
+        else:
+            # include both permissions set in database as well as defined directly on resource
+            hierarchy = [
+                (res, res_perms + permission_to_pyramid_acls(res.__acl__))
+                for res, res_perms in self._get_hierarchy(user, resource, groups)
+            ]
+            observe_tree_depth(len(hierarchy))
+        return self._resolve_effective_permissions(hierarchy, permissions, allow_match)
+
+    def _resolve_effective_permissions(self,
+                                       hierarchy,       # type: models.ResourceHierarchy
+                                       permissions,     # type: Collection[Permission]
+                                       allow_match,     # type: bool
+                                       ):               # type: (...) -> List[PermissionSet]
+        """
+        Resolves the :term:`Effective Permissions <Effective Permission>` from permissions applied on the hierarchy.
+
+        The hierarchy must be ordered from the targeted resource up to its service. Levels without any permission can
+        be omitted, except for the targeted resource which is the only one where `match` permissions apply.
+        Permission lists of the hierarchy are not modified.
+
+        .. seealso::
+            - :meth:`effective_permissions` for resolution rules
+        """
+        requested_perms = set(permissions)  # type: Set[Permission]
+        effective_perms = {}                # type: Dict[Permission, PermissionSet]
+
         # level at which last permission was found, -1 if not found
         # employed to resolve with *closest* scope and for applicable 'reason' combination on same level
         effective_level = {}  # type: Dict[Permission, Optional[int]]
         current_level = 1   # one-based to avoid ``if level:`` check failing with zero
         full_break = False
+
         # current and parent resource(s) recursive-scope
-        while resource is not None and not full_break:  # bottom-up until service is reached
-            LOGGER.debug("Resolving for (sub-)resource: [%s]", resource)
-            resource = self._get_connected_object(resource)
-            if resource is None:
-                LOGGER.warning("Resource 'None' after reconnection attempt. Early stop effective resolution loop.")
+        for resource, cur_res_perms in hierarchy:  # bottom-up until service is reached
+            if full_break:
                 break
-
-            # include both permissions set in database as well as defined directly on resource
-            cur_res_perms = ResourceService.perms_for_user(resource, user, db_session=db_session)
-            cur_res_perms.extend(permission_to_pyramid_acls(resource.__acl__))
+            LOGGER.debug("Resolving for (sub-)resource: [%s]", resource)
 
             for perm_name in requested_perms:
                 if full_break:
@@ -670,11 +957,6 @@ class ServiceInterface(object):
             # otherwise, move to parent if any available, since we are not done rewinding the resource tree
             allow_match = False  # reset match not applicable anymore for following parent resources
             current_level += 1
-            if resource.parent_id:
-                resource = ResourceService.by_resource_id(resource.parent_id, db_session=db_session)
-            else:
-                LOGGER.debug("No more children resources to process. Stopping search.")
-                resource = None
 
         # set deny for all still unresolved permissions from requested ones
         resolved_perms = set(effective_perms)
@@ -722,12 +1004,28 @@ class ServiceOWS(ServiceInterface):
         self._request = request
         if request is None:
             return  # avoid error parsing undefined request
-        # must reset the parser from scratch if request changes to ensure everything is updated with new inputs
-        self.parser = ows_parser_factory(request)
-        self.parser.parse(type(self).params_expected)  # run parsing to obtain guaranteed lowercase parameters
+        # parser is bound to the request to ensure everything is updated with new inputs,
+        # while reusing parameters already parsed by other implementations that processed the same request
+        with timed("parse"):
+            self.parser = get_request_parser(request)
+            self.parser.parse(type(self).params_expected)  # run parsing to obtain guaranteed lowercase parameters
 
     request = property(_get_request, _set_request)
 
+    def acl_cache_key(self):
+        # type: () -> Str
+        """
+        Obtains the normalized reference of the request using only the parsed :attr:`params_expected`.
+
+        Other query parameters that do not affect the requested :term:`Resource` and :term:`Permission` are ignored
+        (e.g.: ``BBOX``, ``WIDTH`` or ``TIME`` of ``GetMap`` requests) in order to share the cached :term:`ACL`.
+        """
+        params = self.parser.params
+        names = set(type(self).params_expected)  # parser can hold more parameters if shared with other services
+        params = sorted((name, params[name]) for name in names if params.get(name) is not None)
+        query = "&".join("{}={}".format(name, value) for name, value in params)
+        return "{}?{}".format(self.request.path, query)
+
     @property
     @abc.abstractmethod
     def service_base(self):
@@ -913,14 +1211,12 @@ class ServiceNCWMS2(ServiceBaseWMS):
             # FIXME: this is probably too specific to birdhouse... leave as is for bw-compat, adjust as needed
             netcdf_file = netcdf_file.replace("outputs/", "birdhouse/")
 
-            db_session = get_connected_session(self.request)
             file_parts = netcdf_file.split("/")
-            while found_child and file_parts:
-                part = file_parts.pop(0)
-                res_id = found_child.resource_id
-                found_child = models.find_children_by_name(part, parent_id=res_id, db_session=db_session)
+            found_child, depth = self._find_resource_by_path(file_parts)
+            if depth < len(file_parts):
+                found_child = None
             # target resource reached if no more parts to process, otherwise we have some parent (minimally the service)
-            target = not len(file_parts)
+            target = depth >= len(file_parts) - 1
         return found_child, target
 
 
@@ -1077,8 +1373,8 @@ class ServiceGeoserverBase(ServiceOWS):
         # following requests lead to the same resolution, need to check the workspace in the layer
         #   /geoserver/<WORKSPACE>/<OWS>?<RESOURCE_PARAM>=[<WORKSPACE>:]<LAYER_NAME>&request=<PERMISSION>
         #   /geoserver/<OWS>?<RESOURCE_PARAM>=<WORKSPACE>:<LAYER_NAME>&request=<PERMISSION>
-        matched_resources = []
-        session = get_connected_session(self.request)
+        # references are first resolved for all requested resources to search them all at once in the database
+        requested_names = []  # type: List[Tuple[Optional[Str], Str]]
         for res_name in self.resource_param_requested():
             if not res_name:
                 continue
@@ -1108,16 +1404,31 @@ class ServiceGeoserverBase(ServiceOWS):
 
             if not workspace_isolated:
                 continue
-            workspace = models.find_children_by_name(child_name=workspace_isolated,
-                                                     parent_id=self.service.resource_id,
-                                                     db_session=session)
+            requested_names.append((workspace_isolated, res_name))
+
+        # one query for all referenced workspaces, and another one for all layers under the found workspaces
+        session = get_connected_session(self.request)
+        svc_id = self.service.resource_id
+        workspaces = {}  # type: Dict[Tuple[int, Str], ServiceOrResourceType]
+        layers = {}  # type: Dict[Tuple[int, Str], ServiceOrResourceType]
+        if requested_names:
+            workspace_names = {workspace.lower() for workspace, _ in requested_names}
+            workspaces = models.find_children_by_names({svc_id: workspace_names}, db_session=session)
+            layer_names = {}  # type: Dict[int, Set[Str]]
+            for workspace_name_isolated, res_name in requested_names:
+                workspace = workspaces.get((svc_id, workspace_name_isolated.lower()))
+                if workspace and res_name:
+                    layer_names.setdefault(workspace.resource_id, set()).add(res_name.lower())
+            layers = models.find_children_by_names(layer_names, db_session=session)
+
+        matched_resources = []
+        for workspace_name_isolated, res_name in requested_names:
+            workspace = workspaces.get((svc_id, workspace_name_isolated.lower()))
             if workspace:
                 if not res_name:
                     matched_resources.append((workspace, False))
                     continue
-                resource = models.find_children_by_name(child_name=res_name,
-                                                        parent_id=workspace.resource_id,
-                                                        db_session=session)
+                resource = layers.get((workspace.resource_id, res_name.lower()))
                 if resource:
                     matched_resources.append((resource, True))
                 else:
@@ -1215,21 +1526,23 @@ class ServiceAPI(ServiceInterface):
         route_parts = self._get_request_path_parts()
         if not route_parts:
             return self.service, True
-        route_found = route_child = self.service
 
         # find deepest possible resource matching sub-route name
-        while route_child and route_parts:
-            part_name = route_parts.pop(0)
-            route_res_id = route_child.resource_id
-            session = get_connected_session(self.request)
-            route_child = models.find_children_by_name(part_name, parent_id=route_res_id, db_session=session)
-            if route_child:
-                route_found = route_child
+        route_found, depth = self._find_resource_by_path(route_parts)
+        if route_found is None:
+            route_found = self.service
 
         # target reached if no more parts to process, otherwise we have some parent (minimally the service)
-        route_target = not len(route_parts) and route_child is not None
+        route_target = depth == len(route_parts)
         return route_found, route_target
 
+    def acl_cache_key(self):
+        # type: () -> Str
+        """
+        Obtains the request path as reference for caching since query parameters do not affect the :term:`ACL`.
+        """
+        return self.request.path
+
     def permission_requested(self):
         # type: () -> PermissionRequested
         if self.request.method.upper() in ["GET", "HEAD"]:
@@ -1404,32 +1717,35 @@ class ServiceTHREDDS(ServiceInterface):
         path_parts = path_parts[1:]
         cfg = self.get_config()
 
+        # when reaching the final part, test for possible file pattern, otherwise default to literal value
+        #   allows combining different naming formats into a common file resource (eg: extra extensions)
+        # if final part is a directory, still works because of literal value
+        #   directory name must match exactly, no format naming variants allowed
+        # if final part is 'catalog.html' file, lookup would fail and fall back to previous directory part
+        #   since that would be the last part extracted, the parent directory will be matched as intended
+        part_name = path_parts[-1]
+        for pattern in cfg["file_patterns"]:
+            matched = self.is_match(part_name, pattern)
+            if matched is not None:
+                path_parts[-1] = matched
+                break
+
         # find deepest possible resource matching either Directory or File by name
-        found_resource = child_resource = self.service
-        while child_resource and path_parts:
-            part_name = path_parts.pop(0)
-            # when reaching the final part, test for possible file pattern, otherwise default to literal value
-            #   allows combining different naming formats into a common file resource (eg: extra extensions)
-            # if final part is a directory, still works because of literal value
-            #   directory name must match exactly, no format naming variants allowed
-            # if final part is 'catalog.html' file, lookup would fail and fall back to previous directory part
-            #   since that would be the last part extracted, the parent directory will be matched as intended
-            if not path_parts:
-                for pattern in cfg["file_patterns"]:
-                    matched = self.is_match(part_name, pattern)
-                    if matched is not None:
-                        part_name = matched
-                        break
-            session = get_connected_session(self.request)
-            child_res_id = child_resource.resource_id
-            child_resource = models.find_children_by_name(part_name, parent_id=child_res_id, db_session=session)
-            if child_resource:
-                found_resource = child_resource
+        found_resource, depth = self._find_resource_by_path(path_parts)
+        if found_resource is None:
+            found_resource = self.service
 
         # target resource reached if no more parts to process, otherwise we have some parent (minimally the service)
-        target = not len(path_parts) and child_resource is not None
+        target = depth == len(path_parts)
         return found_resource, target
 
+    def acl_cache_key(self):
+        # type: () -> Str
+        """
+        Obtains the request path as reference for caching since both the prefix and dataset are resolved from it.
+        """
+        return self.request.path
+
     def permission_requested(self):
         # type: () -> PermissionRequested
         cfg = self.get_config()
@@ -1723,18 +2039,69 @@ def invalidate_service(service_name):
 
     if "acl" in cache_regions:
         for namespace in [ServiceInterface._get_acl_cached]:
-            cache_keys = (service_name, )  # full signature: (service_name, request_method, request_path, user_id)
+            cache_keys = (service_name, )  # full signature: (service_name, request_method, request_key, user_id, ...)
             region_invalidate(namespace, "acl", *cache_keys)  # noqa
-            # beaker doesn't provide a direct method to invalidate partial key.
-            # Therefore, do 'region_invalidate' equivalent operations manually.
-            #   If above 'region_invalidate' did not raise cache-key error,
-            #   it is safe to simplify most steps without pre-checks.
-            region = cache_regions["acl"]
-            ns_key = getattr(namespace, "_arg_namespace")
-            cache = Cache._get_cache(ns_key, region)
-            # keys are normally generated by concatenating byte-str repr of all params received as input
-            # we care only about service-name in this case
-            service_param_key = (service_name + " ").encode("ascii", "backslashreplace")
-            for func_params_key in list(cache.namespace.dictionary):
-                if func_params_key.startswith(service_param_key):
-                    cache.namespace.dictionary.pop(func_params_key, None)
+        invalidate_acl(service_name=service_name)
+
+
+def _match_acl_cache_key(cache_key, service_name=None, user_id=None):
+    # type: (Union[bytes, Str], Optional[Str], Optional[int]) -> bool
+    """
+    Verifies if the key of an :term:`ACL` cache entry corresponds to the service and user.
+
+    Keys are generated by concatenating the string representation of all parameters of
+    :meth:`ServiceInterface._get_acl_cached`, which allows matching them partially. Keys that were hashed by
+    :mod:`beaker` because of their length cannot be interpreted and are always considered as matching.
+    """
+    if isinstance(cache_key, bytes):
+        cache_key = cache_key.decode("ascii", "backslashreplace")
+    params = cache_key.split(" ")
+    if len(params) < 5:
+        return True
+    if service_name is not None and params[0] != service_name:
+        return False
+    if user_id is not None and params[-2] != str(user_id):
+        return False
+    return True
+
+
+def invalidate_acl(service_name=None, user_id=None):
+    # type: (Optional[Str], Optional[int]) -> None
+    """
+    Invalidates cached :term:`ACL` entries of the specified service and/or user.
+
+    Only entries stored in memory by the current process can be removed partially. Other backends rely on expiry or
+    cache versioning (see :envvar:`MAGPIE_CACHE_VERSIONING`) to ignore outdated entries.
+    """
+    # pylint: disable=W0212,protected-access
+    if "acl" not in cache_regions or not cache_regions["acl"].get("enabled", True):
+        return
+    # beaker doesn't provide a direct method to invalidate partial key.
+    # Therefore, do 'region_invalidate' equivalent operations manually.
+    region = cache_regions["acl"]
+    ns_key = getattr(ServiceInterface._get_acl_cached, "_arg_namespace", None)
+    if ns_key is None:
+        return  # nothing cached yet
+    cache = Cache._get_cache(ns_key, region)
+    entries = getattr(cache.namespace, "dictionary", None)
+    if entries is None:
+        LOGGER.debug("Cannot invalidate partial keys of [%s] cache backend.", region.get("type"))
+        return
+    for func_params_key in list(entries):
+        if _match_acl_cache_key(func_params_key, service_name=service_name, user_id=user_id):
+            entries.pop(func_params_key, None)
+
+
+def apply_cache_events(events):
+    # type: (Iterable[models.CacheEvent]) -> None
+    """
+    Invalidates cached references affected by each of the :class:`models.CacheEvent`.
+    """
+    for event in events:
+        if event.scope == models.CacheEvent.SCOPE_RESOURCE:
+            bump_resource_tree_version(event.service_id)
+            if event.service_name:
+                invalidate_service(event.service_name)
+        else:
+            invalidate_acl(service_name=event.service_name, user_id=event.user_id)
+            invalidate_anonymous_access_maps(event.service_id)
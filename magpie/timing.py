@@ -0,0 +1,231 @@
+"""
+Per-request measurements of the main processing steps employed to diagnose the performance of requests.
+
+When :envvar:`MAGPIE_REQUEST_TIMINGS` is enabled, a tween collects for each request the duration of the sections
+delimited with :func:`timed` (request parsing, requested permission and resource resolution, effective permissions
+resolution, etc.), the number and duration of executed SQL statements, and whether cached results were reused for each
+caching region. The breakdown is logged at the end of the request, and is returned to administrators with the
+``Server-Timing`` response header.
+
+Measurements are attached to the thread processing the request, such that nothing needs to be passed around between
+the instrumented functions. Nothing is recorded when the feature is disabled.
+"""
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from pyramid.settings import asbool
+from pyramid.tweens import EXCVIEW
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from magpie.constants import get_constant
+from magpie.metrics import is_metrics_enabled, observe_cache, observe_section
+from magpie.utils import fully_qualified_name, get_logger, log_request_format
+
+if TYPE_CHECKING:
+    # pylint: disable=W0611,unused-import
+    from typing import Any, Callable, Dict, Iterator, List, Optional
+
+    from pyramid.config import Configurator
+    from pyramid.registry import Registry
+    from pyramid.request import Request
+    from pyramid.response import Response
+
+    from magpie.typedefs import JSON, Str
+
+LOGGER = get_logger(__name__)
+
+_CURRENT = threading.local()
+_SQL_EVENTS_LOCK = threading.Lock()
+_SQL_EVENTS = {"registered": False}
+
+
+class RequestTimings(object):
+    """
+    Measurements accumulated during the processing of a single request.
+    """
+    __slots__ = ["start", "duration", "sections", "sql_count", "sql_duration", "cache"]
+
+    def __init__(self):
+        # type: () -> None
+        self.start = time.perf_counter()
+        self.duration = None  # type: Optional[float]
+        self.sections = OrderedDict()  # type: OrderedDict[Str, List[float, int]]
+        self.sql_count = 0
+        self.sql_duration = 0.0
+        self.cache = OrderedDict()  # type: OrderedDict[Str, Dict[Str, int]]
+
+    def add(self, name, duration):
+        # type: (Str, float) -> None
+        """
+        Accumulates the duration (in seconds) of a section, which can be executed multiple times.
+        """
+        section = self.sections.setdefault(name, [0.0, 0])
+        section[0] += duration
+        section[1] += 1
+
+    def count_cache(self, region, hit):
+        # type: (Str, bool) -> None
+        counts = self.cache.setdefault(region, {"hit": 0, "miss": 0})
+        counts["hit" if hit else "miss"] += 1
+
+    def stop(self):
+        # type: () -> None
+        self.duration = time.perf_counter() - self.start
+
+    def json(self):
+        # type: () -> JSON
+        """
+        Representation of the measurements with durations in milliseconds.
+        """
+        return {
+            "duration": round((self.duration or 0.0) * 1000, 3),
+            "sections": {
+                name: {"duration": round(duration * 1000, 3), "count": count}
+                for name, (duration, count) in self.sections.items()
+            },
+            "sql": {"duration": round(self.sql_duration * 1000, 3), "count": self.sql_count},
+            "cache": {region: dict(counts) for region, counts in self.cache.items()},
+        }
+
+    def server_timing(self):
+        # type: () -> Str
+        """
+        Representation of the measurements formatted as ``Server-Timing`` header value.
+        """
+        metrics = []
+        for name, (duration, count) in self.sections.items():
+            desc = ";desc=\"{} calls\"".format(count) if count > 1 else ""
+            metrics.append("{};dur={:.3f}{}".format(name, duration * 1000, desc))
+        metrics.append("sql;dur={:.3f};desc=\"{} statements\"".format(self.sql_duration * 1000, self.sql_count))
+        for region, counts in self.cache.items():
+            metrics.append("cache-{};desc=\"{} hit / {} miss\"".format(region, counts["hit"], counts["miss"]))
+        metrics.append("total;dur={:.3f}".format((self.duration or 0.0) * 1000))
+        return ", ".join(metrics)
+
+
+def get_request_timings():
+    # type: () -> Optional[RequestTimings]
+    """
+    Obtains the measurements of the request processed by the current thread, if enabled.
+    """
+    return getattr(_CURRENT, "timings", None)
+
+
+@contextmanager
+def timed(name):
+    # type: (Str) -> Iterator[None]
+    """
+    Measures the duration of the enclosed operations as a named section of the current request.
+
+    The duration is also reported to :mod:`magpie.metrics` when enabled.
+    Can be employed either as context manager or as function decorator.
+    """
+    timings = getattr(_CURRENT, "timings", None)
+    if timings is None and not is_metrics_enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        if timings is not None:
+            timings.add(name, duration)
+        observe_section(name, duration)
+
+
+def record_cache(region, hit):
+    # type: (Str, bool) -> None
+    """
+    Records whether a cached result of the caching region was reused by the current request.
+    """
+    timings = getattr(_CURRENT, "timings", None)
+    if timings is not None:
+        timings.count_cache(region, hit)
+    observe_cache(region, hit)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: W0613
+    # type: (Any, Any, Str, Any, Any, bool) -> None
+    # start kept with the execution context of the statement, discarded with it even if the statement fails
+    if context is not None and getattr(_CURRENT, "timings", None) is not None:
+        context._magpie_start = time.perf_counter()  # pylint: disable=W0212
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):  # noqa: W0613
+    # type: (Any, Any, Str, Any, Any, bool) -> None
+    timings = getattr(_CURRENT, "timings", None)
+    start = getattr(context, "_magpie_start", None)
+    if timings is None or start is None:
+        return
+    timings.sql_count += 1
+    timings.sql_duration += time.perf_counter() - start
+
+
+def register_sql_timings():
+    # type: () -> None
+    """
+    Registers the listeners of executed SQL statements with every database engine, only once per process.
+    """
+    with _SQL_EVENTS_LOCK:
+        if _SQL_EVENTS["registered"]:
+            return
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _SQL_EVENTS["registered"] = True
+
+
+def _is_admin_request(request):
+    # type: (Request) -> bool
+    try:
+        user = request.user
+        if user is None:
+            return False
+        admin_group = get_constant("MAGPIE_ADMIN_GROUP", request)
+        return any(group.group_name == admin_group for group in user.groups)
+    except Exception as exc:  # pragma: no cover  # pylint: disable=W0703
+        LOGGER.debug("Could not resolve administrator access for request timings (%s).", exc)
+        return False
+
+
+def request_timings_tween(handler, registry):  # noqa: W0613
+    # type: (Callable[[Request], Response], Registry) -> Callable[[Request], Response]
+    """
+    Tween that measures the processing steps of each request.
+
+    The measurements are logged, and returned with the ``Server-Timing`` header if the user is an administrator.
+    The tween is placed under the transaction manager such that the user can still be resolved from the database.
+    """
+    def measure(request):
+        # type: (Request) -> Response
+        previous = getattr(_CURRENT, "timings", None)
+        timings = RequestTimings()
+        _CURRENT.timings = timings
+        try:
+            response = handler(request)
+        finally:
+            timings.stop()
+            _CURRENT.timings = previous
+        LOGGER.info("Request timings: [%s] %s", log_request_format(request), json.dumps(timings.json()))
+        if _is_admin_request(request):
+            response.headers["Server-Timing"] = timings.server_timing()
+        return response
+    return measure
+
+
+def setup_request_timings(config):
+    # type: (Configurator) -> None
+    """
+    Enables the measurements of requests if requested by :envvar:`MAGPIE_REQUEST_TIMINGS`.
+    """
+    enabled = get_constant("MAGPIE_REQUEST_TIMINGS", config, default_value=False,
+                           raise_missing=False, raise_not_set=False)
+    if not asbool(enabled):
+        return
+    register_sql_timings()
+    config.add_tween(fully_qualified_name(request_timings_tween), under="pyramid_tm.tm_tween_factory", over=EXCVIEW)
@@ -23,7 +23,7 @@
 </thead>
 <tbody>
 %for i, group in enumerate(group_names):
-<form action="${request.path}" method="post">
+<form action="${request.path_qs}" method="post">
 %if i % 2:
 <tr class="list-row-even">
 %else:
@@ -46,3 +46,19 @@
 %endfor
 </tbody>
 </table>
+
+%if cursor or next_cursor:
+<div class="pagination">
+    %if cursor:
+    <button class="button theme" type="button" onclick="location.href='${request.route_url('view_groups')}'">
+        First
+    </button>
+    %endif
+    %if next_cursor:
+    <button class="button theme" type="button"
+            onclick="location.href='${request.route_url('view_groups', _query={'cursor': next_cursor})}'">
+        Next
+    </button>
+    %endif
+</div>
+%endif
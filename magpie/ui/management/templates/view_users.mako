@@ -28,7 +28,7 @@
         user_name = user_info["name"]
         user_email = user_info["email"]
     %>
-    <form action="${request.path}" method="post">
+    <form action="${request.path_qs}" method="post">
         %if i % 2:
         <tr class="list-row-even">
         %else:
@@ -84,3 +84,19 @@
 %endfor
 </tbody>
 </table>
+
+%if cursor or next_cursor:
+<div class="pagination">
+    %if cursor:
+    <button class="button theme" type="button" onclick="location.href='${request.route_url('view_users')}'">
+        First
+    </button>
+    %endif
+    %if next_cursor:
+    <button class="button theme" type="button"
+            onclick="location.href='${request.route_url('view_users', _query={'cursor': next_cursor})}'">
+        Next
+    </button>
+    %endif
+</div>
+%endif
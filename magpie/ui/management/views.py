@@ -76,12 +76,14 @@ class ManagementViews(AdminRequests, BaseViews):
         if "view-pending" in self.request.POST:
             return HTTPFound(self.request.route_url("view_pending_user", user_name=user_name))
 
-        users = self.get_user_details(status="all")
+        cursor = self.request.params.get("cursor")
+        users, next_cursor = self.get_user_details_page(status="all", cursor=cursor)
         non_error = UserStatuses.OK | UserStatuses.Pending  # use combine in case more error types gets added later on
         user_info = [{"name": user["user_name"], "email": user["email"]} for user in users]
         user_error = [user["user_name"] for user in users if UserStatuses.get(user["status"]) not in non_error]
         pending = [user["user_name"] for user in users if UserStatuses.get(user["status"]) == UserStatuses.Pending]
-        return self.add_template_data({"users": user_info, "users_with_error": user_error, "users_pending": pending})
+        return self.add_template_data({"users": user_info, "users_with_error": user_error, "users_pending": pending,
+                                       "cursor": cursor, "next_cursor": next_cursor})
 
     @view_config(route_name="add_user", renderer="templates/add_user.mako")
     def add_user(self):
@@ -347,11 +349,12 @@ class ManagementViews(AdminRequests, BaseViews):
             return HTTPFound(self.request.route_url("edit_group", group_name=group_name, cur_svc_type="default"))
 
         groups_info = {}
-        groups = sorted(self.get_all_groups())
+        cursor = self.request.params.get("cursor")
+        groups, next_cursor = self.get_group_names_page(cursor=cursor)
         for grp in groups:
             if grp != "":
                 groups_info.setdefault(grp, {"members": len(self.get_group_users(grp))})
-        return self.add_template_data({"group_names": groups_info})
+        return self.add_template_data({"group_names": groups_info, "cursor": cursor, "next_cursor": next_cursor})
 
     @view_config(route_name="add_group", renderer="templates/add_group.mako")
     def add_group(self):
@@ -15,6 +15,7 @@ from pyramid.renderers import render_to_response
 from pyramid.request import Request
 from pyramid.settings import asbool
 from pyramid.view import view_defaults
+from six.moves.urllib.parse import urlencode
 
 from magpie import __meta__
 from magpie.api import schemas
@@ -27,7 +28,7 @@ from magpie.utils import CONTENT_TYPE_JSON, get_header, get_json, get_logger, ge
 
 if TYPE_CHECKING:
     # pylint: disable=W0611,unused-import
-    from typing import Any, Callable, Dict, List, Optional, Union
+    from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
     from pyramid.response import Response
 
@@ -347,6 +348,22 @@ class AdminRequests(BaseViews):
             groups.insert(0, first_default_group)
         return groups
 
+    @handle_errors
+    def get_group_names_page(self, cursor=None):
+        # type: (Optional[Str]) -> Tuple[List[Str], Optional[Str]]
+        """
+        Obtains group names of the page following the cursor.
+
+        :returns: group names of the page, and cursor of the following page if any.
+        """
+        query = {"limit": get_constant("MAGPIE_UI_PAGE_SIZE", self.request)}
+        if cursor:
+            query["cursor"] = cursor
+        resp = request_api(self.request, schemas.GroupsAPI.path + "?" + urlencode(query), "GET")
+        check_response(resp)
+        body = get_json(resp)
+        return body["group_names"], body["next_cursor"]
+
     @handle_errors
     def get_group_info(self, group_name):
         # type: (Str) -> JSON
@@ -438,6 +455,24 @@ class AdminRequests(BaseViews):
         check_response(resp)
         return get_json(resp)["users"]
 
+    @handle_errors
+    def get_user_details_page(self, status=None, cursor=None):
+        # type: (Optional[Union[str, int]], Optional[Str]) -> Tuple[List[JSON], Optional[Str]]
+        """
+        Obtains user details of the page following the cursor, optionally filtered to by corresponding status value.
+
+        :returns: user details of the page, and cursor of the following page if any.
+        """
+        query = {"detail": "true", "limit": get_constant("MAGPIE_UI_PAGE_SIZE", self.request)}
+        if status is not None:
+            query["status"] = status
+        if cursor:
+            query["cursor"] = cursor
+        resp = request_api(self.request, schemas.UsersAPI.path + "?" + urlencode(query), "GET")
+        check_response(resp)
+        body = get_json(resp)
+        return body["users"], body["next_cursor"]
+
     def get_resource_types(self):
         """
         :return: dictionary of all resources as {id: 'resource_type'}
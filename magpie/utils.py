@@ -313,8 +313,12 @@ def setup_session_config(config):
     # type: (Configurator) -> None
     """
     Setup database :class:`Session` transaction handlers and :class:`Request` properties for active :term:`User`.
+
+    Modifications applied by the sessions also increment the cache versions if :envvar:`MAGPIE_CACHE_VERSIONING` is
+    enabled.
     """
     from magpie.db import get_engine, get_session_factory, get_tm_session
+    from magpie.models import register_cache_versioning
 
     settings = get_settings(config)
 
@@ -347,6 +351,9 @@ def setup_session_config(config):
     # make 'request.db' available for use in Pyramid
     config.include("pyramid_tm")
     session_factory = get_session_factory(get_engine(settings))
+    if asbool(get_constant("MAGPIE_CACHE_VERSIONING", settings, default_value=False,
+                           raise_missing=False, raise_not_set=False)):
+        register_cache_versioning()
     config.registry["dbsession_factory"] = session_factory
     config.add_request_method(
         # 'request.tm' is the transaction manager used by 'pyramid_tm'
@@ -22,6 +22,8 @@ from typing import TYPE_CHECKING
 from lxml import etree as lxml_etree  # nosec: B410  # flagged known issue, this is what the applied fix below is about
 
 if TYPE_CHECKING:
+    from typing import Tuple
+
     from lxml.etree._FeedParser import _FeedParser as Parser  # noqa # nosec: B410 # pylint: disable=W0212
 
 XML_PARSER = lxml_etree.XMLParser(
@@ -56,6 +58,25 @@ def fromstring(text, parser=XML_PARSER):
     return _lxml_fromstring(text, parser=parser)  # nosec: B410,B320  # safe use if using secure parser
 
 
+def pull_parser(events=("start", "end")):
+    # type: (Tuple[str, ...]) -> Parser
+    """
+    Creates an incremental :term:`XML` parser fed by chunks with the same security options as :data:`XML_PARSER`.
+
+    Contrary to :func:`fromstring`, parsing can be interrupted as soon as the required elements were obtained from
+    the events returned by :meth:`lxml.etree.XMLPullParser.read_events`.
+    """
+    return lxml_etree.XMLPullParser(events=events, resolve_entities=False, recover=True)  # nosec: B410,B320
+
+
+def local_name(tag):
+    # type: (str) -> str
+    """
+    Obtains the tag name without its namespace component.
+    """
+    return tag.split("}", 1)[1] if tag.startswith("{") else tag
+
+
 def strip_namespace(tree):
     # type: (XML) -> None
     """
@@ -0,0 +1,7 @@
+"""
+Benchmarks of permissions resolution against synthetic deployments.
+
+Sizes of the generated deployment are controlled with ``MAGPIE_BENCHMARK_<PARAM>`` environment variables
+(see :data:`tests.benchmarks.deployment.BENCHMARK_DEFAULTS`). Results are written in JSON to the file specified by
+``MAGPIE_BENCHMARK_OUTPUT`` if defined.
+"""
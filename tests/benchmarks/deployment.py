@@ -0,0 +1,185 @@
+"""
+Generation of synthetic deployments with the models of the application.
+
+Every :term:`Service` type of :data:`magpie.services.SERVICE_TYPE_DICT` is created with a tree of children resources
+following its allowed structure, as well as users that are members of multiple groups, and random user and group
+permissions applied throughout the trees. Generation is reproducible for a given set of parameters and seed.
+"""
+import os
+import random
+from typing import TYPE_CHECKING
+
+from magpie import models
+from magpie.constants import get_constant
+from magpie.permissions import Access, PermissionSet, Scope
+from magpie.services import SERVICE_TYPE_DICT
+
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, Tuple, Type
+
+    from sqlalchemy.orm.session import Session
+
+    from magpie.services import ServiceInterface
+    from magpie.typedefs import ServiceOrResourceType, Str
+
+BENCHMARK_DEFAULTS = {
+    "depth": 4,         # maximum depth of resource trees under each service
+    "fanout": 3,        # children resources created under each resource allowing them
+    "users": 20,        # users other than the anonymous user
+    "groups": 5,        # generic groups, on top of the administrators and anonymous groups
+    "memberships": 2,   # maximum generic groups of each user
+    "density": 0.2,     # probability that any resource receives permissions
+    "permissions": 3,   # maximum permissions applied on a resource when selected
+    "samples": 30,      # resolutions timed for each service type and benchmark case
+    "seed": 42,
+}
+
+# tables employed by generated deployments, for creating them in an empty database
+DEPLOYMENT_TABLES = [
+    "users",
+    "groups",
+    "users_groups",
+    "resources",
+    "resources_closure",
+    "services",
+    "users_resources_permissions",
+    "groups_resources_permissions",
+    "cache_versions",
+    "cache_events",
+]
+
+
+def get_benchmark_settings(**overrides):
+    # type: (**float) -> Dict[Str, float]
+    """
+    Obtains the deployment parameters, overridden by ``MAGPIE_BENCHMARK_<PARAM>`` environment variables if defined.
+    """
+    settings = {}
+    for name, default in BENCHMARK_DEFAULTS.items():
+        value = os.getenv("MAGPIE_BENCHMARK_{}".format(name.upper()))
+        settings[name] = type(default)(value) if value else default
+    settings.update(overrides)
+    return settings
+
+
+class Deployment(object):
+    """
+    References to the generated database contents.
+    """
+    def __init__(self):
+        self.services = []      # type: List[Tuple[Type[ServiceInterface], models.Service]]
+        self.resources = {}     # type: Dict[int, List[Tuple[ServiceOrResourceType, int]]]
+        self.paths = {}         # type: Dict[int, Str]
+        self.users = []         # type: List[models.User]
+        self.groups = []        # type: List[models.Group]
+        self.anonymous = None   # type: Optional[models.User]
+        self.permissions = 0
+
+    def sample(self, rnd, service, count):
+        # type: (random.Random, models.Service, int) -> List[Tuple[models.User, ServiceOrResourceType, int]]
+        """
+        Selects random combinations of user and resource (with its depth) under the service.
+        """
+        resources = self.resources[service.resource_id]
+        samples = []
+        for _ in range(count):
+            resource, depth = rnd.choice(resources)
+            samples.append((rnd.choice(self.users), resource, depth))
+        return samples
+
+
+def _generate_tree(session, rnd, service_impl, service, settings, deployment):
+    # type: (Session, random.Random, Type[ServiceInterface], models.Service, Dict[Str, float], Deployment) -> None
+    resources = deployment.resources[service.resource_id] = [(service, 0)]
+    deployment.paths[service.resource_id] = ""
+    parents = [service]
+    for depth in range(1, int(settings["depth"]) + 1):
+        children = []
+        for parent in parents:
+            allowed = service_impl.nested_resource_allowed(parent)
+            if not allowed:
+                continue
+            # favor types that can nest children to reach the requested depth when the structure permits it
+            nested = [res_type for res_type in allowed if res_type.child_resource_allowed]
+            for index in range(int(settings["fanout"])):
+                res_type = rnd.choice(nested if nested and depth < settings["depth"] else allowed)
+                child = res_type(resource_name="{}-{}-{}".format(res_type.resource_type_name, depth, index),
+                                 resource_type=res_type.resource_type_name,
+                                 parent_id=parent.resource_id, root_service_id=service.resource_id)
+                session.add(child)
+                children.append(child)
+        session.flush()
+        for child in children:
+            deployment.paths[child.resource_id] = "{}/{}".format(deployment.paths[child.parent_id],
+                                                                 child.resource_name)
+        resources.extend((child, depth) for child in children)
+        parents = children
+
+
+def _generate_permissions(session, rnd, service_impl, service, settings, deployment):
+    # type: (Session, random.Random, Type[ServiceInterface], models.Service, Dict[Str, float], Deployment) -> None
+    principals = [("user", user) for user in deployment.users] + [("group", group) for group in deployment.groups]
+    for resource, _ in deployment.resources[service.resource_id]:
+        if rnd.random() >= settings["density"]:
+            continue
+        if resource.resource_type_name == models.Service.resource_type_name:
+            permissions = service_impl.permissions
+        else:
+            permissions = service_impl.get_resource_permissions(resource.resource_type_name)
+        if not permissions:
+            continue
+        applied = {}
+        for _ in range(rnd.randint(1, int(settings["permissions"]))):
+            kind, principal = rnd.choice(principals)
+            perm = PermissionSet(rnd.choice(permissions), rnd.choice(list(Access)), rnd.choice(list(Scope)))
+            applied[(kind, principal.id, perm.name)] = perm  # only one entry by permission name per principal
+        for (kind, principal_id, _), perm in applied.items():
+            if kind == "user":
+                perm_model = models.UserResourcePermission(user_id=principal_id, resource_id=resource.resource_id,
+                                                           perm_name=str(perm))
+            else:
+                perm_model = models.GroupResourcePermission(group_id=principal_id,
+                                                            resource_id=resource.resource_id, perm_name=str(perm))
+            session.add(perm_model)
+            deployment.permissions += 1
+
+
+def generate_deployment(session, settings):
+    # type: (Session, Dict[Str, float]) -> Deployment
+    """
+    Generates the synthetic deployment in the database using the specified parameters.
+
+    Users are members of the anonymous group, as for any normal user, as well as of random generic groups, such that
+    their permissions must be resolved with the corresponding group priorities.
+    """
+    rnd = random.Random(settings["seed"])
+    deployment = Deployment()
+
+    admin_group = models.Group(group_name=get_constant("MAGPIE_ADMIN_GROUP"))
+    anonymous_group = models.Group(group_name=get_constant("MAGPIE_ANONYMOUS_GROUP"))
+    generic_groups = [models.Group(group_name="benchmark-group-{}".format(i)) for i in range(int(settings["groups"]))]
+    deployment.groups = [anonymous_group] + generic_groups
+    deployment.anonymous = models.User(user_name=get_constant("MAGPIE_ANONYMOUS_USER"),
+                                       email="anonymous@benchmark.com", status=1)
+    users = [models.User(user_name="benchmark-user-{}".format(i), email="user-{}@benchmark.com".format(i), status=1)
+             for i in range(int(settings["users"]))]
+    session.add_all([admin_group, anonymous_group, deployment.anonymous] + generic_groups + users)
+    session.flush()
+    session.add(models.UserGroup(user_id=deployment.anonymous.id, group_id=anonymous_group.id))
+    for user in users:
+        session.add(models.UserGroup(user_id=user.id, group_id=anonymous_group.id))
+        count = rnd.randint(0, min(int(settings["memberships"]), len(generic_groups)))
+        for group in rnd.sample(generic_groups, count):
+            session.add(models.UserGroup(user_id=user.id, group_id=group.id))
+    deployment.users = users
+
+    for service_type, service_impl in sorted(SERVICE_TYPE_DICT.items()):
+        service = models.Service(resource_name="benchmark-{}".format(service_type), resource_type="service",
+                                 type=service_type, url="http://localhost/{}".format(service_type))
+        session.add(service)
+        session.flush()
+        deployment.services.append((service_impl, service))
+        _generate_tree(session, rnd, service_impl, service, settings, deployment)
+        _generate_permissions(session, rnd, service_impl, service, settings, deployment)
+    session.flush()
+    return deployment
@@ -0,0 +1,251 @@
+"""
+Benchmarks of :term:`Effective Permissions <Effective Permission>` and :term:`ACL` resolution.
+
+Each case is timed for every :term:`Service` type of the synthetic deployment with both *cold* and *warm* states.
+A *cold* resolution starts from a session without any loaded object and without cached results (as for a new request
+handled by a worker), while a *warm* resolution repeats it with the objects and caches already populated.
+
+Beyond timings, the number of database queries of every resolution is counted and asserted against limits that do not
+depend on the depth of the requested resource, such that regressions to per-level queries are detected regardless of
+the machine running the benchmarks.
+"""
+import json
+import os
+import random
+import statistics
+import time
+import unittest
+from typing import TYPE_CHECKING
+
+import sqlalchemy as sa
+import transaction
+from pyramid.request import Request
+from pyramid.security import remember
+from pyramid.testing import setUp, tearDown
+from pyramid_beaker import set_cache_regions_from_settings
+
+from magpie import models
+from magpie.db import get_session_factory, get_tm_session
+from magpie.security import get_auth_config
+from magpie.services import ServiceAPI
+from magpie.utils import setup_cache_settings
+from tests import runner, utils
+from tests.benchmarks.deployment import DEPLOYMENT_TABLES, generate_deployment, get_benchmark_settings
+
+if TYPE_CHECKING:
+    from typing import Callable, Dict, List, Tuple
+
+    from magpie.typedefs import JSON, Str
+
+# maximum queries of a single resolution, for any depth of the requested resource
+#   - cold: user and resource reloading, user groups, hierarchy rewinding with all applied permissions at once
+#   - warm: objects already loaded, only the hierarchy with permissions of the resource remains to be retrieved
+#   - adapter: service lookup and resource path matching when cold, at most the service lookup when cached
+BENCHMARK_QUERY_LIMITS = {
+    ("effective_permissions", "cold"): 4,
+    ("effective_permissions", "warm"): 1,
+    ("_get_acl", "cold"): 4,
+    ("_get_acl", "warm"): 1,
+    ("check_request", "cold"): 8,
+    ("check_request", "warm"): 1,
+}
+
+
+def percentile(values, ratio):
+    # type: (List[float], float) -> float
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+@runner.MAGPIE_TEST_BENCHMARK
+@runner.MAGPIE_TEST_PERFORMANCE
+class TestBenchmarkResolution(unittest.TestCase):
+    """
+    Times permissions resolution against a synthetic deployment and validates the number of database queries.
+
+    Generated deployment is rolled back once all benchmarks completed, such that a real database can be employed
+    with ``MAGPIE_BENCHMARK_DB_URL`` without leaving any trace. An in-memory `SQLite` database is used otherwise.
+    """
+    results = []  # type: List[JSON]
+
+    @classmethod
+    def setUpClass(cls):
+        cls.params = get_benchmark_settings()
+        cls.settings = {
+            "magpie.secret": "benchmark",
+            "magpie.url": "http://localhost:2001",
+            "twitcher.url": "http://localhost",
+            "twitcher.ows_proxy_protected_path": "/ows",
+        }
+        setup_cache_settings(cls.settings, force=True, enabled=True, expire=600)
+        set_cache_regions_from_settings(cls.settings)
+        utils.patch_cache_handles()
+        cls.config = get_auth_config(setUp(settings=cls.settings))
+
+        cls.engine = sa.create_engine(os.getenv("MAGPIE_BENCHMARK_DB_URL") or "sqlite://")
+        cls.tables = [models.Base.metadata.tables[name] for name in DEPLOYMENT_TABLES]
+        models.Base.metadata.create_all(cls.engine, tables=cls.tables)
+        cls.queries = 0
+        sa.event.listen(cls.engine, "before_cursor_execute", cls.count_query)
+
+        transaction.manager.begin()
+        cls.session = get_tm_session(get_session_factory(cls.engine), transaction.manager)
+        start = time.perf_counter()
+        cls.deployment = generate_deployment(cls.session, cls.params)
+        cls.generation = time.perf_counter() - start
+
+        # resolve once such that process-wide memoization done on the first request of a worker is not measured
+        service_impl, service = cls.deployment.services[0]
+        anonymous = cls.deployment.anonymous
+        service_impl(service, cls.make_request(anonymous)).effective_permissions(anonymous, service)
+
+    @classmethod
+    def tearDownClass(cls):
+        transaction.manager.abort()
+        sa.event.remove(cls.engine, "before_cursor_execute", cls.count_query)
+        models.Base.metadata.drop_all(cls.engine, tables=cls.tables)
+        cls.engine.dispose()
+        tearDown()
+        utils.patch_cache_handles()
+
+        output = os.getenv("MAGPIE_BENCHMARK_OUTPUT")
+        if output:
+            report = {
+                "parameters": cls.params,
+                "deployment": {
+                    "services": len(cls.deployment.services),
+                    "resources": sum(len(res) for res in cls.deployment.resources.values()),
+                    "users": len(cls.deployment.users),
+                    "groups": len(cls.deployment.groups),
+                    "permissions": cls.deployment.permissions,
+                    "generation_seconds": round(cls.generation, 3),
+                },
+                "results": cls.results,
+            }
+            with open(output, mode="w", encoding="utf-8") as out_file:
+                json.dump(report, out_file, indent=2)
+
+    @classmethod
+    def count_query(cls, *_, **__):
+        cls.queries += 1
+
+    @classmethod
+    def make_request(cls, user, path="/"):
+        request = Request.blank(path)
+        request.registry = cls.config.registry
+        request.db = cls.session
+        request.user = user
+        return request
+
+    def measure(self, case, service_impl, cache, calls):
+        # type: (Str, ServiceAPI, Str, List[Tuple[int, Callable[[], None]]]) -> Dict[Str, JSON]
+        """
+        Runs the resolutions of a benchmark case and reports their timings and number of queries.
+        """
+        durations = []
+        queries = []
+        for _, call in calls:
+            count = self.queries
+            start = time.perf_counter()
+            call()
+            durations.append((time.perf_counter() - start) * 1000)
+            queries.append(self.queries - count)
+        result = {
+            "case": case,
+            "service_type": service_impl.service_type,
+            "cache": cache,
+            "calls": len(calls),
+            "max_depth": max(depth for depth, _ in calls),
+            "time_ms": {
+                "mean": round(statistics.mean(durations), 3),
+                "median": round(statistics.median(durations), 3),
+                "p95": round(percentile(durations, 0.95), 3),
+                "max": round(max(durations), 3),
+            },
+            "queries": {
+                "mean": round(statistics.mean(queries), 2),
+                "max": max(queries),
+            },
+        }
+        self.results.append(result)
+
+        limit = BENCHMARK_QUERY_LIMITS[(case, cache)]
+        self.assertLessEqual(
+            result["queries"]["max"], limit,
+            "Resolution [{}] with {} state of service type [{}] must not require more than {} queries "
+            "regardless of resource depth.".format(case, cache, service_impl.service_type, limit)
+        )
+        return result
+
+    def run_resolutions(self, case, resolve):
+        # type: (Str, Callable[[ServiceAPI, models.User, models.Resource], None]) -> None
+        """
+        Measures the resolution function with cold and warm states over random samples of every service type.
+        """
+        rnd = random.Random(self.params["seed"])
+        for service_impl, service in self.deployment.services:
+            samples = self.deployment.sample(rnd, service, int(self.params["samples"]))
+
+            def cold(_user, _resource):
+                def call():
+                    self.session.expire_all()
+                    resolve(service_impl(service, self.make_request(_user)), _user, _resource)
+                return call
+
+            def warm(_user, _resource):
+                impl = service_impl(service, self.make_request(_user))
+                resolve(impl, _user, _resource)
+                return lambda: resolve(impl, _user, _resource)
+
+            self.measure(case, service_impl, "cold", [(depth, cold(user, res)) for user, res, depth in samples])
+            self.measure(case, service_impl, "warm", [(depth, warm(user, res)) for user, res, depth in samples])
+
+    def test_effective_permissions(self):
+        def resolve(service_impl, user, resource):
+            service_impl.effective_permissions(user, resource)
+
+        self.run_resolutions("effective_permissions", resolve)
+
+    def test_get_acl(self):
+        def resolve(service_impl, user, resource):
+            permissions = service_impl.allowed_permissions(resource)
+            service_impl._get_acl(user, [(resource, True)], permissions)  # pylint: disable=W0212
+
+        self.run_resolutions("_get_acl", resolve)
+
+    def test_check_request(self):
+        """
+        Measures the complete access verification of proxied requests by the adapter, including its caching regions.
+
+        Only :class:`ServiceAPI` is employed since other service types resolve their permission and resources from
+        query parameters specific to each implementation, while the access resolution remains the same.
+        """
+        from magpie.adapter.magpieowssecurity import MagpieOWSSecurity, OWSAccessForbidden  # noqa: E402
+
+        owssecurity = MagpieOWSSecurity(self.config.registry)
+        rnd = random.Random(self.params["seed"])
+        service_impl, service = [(impl, svc) for impl, svc in self.deployment.services if impl is ServiceAPI][0]
+        samples = self.deployment.sample(rnd, service, int(self.params["samples"]))
+
+        def verify(user, resource, headers=None):
+            path = "/ows/proxy/{}{}".format(service.resource_name, self.deployment.paths[resource.resource_id])
+            request = self.make_request(user, path)
+            request.headers.update(headers or {})
+            request.headers["Cookie"] = remember(request, user.id)[0][1].split(";", 1)[0]
+            try:
+                owssecurity.check_request(request)
+            except OWSAccessForbidden:
+                pass
+
+        def cold(user, resource):
+            def call():
+                self.session.expire_all()
+                verify(user, resource, headers={"Cache-Control": "no-cache"})
+            return call
+
+        def warm(user, resource):
+            verify(user, resource)
+            return lambda: verify(user, resource)
+
+        self.measure("check_request", service_impl, "cold", [(depth, cold(user, res)) for user, res, depth in samples])
+        self.measure("check_request", service_impl, "warm", [(depth, warm(user, res)) for user, res, depth in samples])
@@ -1922,6 +1922,42 @@ class Interface_MagpieAPI_AdminAuth(AdminTestCase, BaseTestCase):
                 status = UserStatuses.OK
             utils.check_val_equal(usr["status"], self.get_user_status_value(status))
 
+    @runner.MAGPIE_TEST_USERS
+    def test_GetUsers_Paginated(self):
+        utils.warn_version(self, "paginated users listing", "3.33", skip=True)
+
+        inserted_user = "paginated-user-inserted"
+        utils.TestSetup.delete_TestUser(self, override_user_name=inserted_user)
+        resp = utils.test_request(self, "GET", "/users", headers=self.json_headers, cookies=self.cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+        utils.check_val_not_in("next_cursor", body)
+        all_users = body["user_names"]
+
+        paged_users = []
+        query = {"limit": 2, "detail": "true"}
+        while True:
+            resp = utils.test_request(self, "GET", "/users", params=query,
+                                      headers=self.json_headers, cookies=self.cookies)
+            body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+            utils.check_val_is_in("next_cursor", body)
+            utils.check_val_equal(len(body["users"]) <= 2, True)
+            paged_users.extend(usr["user_name"] for usr in body["users"])
+            if body["next_cursor"] is None:
+                break
+            query["cursor"] = body["next_cursor"]
+            if len(paged_users) == 2:
+                # user created between pages must not shift the following ones (only listed if after the cursor)
+                utils.TestSetup.create_TestGroup(self)
+                utils.TestSetup.create_TestUser(self, override_user_name=inserted_user)
+        utils.check_val_equal(len(paged_users), len(set(paged_users)), msg="Pages should not repeat any user.")
+        utils.check_all_equal([usr for usr in paged_users if usr != inserted_user], all_users, any_order=True)
+        utils.TestSetup.delete_TestUser(self, override_user_name=inserted_user)
+
+        for query in [{"limit": 0}, {"limit": "abc"}, {"cursor": "!invalid!"}]:
+            resp = utils.test_request(self, "GET", "/users", params=query, expect_errors=True,
+                                      headers=self.json_headers, cookies=self.cookies)
+            utils.check_response_basic_info(resp, 400, expected_method="GET")
+
     @runner.MAGPIE_TEST_USERS
     @runner.MAGPIE_TEST_DEFAULTS
     def test_ValidateDefaultUsers(self):
@@ -3142,6 +3178,112 @@ class Interface_MagpieAPI_AdminAuth(AdminTestCase, BaseTestCase):
             perm.pop("reason", None)  # ignore post magpie-3.5 'reason'
             utils.check_val_equal(perm, perm_effective.json())
 
+    @runner.MAGPIE_TEST_USERS
+    @runner.MAGPIE_TEST_RESOURCES
+    @runner.MAGPIE_TEST_PERMISSIONS
+    @runner.MAGPIE_TEST_FUNCTIONAL
+    def test_PostPermissionsCheck(self):
+        """
+        Validates that batched permission checks resolve the same access as individual :term:`Effective Resolution`.
+
+        Employs the same permissions as the ``MatchWithinRecursiveResolution`` effective permissions test, with
+        resources referenced either by identifier or by path under the service.
+        """
+        utils.warn_version(self, "batched permissions check", "3.33", skip=True)
+
+        utils.TestSetup.create_TestGroup(self)
+        utils.TestSetup.create_TestUser(self)  # auto-member of test-group
+        res_names = ["dir1", "dir2", "dir3"]
+        svc_id, res1_id, res2_id, res3_id = utils.TestSetup.create_TestServiceResourceTree(
+            self, resource_depth=3, override_resource_names=res_names)
+        perm_name = self.test_service_resource_perms[0]
+        rAR = PermissionSet(perm_name, Access.ALLOW, Scope.RECURSIVE)   # noqa
+        rDM = PermissionSet(perm_name, Access.DENY, Scope.MATCH)        # noqa
+        utils.TestSetup.create_TestGroupResourcePermission(self, override_resource_id=svc_id, override_permission=rAR)
+        utils.TestSetup.create_TestGroupResourcePermission(self, override_resource_id=res2_id, override_permission=rDM)
+
+        checks = [
+            {"user_name": self.test_user_name, "resource_id": res_id, "permission_name": perm_name.value}
+            for res_id in [svc_id, res1_id, res2_id, res3_id]
+        ] + [
+            {"user_name": self.test_user_name, "service_name": self.test_service_name,
+             "resource_path": "/dir1/dir2", "permission_name": perm_name.value},
+            {"user_name": self.test_user_name, "service_name": self.test_service_name,
+             "resource_path": "/dir1/dir2/unknown", "permission_name": perm_name.value},
+        ]
+        resp = utils.test_request(self, "POST", "/permissions/check", json={"checks": checks},
+                                  headers=self.json_headers, cookies=self.cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="POST")
+        utils.check_val_equal(len(body["checks"]), len(checks))
+        for i, (check, allowed) in enumerate(zip(body["checks"], [True, True, False, True, False, True])):
+            utils.check_val_equal(check["permission_name"], perm_name.value, msg="Test Case #{}".format(i + 1))
+            utils.check_val_equal(check["allowed"], allowed, msg="Test Case #{}".format(i + 1))
+            utils.check_val_equal(check["permission"]["type"], PermissionType.EFFECTIVE.value)
+
+        unknown_checks = [{"service_name": "unknown-service", "permission_name": perm_name.value}]
+        resp = utils.test_request(self, "POST", "/permissions/check", json={"checks": unknown_checks},
+                                  expect_errors=True, headers=self.json_headers, cookies=self.cookies)
+        utils.check_response_basic_info(resp, 404, expected_method="POST")
+
+        # login is required, even to check the anonymous user, such that services and resources cannot be probed
+        anonymous_checks = [{"user_name": get_constant("MAGPIE_ANONYMOUS_USER"), "resource_id": svc_id,
+                             "permission_name": perm_name.value}]
+        utils.check_or_try_logout_user(self)
+        resp = utils.test_request(self, "POST", "/permissions/check", json={"checks": anonymous_checks},
+                                  expect_errors=True, headers=self.json_headers)
+        utils.check_response_basic_info(resp, 401, expected_method="POST")
+
+        # logged user can check itself and the anonymous user, but not other users
+        headers, cookies = utils.check_or_try_login_user(self, username=self.test_user_name,
+                                                         password=self.test_user_name)
+        resp = utils.test_request(self, "POST", "/permissions/check", json={"checks": checks[:1] + anonymous_checks},
+                                  headers=headers, cookies=cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="POST")
+        utils.check_val_equal(body["checks"][0]["allowed"], True)
+        admin_checks = [dict(checks[0], user_name=get_constant("MAGPIE_ADMIN_USER"))]
+        resp = utils.test_request(self, "POST", "/permissions/check", json={"checks": admin_checks},
+                                  expect_errors=True, headers=headers, cookies=cookies)
+        utils.check_response_basic_info(resp, 403, expected_method="POST")
+
+    @runner.MAGPIE_TEST_USERS
+    @runner.MAGPIE_TEST_RESOURCES
+    @runner.MAGPIE_TEST_PERMISSIONS
+    @runner.MAGPIE_TEST_FUNCTIONAL
+    def test_GetUserServiceResources_EffectivePermissions(self):
+        """
+        Validates that effective permissions of the service tree match individual :term:`Effective Resolution`.
+        """
+        utils.warn_version(self, "effective permissions of service resources", "3.33", skip=True)
+
+        utils.TestSetup.create_TestGroup(self)
+        utils.TestSetup.create_TestUser(self)  # auto-member of test-group
+        res_names = ["dir1", "dir2", "dir3"]
+        svc_id, res1_id, res2_id, res3_id = utils.TestSetup.create_TestServiceResourceTree(
+            self, resource_depth=3, override_resource_names=res_names)
+        perm_name = self.test_service_resource_perms[0]
+        rAR = PermissionSet(perm_name, Access.ALLOW, Scope.RECURSIVE)   # noqa
+        rDM = PermissionSet(perm_name, Access.DENY, Scope.MATCH)        # noqa
+        utils.TestSetup.create_TestGroupResourcePermission(self, override_resource_id=svc_id, override_permission=rAR)
+        utils.TestSetup.create_TestGroupResourcePermission(self, override_resource_id=res2_id, override_permission=rDM)
+
+        path = "/users/{}/services/{}/resources?effective=true".format(self.test_user_name, self.test_service_name)
+        resp = utils.test_request(self, "GET", path, headers=self.json_headers, cookies=self.cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+        tree_perms = {svc_id: body["service"]["permission_names"]}
+        nodes = [body["service"]["resources"]]
+        while nodes:
+            for res_id, res_info in nodes.pop().items():
+                tree_perms[int(res_id)] = res_info["permission_names"]
+                nodes.append(res_info["children"])
+        utils.check_all_equal(list(tree_perms), [svc_id, res1_id, res2_id, res3_id], any_order=True)
+
+        for res_id, res_perms in tree_perms.items():
+            path = "/users/{}/resources/{}/permissions?effective=true".format(self.test_user_name, res_id)
+            resp = utils.test_request(self, "GET", path, headers=self.json_headers, cookies=self.cookies)
+            body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+            utils.check_all_equal(res_perms, body["permission_names"], any_order=True,
+                                  msg="Resource [{}] effective permissions should match.".format(res_id))
+
     @runner.MAGPIE_TEST_USERS
     @runner.MAGPIE_TEST_RESOURCES
     @runner.MAGPIE_TEST_PERMISSIONS
@@ -5069,6 +5211,28 @@ class Interface_MagpieAPI_AdminAuth(AdminTestCase, BaseTestCase):
         ]:
             utils.check_val_is_in(group, body["group_names"])
 
+    @runner.MAGPIE_TEST_GROUPS
+    def test_GetGroups_Paginated(self):
+        utils.warn_version(self, "paginated groups listing", "3.33", skip=True)
+
+        utils.TestSetup.create_TestGroup(self)
+        resp = utils.test_request(self, "GET", "/groups", headers=self.json_headers, cookies=self.cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+        all_groups = body["group_names"]
+
+        paged_groups = []
+        query = {"limit": 1}
+        while True:
+            resp = utils.test_request(self, "GET", "/groups", params=query,
+                                      headers=self.json_headers, cookies=self.cookies)
+            body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+            utils.check_val_equal(len(body["group_names"]) <= 1, True)
+            paged_groups.extend(body["group_names"])
+            if body["next_cursor"] is None:
+                break
+            query["cursor"] = body["next_cursor"]
+        utils.check_all_equal(paged_groups, all_groups)
+
     @runner.MAGPIE_TEST_GROUPS
     def test_GetGroup_admin(self):
         admin_grp = get_constant("MAGPIE_ADMIN_GROUP")
@@ -6173,6 +6337,24 @@ class Interface_MagpieAPI_AdminAuth(AdminTestCase, BaseTestCase):
                     for perm in svc_info["permissions"]:
                         utils.check_val_not_equal(perm["type"], PermissionType.DIRECT.value)  # noqa
 
+    @runner.MAGPIE_TEST_RESOURCES
+    def test_GetResources_Streamed(self):
+        utils.warn_version(self, "streamed resources listing", "3.33", skip=True)
+
+        utils.TestSetup.create_TestServiceResource(self)
+        resp = utils.test_request(self, "GET", "/resources", headers=self.json_headers, cookies=self.cookies)
+        body = utils.check_response_basic_info(resp, 200, expected_method="GET")
+        for query in [{"stream": True}, {"stream": True, "limit": 1}]:
+            resp = utils.test_request(self, "GET", "/resources", params=query,
+                                      headers=self.json_headers, cookies=self.cookies)
+            streamed = utils.check_response_basic_info(resp, 200, expected_method="GET")
+            if "limit" not in query:
+                utils.check_all_equal(streamed["resources"], body["resources"])
+                continue
+            services = [svc for svc_type in streamed["resources"] for svc in streamed["resources"][svc_type]]
+            utils.check_val_equal(len(services), 1)
+            utils.check_val_is_in("next_cursor", streamed)
+
     @runner.MAGPIE_TEST_RESOURCES
     def test_GetResources_ResponseFormat(self):
         utils.TestSetup.create_TestServiceResource(self)
@@ -48,6 +48,7 @@ MAGPIE_TEST_WEBHOOKS = RunOptionDecorator("MAGPIE_TEST_WEBHOOKS", "magpie webhoo
 MAGPIE_TEST_UTILS = RunOptionDecorator("MAGPIE_TEST_UTILS", "magpie utility functions")
 MAGPIE_TEST_FUNCTIONAL = RunOptionDecorator("MAGPIE_TEST_FUNCTIONAL", "functional operations sequence")
 MAGPIE_TEST_PERFORMANCE = RunOptionDecorator("MAGPIE_TEST_PERFORMANCE", "performance of requests operations")
+MAGPIE_TEST_BENCHMARK = RunOptionDecorator("MAGPIE_TEST_BENCHMARK", "permissions resolution with synthetic deployments")
 MAGPIE_TEST_AUTH_ADMIN = RunOptionDecorator("MAGPIE_TEST_AUTH_ADMIN", "operations that require admin-level access")
 MAGPIE_TEST_AUTH_USERS = RunOptionDecorator("MAGPIE_TEST_AUTH_USERS", "operations that require user-level access")
 MAGPIE_TEST_AUTH_PUBLIC = RunOptionDecorator("MAGPIE_TEST_AUTH_PUBLIC", "operations that are publicly accessible")
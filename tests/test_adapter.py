@@ -27,6 +27,7 @@ from tests import runner, utils
 from twitcher.__version__ import __version__ as twitcher_version  # noqa
 
 if six.PY3:
+    from magpie.adapter import ServiceHookDispatcher
     from magpie.adapter.magpieowssecurity import MagpieOWSSecurity, OWSAccessForbidden  # noqa: F401
 
 if TYPE_CHECKING:
@@ -39,6 +40,38 @@ if TYPE_CHECKING:
 PYTHON_VERSION = sys.version_info[:3]
 
 
+@unittest.skipIf(six.PY2, "Unsupported Twitcher for MagpieAdapter in Python 2")
+@pytest.mark.skipif(six.PY2, reason="Unsupported Twitcher for MagpieAdapter in Python 2")
+@runner.MAGPIE_TEST_LOCAL
+@runner.MAGPIE_TEST_ADAPTER
+def test_service_hook_dispatcher():
+    """
+    Validate that prepared hooks are dispatched by service, type and method while preserving configuration order.
+    """
+    target = "tests/hooks/request_hooks.py:{}"
+    hooks = [
+        {"type": "request", "path": "/jobs", "query": "", "method": "POST",
+         "target": target.format("add_x_wps_output_context")},
+        {"type": "response", "path": "/jobs/[a-z0-9-]+", "query": "", "method": "*",
+         "target": target.format("combined_arguments")},
+        {"type": "response", "path": "/jobs/[a-z0-9-]+", "query": "", "method": "GET",
+         "target": target.format("add_x_wps_output_link")},
+    ]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with mock.patch("magpie.adapter.get_constant", return_value=root):
+        dispatcher = ServiceHookDispatcher({"weaver": {"hooks": hooks}})
+
+    hooks_get = dispatcher.get_hooks("weaver", "response", "GET")
+    utils.check_val_equal([hook.config for hook in hooks_get], hooks[1:])
+    utils.check_val_equal([hook.params for hook in hooks_get], [("service", "hook", "context"), ("hook", )])
+    utils.check_val_equal(hooks_get[0].match("/jobs/abc-123", ""), True)
+    utils.check_val_equal(hooks_get[0].match("/jobs/abc-123/results", ""), False)
+    utils.check_val_equal([hook.config for hook in dispatcher.get_hooks("weaver", "response", "POST")], hooks[1:2])
+    utils.check_val_equal([hook.config for hook in dispatcher.get_hooks("weaver", "request", "POST")], hooks[:1])
+    utils.check_val_equal(dispatcher.get_hooks("weaver", "request", "GET"), [])
+    utils.check_val_equal(dispatcher.get_hooks("unknown", "request", "POST"), [])
+
+
 @unittest.skipIf(six.PY2, "Unsupported Twitcher for MagpieAdapter in Python 2")
 @pytest.mark.skipif(six.PY2, reason="Unsupported Twitcher for MagpieAdapter in Python 2")
 @runner.MAGPIE_TEST_LOCAL
@@ -154,6 +187,63 @@ class TestAdapter(ti.SetupMagpieAdapter, ti.UserTestCase, ti.BaseTestCase):
         req = self.mock_request(path, method="GET")
         utils.check_no_raise(lambda: self.ows.check_request(req), msg="Using [GET, {}]".format(path))
 
+    @utils.mocked_get_settings
+    def test_authorize_request(self):
+        """
+        Validate access decisions returned for the original request URI forwarded by a reverse proxy.
+        """
+        utils.warn_version(self, "authorization endpoint for reverse proxy", "3.33", skip=True)
+
+        path = "/ows/proxy/{}/{}".format(self.test_service_name, self.test_resource_name)
+        self.login_test_user()
+        for method in ["GET", "POST"]:
+            headers = dict(self.test_headers or {})
+            headers.update({"X-Original-URI": path, "X-Original-Method": method})
+            resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                      headers=headers, cookies=self.test_cookies)
+            utils.check_val_equal(resp.status_code, 200, msg="Using [{}, {}]".format(method, path))
+            utils.check_val_equal(resp.text, "")
+            utils.check_val_is_in("Cache-Control", resp.headers)
+
+        # unprotected or missing path are always refused to avoid unexpectedly granting access to anything else
+        headers = dict(self.test_headers or {})
+        headers.update({"X-Original-URI": "/other/{}".format(self.test_service_name)})
+        resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                  headers=headers, cookies=self.test_cookies)
+        utils.check_val_equal(resp.status_code, 403)
+        resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                  headers=self.test_headers, cookies=self.test_cookies)
+        utils.check_val_equal(resp.status_code, 403)
+
+        # percent-encoded path is resolved as the decoded one that the reverse proxy forwards
+        encoded = "".join("%{:02X}".format(ord(char)) for char in self.test_resource_name)
+        headers = dict(self.test_headers or {})
+        headers.update({"X-Original-URI": "/ows/proxy/{}/{}".format(self.test_service_name, encoded)})
+        resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                  headers=headers, cookies=self.test_cookies)
+        utils.check_val_equal(resp.status_code, 200)
+
+        # paths that are not normalized could refer to another location than the one forwarded and are refused
+        for uri in ["/ows/proxy/{s}/other/../{r}", "/ows/proxy/{s}//{r}", "/ows/proxy/{s}/%2E%2E/{s}/{r}"]:
+            uri = uri.format(s=self.test_service_name, r=self.test_resource_name)
+            headers = dict(self.test_headers or {})
+            headers.update({"X-Original-URI": uri})
+            resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                      headers=headers, cookies=self.test_cookies)
+            utils.check_val_equal(resp.status_code, 403, msg="Using [{}]".format(uri))
+
+        # unknown service cannot be resolved and is refused
+        headers = dict(self.test_headers or {})
+        headers.update({"X-Original-URI": "/ows/proxy/unittest-unknown-service"})
+        resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                  headers=headers, cookies=self.test_cookies)
+        utils.check_val_equal(resp.status_code, 403)
+
+        utils.check_or_try_logout_user(self)
+        resp = utils.test_request(self.test_adapter_app, "GET", "/authorize", expect_errors=True,
+                                  headers={"X-Original-URI": path})
+        utils.check_val_equal(resp.status_code, 401)
+
     @utils.mocked_get_settings
     def test_user_verify(self):
         self.login_admin()
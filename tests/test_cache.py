@@ -0,0 +1,209 @@
+import threading
+import time
+
+import mock
+import sqlalchemy as sa
+from beaker import cache as cache_mod
+from sqlalchemy.orm import Session, sessionmaker
+
+from magpie import cache, models
+from magpie.permissions import Access, Permission
+from tests import runner
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_resource_tree_index_find():
+    nodes = [
+        (2, 1, "dir"),
+        (3, 2, "Sub"),
+        (4, 3, "file.nc"),
+        (5, 2, "other"),
+    ]
+    index = cache.ResourceTreeIndex(1, 0, nodes)
+    assert index.find([]) == (None, 0)
+    assert index.find(["unknown"]) == (None, 0)
+    assert index.find(["dir"]) == (2, 1)
+    assert index.find(["DIR", "sub"]) == (3, 2), "name matching should be case-insensitive"
+    assert index.find(["dir", "sub", "file.nc"]) == (4, 3)
+    assert index.find(["dir", "sub", "file.nc", "extra"]) == (4, 3), "deepest match expected"
+    assert index.find(["dir", "unknown", "file.nc"]) == (2, 1), "must not skip unmatched level"
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_resource_tree_version_bump():
+    svc_id = -1  # avoid conflict with any real service
+    version = cache.get_resource_tree_version(svc_id)
+    cache.bump_resource_tree_version(svc_id)
+    assert cache.get_resource_tree_version(svc_id) == version + 1
+    cache.bump_resource_tree_version(None)  # ignored
+    assert cache.get_resource_tree_version(svc_id) == version + 1
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_cache_versions_bump():
+    engine = sa.create_engine("sqlite://")
+    names = ["resources", "resources_closure", "services", "cache_versions"]
+    models.Base.metadata.create_all(engine, tables=[models.Base.metadata.tables[name] for name in names])
+    session = sessionmaker(bind=engine)()
+    registered = sa.event.contains(Session, "after_flush", models.bump_cache_versions)
+    if registered:
+        sa.event.remove(Session, "after_flush", models.bump_cache_versions)
+    try:
+        session.add(models.Service(resource_name="a", resource_type="service", type="api", url="http://localhost/a"))
+        session.flush()
+        assert models.CacheVersion.get(models.CacheVersion.PERMISSIONS, session) == 0, "not updated unless enabled"
+
+        models.register_cache_versioning()
+        models.register_cache_versioning()  # ignored
+        session.add(models.Service(resource_name="b", resource_type="service", type="api", url="http://localhost/b"))
+        session.flush()
+        assert models.CacheVersion.get(models.CacheVersion.PERMISSIONS, session) == 1
+        session.flush()
+        assert models.CacheVersion.get(models.CacheVersion.PERMISSIONS, session) == 1, "unmodified must be ignored"
+    finally:
+        if not registered:
+            sa.event.remove(Session, "after_flush", models.bump_cache_versions)
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_anonymous_access_map():
+    nodes = [(1, None), (2, 1), (3, 2), (4, 3), (5, 1)]
+    permissions = [
+        (1, "read-allow-recursive", False),
+        (2, "read-deny-recursive", False),
+        (1, "write-allow-recursive", True),
+        (3, "write-deny-recursive", False),
+        (3, "browse-allow-match", False),
+    ]
+    access_map = cache.AnonymousAccessMap(1, 0, nodes, permissions)
+    assert access_map.access(5, Permission.READ, True) == Access.ALLOW
+    assert access_map.access(4, Permission.READ, True) == Access.DENY, "closest group permission expected"
+    assert access_map.access(4, Permission.WRITE, True) == Access.ALLOW, "direct permission has priority over group"
+    assert access_map.access(3, Permission.BROWSE, True) == Access.ALLOW
+    assert access_map.access(3, Permission.BROWSE, False) == Access.DENY, "match permission not applicable"
+    assert access_map.access(4, Permission.BROWSE, True) == Access.DENY, "match permission not inherited"
+    assert access_map.access(6, Permission.READ, True) is None, "unknown resource must not be resolved"
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_anonymous_access_map_not_applicable():
+    """
+    Validate that a service where the anonymous map cannot be employed is not looked up again on every request.
+    """
+    svc_id = -2  # avoid conflict with any real service
+    session = mock.MagicMock()
+    memberships = session.query.return_value.filter.return_value.join.return_value.join.return_value.all
+    memberships.return_value = [(1, 1, "anonymous"), (1, 2, "other")]
+    cache.invalidate_anonymous_access_maps(svc_id)
+    try:
+        with mock.patch.object(cache.LOGGER, "warning") as warning:
+            for _ in range(3):
+                assert cache.get_anonymous_access_map(svc_id, session, "anonymous", "anonymous") is None
+            assert session.query.call_count == 1, "outcome should be retained until the map is outdated"
+            assert warning.call_count == 1
+            with mock.patch("magpie.cache.time.time", return_value=time.time() + 20):
+                assert cache.get_anonymous_access_map(svc_id, session, "anonymous", "anonymous", expire=10) is None
+            assert session.query.call_count == 2, "outcome should be verified again once expired"
+            assert warning.call_count == 1, "warning should not be repeated while not applicable"
+    finally:
+        cache.invalidate_anonymous_access_maps(svc_id)
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_anonymous_access_map_single_build():
+    """
+    Validate that a map built by another thread while waiting on the lock is reused instead of being rebuilt.
+    """
+    svc_id = -3  # avoid conflict with any real service
+    session = mock.MagicMock()
+    session.query.side_effect = AssertionError("map should not be rebuilt")
+    results = []
+    cache.invalidate_anonymous_access_maps(svc_id)
+    try:
+        with cache._RESOURCE_TREE_LOCK:  # pylint: disable=W0212
+            thread = threading.Thread(target=lambda: results.append(
+                cache.get_anonymous_access_map(svc_id, session, "anonymous", "anonymous")))
+            thread.start()
+            time.sleep(0.1)  # let the thread wait on the lock
+            access_map = cache.AnonymousAccessMap(svc_id, cache.get_resource_tree_version(svc_id), [], [])
+            cache._ANONYMOUS_ACCESS_MAPS[svc_id] = access_map  # pylint: disable=W0212
+        thread.join(5)
+        assert results == [access_map]
+    finally:
+        cache.invalidate_anonymous_access_maps(svc_id)
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_lru_cache_store_eviction():
+    store = cache.LRUCacheStore(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    assert store["a"] == 1  # refresh 'a' such that 'b' becomes the least recently used
+    store.set("c", 3)
+    assert "a" in store
+    assert "b" not in store
+    assert "c" in store
+    stats = store.statistics()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["misses"] == 3
+    assert stats["hits"] == 1
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_lru_cache_store_expire():
+    store = cache.LRUCacheStore()
+    with mock.patch("magpie.cache.time.time", return_value=100):
+        store.set("a", 1, expire=10)
+        store.set("b", 2)
+    with mock.patch("magpie.cache.time.time", return_value=105):
+        assert "a" in store
+    with mock.patch("magpie.cache.time.time", return_value=110):
+        assert "a" not in store
+        assert "b" in store, "entry without expiration should remain available"
+    assert store.statistics()["evictions"] == 1
+
+
+@runner.MAGPIE_TEST_CACHING
+@runner.MAGPIE_TEST_UTILS
+def test_lru_cache_single_flight():
+    """
+    Validate that concurrent cache misses of a same key only compute the value once.
+    """
+    region = cache_mod.Cache("test_lru_cache_single_flight", type=cache.CACHE_TYPE_LRU, expire=60, max_entries=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(region.get("key", createfunc=compute)))
+               for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)  # let other threads block on the creation lock
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+    stats = cache.get_cache_statistics()["test_lru_cache_single_flight"]
+    assert stats["misses"] == 1
+    assert stats["coalesced"] == 4
+    assert stats["hits"] == 4
@@ -0,0 +1,57 @@
+import mock
+from prometheus_client import REGISTRY
+from pyramid.response import Response
+from pyramid.security import NO_PERMISSION_REQUIRED
+from pyramid.testing import DummyRequest
+
+from magpie import metrics, timing
+from tests import runner
+
+
+def get_sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_UTILS
+def test_metrics_disabled_ignored():
+    with mock.patch.dict("magpie.metrics._METRICS", {"enabled": False}):
+        before = get_sample("magpie_cache_requests_total", region="test-disabled", result="hit")
+        timing.record_cache("test-disabled", True)
+        assert get_sample("magpie_cache_requests_total", region="test-disabled", result="hit") == before
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_UTILS
+def test_request_metrics_tween():
+    def handler(request):
+        metrics.set_request_service_type(request, "test-service")
+        with timing.timed("test-section"):
+            timing.record_cache("test-region", True)
+            timing.record_cache("test-region", False)
+            timing.record_cache("test-region", True)
+        return Response()
+
+    with mock.patch.dict("magpie.metrics._METRICS", {"enabled": True}):
+        request = DummyRequest()
+        request.matched_route = mock.Mock()
+        request.matched_route.name = "test-route"
+        metrics.request_metrics_tween(handler, None)(request)
+
+    assert get_sample("magpie_request_duration_seconds_count", route="test-route", service_type="test-service") == 1
+    assert get_sample("magpie_section_duration_seconds_count", section="test-section") == 1
+    assert get_sample("magpie_cache_requests_total", region="test-region", result="hit") == 2
+    assert get_sample("magpie_cache_requests_total", region="test-region", result="miss") == 1
+
+    body, content_type = metrics.get_metrics()
+    assert content_type.startswith("text/plain")
+    assert b"magpie_request_duration_seconds_bucket{" in body
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_UTILS
+def test_metrics_permission():
+    assert metrics.get_metrics_permission({}) == NO_PERMISSION_REQUIRED
+    assert metrics.get_metrics_permission({"magpie.metrics_protected": "false"}) == NO_PERMISSION_REQUIRED
+    settings = {"magpie.metrics_protected": "true", "magpie.admin_permission": "admin"}
+    assert metrics.get_metrics_permission(settings) == "admin"
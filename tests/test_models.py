@@ -1,4 +1,16 @@
+import json
+
+import sqlalchemy as sa
+from pyramid.request import Request
+from pyramid.testing import setUp, tearDown
+from sqlalchemy.orm import sessionmaker
+
+from magpie import models
+from magpie.api.management.resource.resource_formats import format_services_resources, iter_format_services_resources
+from magpie.api.management.resource.resource_views import get_resources_view
+from magpie.api.management.service.service_formats import format_service, format_service_resources
 from magpie.models import UserStatuses
+from magpie.services import SERVICE_TYPE_DICT
 from tests import runner
 
 
@@ -67,3 +79,127 @@ def test_user_status_combinations():
         assert test_statuses[idx] is status  # iterated value is also an enum member, not plain int
     assert idx == 0
     assert merge_status.value == UserStatuses.Pending.value
+
+
+@runner.MAGPIE_TEST_UTILS
+@runner.MAGPIE_TEST_RESOURCES
+def test_resource_closure_tree():
+    """
+    Validate that the closure table is maintained and employed for retrieval of resources parents and children.
+    """
+    engine = sa.create_engine("sqlite://")
+    names = ["resources", "resources_closure", "services", "cache_versions"]
+    tables = [models.Base.metadata.tables[name] for name in names]
+    models.Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    tree = models.RESOURCE_TREE_SERVICE
+
+    svc = models.Service(resource_name="svc", resource_type="service", type="api", url="http://localhost")
+    session.add(svc)
+    session.flush()
+    res = {}
+    for name, parent in [("a", svc), ("b", svc), ("a1", "a"), ("a2", "a"), ("a11", "a1")]:
+        parent = res[parent] if isinstance(parent, str) else parent
+        res[name] = models.Route(resource_name=name, resource_type="route", ordering=len(res) + 1,
+                                 parent_id=parent.resource_id, root_service_id=svc.resource_id)
+        session.add(res[name])
+        session.flush()
+
+    def ancestors(name):
+        return [node.resource_name for node in tree.path_upper(res[name].resource_id, db_session=session)]
+
+    def children(resource):
+        nodes = tree.from_parent_deeper(resource.resource_id, db_session=session)
+        return {node.Resource.resource_name: (node.depth, node.path.count("/")) for node in nodes}
+
+    assert session.query(models.ResourceClosure).count() == 6 + 2 * 1 + 2 * 2 + 3, "self and parents"
+    assert ancestors("a11") == ["a11", "a1", "a", "svc"]
+    assert children(svc) == {"a": (1, 0), "b": (1, 0), "a1": (2, 1), "a2": (2, 1), "a11": (3, 2)}
+    assert children(res["a"]) == {"a1": (1, 0), "a2": (1, 0), "a11": (2, 1)}
+    subtree = tree.build_subtree_strut(tree.from_parent_deeper(svc.resource_id, limit_depth=2, db_session=session))
+    assert list(subtree["children"][res["a"].resource_id]["children"]) == [res["a1"].resource_id,
+                                                                           res["a2"].resource_id]
+
+    res["a1"].parent_id = res["b"].resource_id  # move the branch with its children
+    session.flush()
+    assert ancestors("a11") == ["a11", "a1", "b", "svc"]
+    assert children(res["a"]) == {"a2": (1, 0)}
+    assert children(res["b"]) == {"a1": (1, 0), "a11": (2, 1)}
+
+    tree.delete_branch(res["b"].resource_id, db_session=session)
+    session.expire_all()
+    assert children(svc) == {"a": (1, 0), "a2": (2, 1)}
+    closure = session.query(models.ResourceClosure.descendant_id).distinct()
+    assert {row.descendant_id for row in closure} == {svc.resource_id, res["a"].resource_id, res["a2"].resource_id}
+
+
+@runner.MAGPIE_TEST_UTILS
+@runner.MAGPIE_TEST_RESOURCES
+def test_find_services_resources_formatted():
+    """
+    Validate that resources of all services are retrieved in depth-first order to format their trees in a single pass.
+    """
+    engine = sa.create_engine("sqlite://")
+    names = ["resources", "resources_closure", "services", "cache_versions"]
+    tables = [models.Base.metadata.tables[name] for name in names]
+    models.Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+
+    services = {}
+    for name, svc_type in [("svc2", "api"), ("svc1", "api"), ("empty", "api"), ("other", "access")]:
+        services[name] = models.Service(resource_name=name, resource_type="service", type=svc_type,
+                                        url="http://localhost/" + name)
+        session.add(services[name])
+    session.flush()
+    res = {}
+    nodes = [("b", "svc1"), ("a", "svc1"), ("b1", "b"), ("a1", "a"), ("b11", "b1"), ("b2", "b"), ("c", "svc2")]
+    for name, parent in nodes:
+        parent = res.get(parent) or services[parent]
+        service_id = parent.resource_id if parent.parent_id is None else parent.root_service_id
+        res[name] = models.Route(resource_name=name, resource_type="route", ordering=len(res),
+                                 parent_id=parent.resource_id, root_service_id=service_id)
+        session.add(res[name])
+        session.flush()
+
+    service_ids = [svc.resource_id for svc in services.values()]
+    rows = models.find_services_resources(service_ids, session).all()
+    assert [(row.resource_name, row.depth) for row in rows] == [
+        ("b", 1), ("b1", 2), ("b11", 3), ("b2", 2), ("a", 1), ("a1", 2), ("c", 1)
+    ], "grouped by service type and name, each resource followed by its children ordered by position"
+
+    config = setUp(settings={"twitcher.protected_url": "http://localhost/ows/proxy"})
+    try:
+        svc_list = sorted(services.values(), key=lambda svc: (svc.type, svc.resource_name))
+        expect = {svc_type: {} for svc_type in SERVICE_TYPE_DICT}
+        for svc in svc_list:
+            expect[svc.type][svc.resource_name] = format_service_resources(
+                svc, session, show_all_children=True, show_private_url=False)
+        streamed = "".join(iter_format_services_resources(
+            [(svc, format_service(svc)) for svc in svc_list], iter(rows), SERVICE_TYPE_DICT))
+        result = format_services_resources([(svc, format_service(svc)) for svc in svc_list], rows, SERVICE_TYPE_DICT)
+
+        def count_queries(query):
+            statements = []
+
+            def capture(conn, cursor, statement, parameters, context, executemany):  # noqa: W0613
+                statements.append(statement)
+
+            request = Request.blank("/resources" + query)
+            request.db = session
+            request.registry = config.registry
+            session.expire_all()
+            sa.event.listen(engine, "before_cursor_execute", capture)
+            try:
+                body = json.loads(get_resources_view(request).body)
+            finally:
+                sa.event.remove(engine, "before_cursor_execute", capture)
+            return sum(len(body["resources"][svc_type]) for svc_type in body["resources"]), len(statements)
+
+        one_service, one_service_queries = count_queries("?limit=1")
+        all_services, all_services_queries = count_queries("")
+    finally:
+        tearDown()
+    assert result == expect
+    assert (one_service, all_services) == (1, len(services))
+    assert one_service_queries == all_services_queries, "query count must not grow with the number of services"
+    assert json.loads(streamed) == json.loads(json.dumps(expect)), "same as complete formatting in JSON response"
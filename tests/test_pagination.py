@@ -0,0 +1,100 @@
+import pytest
+import sqlalchemy as sa
+from pyramid import testing
+from pyramid.httpexceptions import HTTPBadRequest
+from pyramid.request import Request
+from six.moves.urllib.parse import urlencode
+from sqlalchemy.orm import sessionmaker
+
+from magpie import models
+from magpie.api.pagination import (
+    Pagination,
+    decode_cursor,
+    encode_cursor,
+    get_pagination,
+    paginate_query,
+    paginate_results
+)
+from magpie.models import UserStatuses
+from tests import runner
+
+
+@runner.MAGPIE_TEST_UTILS
+def test_cursor_encoding():
+    for value in ["user", "user-é/+?&=", 123]:
+        cursor = encode_cursor(value)
+        assert all(char.isalnum() or char in "-_" for char in cursor), "cursor must be safe in query parameters"
+        assert decode_cursor(cursor) == value
+    for cursor in ["!invalid!", encode_cursor("user")[:-2], "e30"]:  # 'e30' is '{}' that is not a cursor
+        with pytest.raises(ValueError):
+            decode_cursor(cursor)
+
+
+@runner.MAGPIE_TEST_UTILS
+def test_pagination_parameters():
+    with testing.testConfig(settings={"magpie.page_size_max": "10"}) as config:
+        def pagination(**query):
+            request = Request.blank("/users?{}".format(urlencode(query)))
+            request.registry = config.registry
+            return get_pagination(request)
+
+        assert pagination() is None
+        page = pagination(limit="5")
+        assert (page.limit, page.after) == (5, None)
+        page = pagination(limit="50")
+        assert page.limit == 10, "limit must be reduced to the configured maximum"
+        page = pagination(cursor=encode_cursor("user"))
+        assert (page.limit, page.after) == (10, "user"), "limit must default to the maximum with only a cursor"
+        for query in [{"limit": "0"}, {"limit": "-1"}, {"cursor": "!invalid!"}, {"cursor": encode_cursor(123)}]:
+            with pytest.raises(HTTPBadRequest):
+                pagination(**query)
+
+
+@runner.MAGPIE_TEST_USERS
+def test_users_keyset_pages():
+    """
+    Validate that pages of users follow each other by name, including combined statuses of pending users.
+    """
+    engine = sa.create_engine("sqlite://")
+    tables = [models.Base.metadata.tables[name] for name in ["users", "users_pending", "cache_versions"]]
+    models.Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    for name, status in [("e", 1), ("a", 1), ("d", 2), ("c", 1), ("f", 2)]:
+        session.add(models.User(user_name=name, email="{}@mail.com".format(name), status=status))
+    for name in ["b", "c", "g"]:  # 'c' also registered, such as pending user not yet removed after its approval
+        session.add(models.UserPending(user_name=name, email="{}@pending.com".format(name), user_password="x"))
+    session.flush()
+
+    def pages(status, limit):
+        names = []
+        pagination = Pagination(limit=limit)
+        while True:
+            users = models.UserSearchService.by_status_page(status, after=pagination.after, limit=limit + 1,
+                                                            db_session=session)
+            users, cursor = paginate_results(users, pagination, key=lambda user: user.user_name)
+            assert len(users) <= limit
+            names.append([user.user_name for user in users])
+            if cursor is None:
+                return names
+            pagination.after = decode_cursor(cursor)
+
+    assert pages(None, 2) == [["a", "c"], ["d", "e"], ["f"]]
+    assert pages(UserStatuses.OK, 2) == [["a", "c"], ["e"]]
+    assert pages(UserStatuses.Pending, 1) == [["b"], ["c"], ["g"]]
+    assert pages(UserStatuses.OK | UserStatuses.Pending, 2) == [["a", "b"], ["c", "e"], ["g"]]
+    assert pages(UserStatuses.OK | UserStatuses.Pending, 1) == [["a"], ["b"], ["c"], ["e"], ["g"]]
+    users = models.UserSearchService.by_status_page(UserStatuses.OK | UserStatuses.Pending, db_session=session)
+    assert [user.email for user in users if user.user_name == "c"] == ["c@mail.com"], "registered user expected"
+    assert pages(UserStatuses.all(), 3) == [["a", "b", "c"], ["d", "e", "f"], ["g"]]
+    assert pages(UserStatuses.all(), 7) == [["a", "b", "c", "d", "e", "f", "g"]]
+
+    # page following a cursor is not shifted by insertion of items before it
+    query = session.query(models.User.user_name)
+    first = list(paginate_query(query, models.User.user_name, Pagination(limit=2)))
+    first, cursor = paginate_results(first, Pagination(limit=2), key=lambda row: row.user_name)
+    session.add(models.User(user_name="b2", email="b2@mail.com", status=1))
+    session.flush()
+    pagination = Pagination(limit=2, after=decode_cursor(cursor))
+    second = list(paginate_query(query, models.User.user_name, pagination))
+    assert [row.user_name for row in first] == ["a", "c"]
+    assert [row.user_name for row in second] == ["d", "e", "f"], "one more item than limit indicates a next page"
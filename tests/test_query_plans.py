@@ -0,0 +1,147 @@
+"""
+Query plans regression tests of the permission tables.
+
+Statements emitted by the most frequent permission lookups are captured and analyzed with ``EXPLAIN`` to ensure that
+the permission and membership tables are always searched with an index, rather than sequentially scanned.
+
+An in-memory `SQLite` database is employed unless ``MAGPIE_QUERY_PLANS_DB_URL`` refers to another one. With
+`PostgreSQL`, sequential scans are disabled while planning such that the result does not depend on the amount of
+generated data, since a sequential scan is still reported when no index is applicable.
+"""
+import os
+import re
+import unittest
+
+import sqlalchemy as sa
+from pyramid.testing import setUp, tearDown
+from sqlalchemy.orm import sessionmaker
+from ziggurat_foundations.models.services.group import GroupService
+from ziggurat_foundations.models.services.resource import ResourceService
+from ziggurat_foundations.models.services.user import UserService
+
+from magpie import models
+from magpie.api.management.group.group_utils import get_group_resources
+from tests import runner
+from tests.benchmarks.deployment import DEPLOYMENT_TABLES, generate_deployment, get_benchmark_settings
+
+# tables that must never be sequentially scanned by the permission lookups
+INDEXED_TABLES = ["users_groups", "users_resources_permissions", "groups_resources_permissions"]
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_PERMISSIONS
+class TestQueryPlans(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        setUp(settings={"twitcher.protected_url": "http://localhost/ows/proxy"})
+        cls.engine = sa.create_engine(os.getenv("MAGPIE_QUERY_PLANS_DB_URL") or "sqlite://")
+        cls.postgres = cls.engine.dialect.name == "postgresql"
+        cls.tables = [models.Base.metadata.tables[name] for name in DEPLOYMENT_TABLES]
+        models.Base.metadata.create_all(cls.engine, tables=cls.tables)
+        cls.connection = cls.engine.connect()
+        cls.transaction = cls.connection.begin()
+        cls.session = sessionmaker(bind=cls.connection)()
+        cls.deployment = generate_deployment(cls.session, get_benchmark_settings(users=50, density=0.5))
+        if cls.postgres:
+            cls.connection.exec_driver_sql("ANALYZE")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+        cls.transaction.rollback()
+        cls.connection.close()
+        models.Base.metadata.drop_all(cls.engine, tables=cls.tables)
+        cls.engine.dispose()
+        tearDown()
+
+    def capture_statements(self, operation):
+        """
+        Runs the operation and returns the ``SELECT`` statements it emitted with their parameters.
+        """
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):  # noqa: W0613
+            if statement.lstrip().upper().startswith(("SELECT", "WITH", "(SELECT")):
+                statements.append((statement, parameters))
+
+        self.session.expire_all()
+        sa.event.listen(self.engine, "before_cursor_execute", capture)
+        try:
+            operation()
+        finally:
+            sa.event.remove(self.engine, "before_cursor_execute", capture)
+        return statements
+
+    def explain(self, statement, parameters):
+        """
+        Obtains the plan lines of the statement.
+        """
+        if self.postgres:
+            self.connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            rows = self.connection.exec_driver_sql("EXPLAIN " + statement, parameters)
+            return [row[0] for row in rows]
+        rows = self.connection.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters)
+        return [row[-1] for row in rows]
+
+    def assert_indexed(self, operation):
+        statements = self.capture_statements(operation)
+        self.assertTrue(statements, "Operation should have queried the database.")
+        checked = set()
+        for statement, parameters in statements:
+            tables = [table for table in INDEXED_TABLES if re.search(r"\b{}\b".format(table), statement)]
+            if not tables:
+                continue
+            plan = self.explain(statement, parameters)
+            for table in tables:
+                if self.postgres:
+                    scan = r"Seq Scan on {}\b".format(table)
+                else:
+                    scan = r"^SCAN (TABLE )?{}\b".format(table)
+                scans = [line for line in plan if re.search(scan, line)]
+                self.assertFalse(scans, "Table [{}] must be searched with an index.\nStatement:\n{}\nPlan:\n{}".format(
+                    table, statement, "\n".join(plan)))
+                checked.add(table)
+        self.assertTrue(checked, "Operation should have queried permission tables.")
+        return checked
+
+    def get_sample(self):
+        service_impl, service = self.deployment.services[0]  # pylint: disable=W0612
+        user = [usr for usr in self.deployment.users if len(usr.groups) > 1][0]
+        resource = self.deployment.resources[service.resource_id][-1][0]
+        return user, service, resource
+
+    def test_user_groups(self):
+        user, _, _ = self.get_sample()
+        checked = self.assert_indexed(lambda: list(user.groups))
+        self.assertIn("users_groups", checked)
+
+    def test_perms_for_user(self):
+        user, _, resource = self.get_sample()
+        checked = self.assert_indexed(lambda: ResourceService.perms_for_user(resource, user, db_session=self.session))
+        self.assertEqual(set(checked), set(INDEXED_TABLES))
+
+    def test_user_resources_with_possible_perms(self):
+        user, service, _ = self.get_sample()
+        resource_ids = [res.resource_id for res, _ in self.deployment.resources[service.resource_id]]
+        checked = self.assert_indexed(lambda: UserService.resources_with_possible_perms(
+            user, resource_ids=resource_ids, db_session=self.session))
+        self.assertEqual(set(checked), set(INDEXED_TABLES))
+
+    def test_group_resources_with_possible_perms(self):
+        _, service, _ = self.get_sample()
+        group = self.deployment.groups[-1]
+        resource_ids = [res.resource_id for res, _ in self.deployment.resources[service.resource_id]]
+        checked = self.assert_indexed(lambda: GroupService.resources_with_possible_perms(
+            group, resource_ids=resource_ids, db_session=self.session))
+        self.assertIn("groups_resources_permissions", checked)
+
+    def test_get_group_resources(self):
+        group = self.deployment.groups[-1]
+        checked = self.assert_indexed(lambda: get_group_resources(group, db_session=self.session))
+        self.assertIn("groups_resources_permissions", checked)
+
+    def test_find_resources_hierarchy_permissions(self):
+        user, _, resource = self.get_sample()
+        checked = self.assert_indexed(lambda: models.find_resources_hierarchy_permissions(
+            [resource.resource_id], user, db_session=self.session))
+        self.assertIn("users_resources_permissions", checked)
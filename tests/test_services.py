@@ -16,6 +16,7 @@ from typing import TYPE_CHECKING
 import mock
 import pytest
 import six
+from beaker.cache import Cache, cache_regions
 from sqlalchemy import inspect as sa_inspect
 
 from magpie import __meta__, models, owsrequest
@@ -27,8 +28,10 @@ from magpie.services import (
     ServiceGeoserver,
     ServiceGeoserverWMS,
     ServiceInterface,
+    ServiceNCWMS2,
     ServiceTHREDDS,
-    ServiceWPS
+    ServiceWPS,
+    apply_cache_events
 )
 from magpie.utils import CONTENT_TYPE_FORM, CONTENT_TYPE_JSON, CONTENT_TYPE_TXT_XML
 from tests import interfaces as ti
@@ -119,6 +122,115 @@ class TestOWSParser(unittest.TestCase):
         assert isinstance(parser, owsrequest.MultiFormatParser)
         assert parser.params["test"] == "something"
 
+    def test_ows_get_parser_expected_params(self):  # noqa: R0201
+        """
+        Validate that only requested parameters are retained and that parsing is reused for a same request.
+        """
+        request = utils.mock_request("/ows?SERVICE=WMS&Request=GetMap&LAYERS=Workspace:Layer&BBOX=1,2,3,4")
+        parser = owsrequest.get_request_parser(request)
+        assert isinstance(parser, owsrequest.OWSGetParser)
+        params = parser.parse(["service", "request", "layers", "version"])
+        assert params == {"service": "wms", "request": "getmap", "layers": "workspace:layer", "version": None}
+        assert "bbox" not in params
+        assert owsrequest.get_request_parser(request) is parser, "parser should be reused for the same request"
+        assert parser.parse(["bbox"])["bbox"] == "1,2,3,4"
+        other = utils.mock_request("/ows?SERVICE=WMS&Request=GetMap&LAYERS=Workspace:Layer&BBOX=1,2,3,4")
+        assert owsrequest.get_request_parser(other) is not parser
+
+    def test_ows_post_parser_sections(self):  # noqa: R0201
+        """
+        Validate that parameters are retrieved from the root element and first-level sections of the XML body.
+        """
+        inputs = "<wps:Input><ows:Identifier>data</ows:Identifier></wps:Input>" * 1000
+        body = six.ensure_binary(
+            '<?xml version="1.0" encoding="UTF-8"?>'  # pylint: disable=C4001
+            '<wps:Execute service="WPS" version="1.0.0" '
+            'xmlns:wps="http://www.opengis.net/wps/1.0.0" xmlns:ows="http://www.opengis.net/ows/1.1">'
+            "<ows:Identifier> process </ows:Identifier><wps:DataInputs>{}</wps:DataInputs></wps:Execute>".format(inputs)
+        )
+        request = utils.mock_request("", body=body, method="POST")
+        parser = owsrequest.ows_parser_factory(request)
+        assert isinstance(parser, owsrequest.OWSPostParser)
+        parser.chunk_size = 128
+        params = parser.parse(["service", "request", "version", "identifier", "unknown"])
+        assert params == {"service": "wps", "request": "execute", "version": "1.0.0",
+                          "identifier": "process", "unknown": None}
+
+        parser = owsrequest.ows_parser_factory(request)
+        parser.chunk_size = 128
+        parser.max_size = 256
+        params = parser.parse(["request", "identifier"])
+        assert params == {"request": "execute", "identifier": "process"}
+        assert parser.parse(["datainputs"])["datainputs"] is None, "section beyond size limit should not be parsed"
+
+
+@runner.MAGPIE_TEST_LOCAL
+@runner.MAGPIE_TEST_SERVICES
+@runner.MAGPIE_TEST_CACHING
+def test_service_acl_cache_key():
+    """
+    Validate that requests that only differ by parameters irrelevant to ACL resolution share the same cache key.
+    """
+    svc = models.Service(resource_name="ncWMS2", type=ServiceNCWMS2.service_type, url="http://localhost")
+    path = "/ows/proxy/ncWMS2/wms?SERVICE=WMS&REQUEST=GetMap&LAYERS=outputs/data.nc/PCP&BBOX={}&WIDTH={}"
+    req1 = utils.mock_request(path.format("0,0,10,10", 256))
+    req2 = utils.mock_request(path.format("10,10,20,20", 512))
+    req3 = utils.mock_request(path.format("0,0,10,10", 256).replace("PCP", "TAS").replace("data", "other"))
+    key1 = ServiceNCWMS2(svc, req1).acl_cache_key()
+    key2 = ServiceNCWMS2(svc, req2).acl_cache_key()
+    key3 = ServiceNCWMS2(svc, req3).acl_cache_key()
+    utils.check_val_equal(key1, key2)
+    utils.check_val_not_equal(key1, key3)
+
+    svc = models.Service(resource_name="thredds", type=ServiceTHREDDS.service_type, url="http://localhost")
+    req1 = utils.mock_request("/ows/proxy/thredds/dodsC/data.nc?time=1")
+    req2 = utils.mock_request("/ows/proxy/thredds/dodsC/data.nc?time=2")
+    utils.check_val_equal(ServiceTHREDDS(svc, req1).acl_cache_key(), ServiceTHREDDS(svc, req2).acl_cache_key())
+
+
+@runner.MAGPIE_TEST_LOCAL
+@runner.MAGPIE_TEST_SERVICES
+@runner.MAGPIE_TEST_CACHING
+def test_service_acl_cache_events():
+    """
+    Validate that cache events only remove the :term:`ACL` entries of the affected service and user.
+    """
+    region = {"enabled": True, "type": "memory", "expire": 60}
+    with mock.patch.dict(cache_regions, {"acl": region}):
+        namespace = getattr(ServiceInterface._get_acl_cached, "_arg_namespace")
+        cache = Cache._get_cache(namespace, region)
+        cache.clear()
+        for key in ["svc1 GET /ows/proxy/svc1 1 None", "svc1 GET /ows/proxy/svc1 2 None",
+                    "svc2 GET /ows/proxy/svc2 1 None", "svc2 GET /ows/proxy/svc2 2 None"]:
+            cache.put(key, [])
+
+        apply_cache_events([models.CacheEvent(scope=models.CacheEvent.SCOPE_USER, service_name="svc1", user_id=1)])
+        utils.check_val_equal(len(cache.namespace.dictionary), 3)
+        utils.check_val_equal("svc1 GET /ows/proxy/svc1 1 None" in cache, False)
+        apply_cache_events([models.CacheEvent(scope=models.CacheEvent.SCOPE_USER, user_id=2)])
+        utils.check_val_equal(len(cache.namespace.dictionary), 1)
+        utils.check_val_equal("svc2 GET /ows/proxy/svc2 1 None" in cache, True)
+        apply_cache_events([models.CacheEvent(scope=models.CacheEvent.SCOPE_GROUP, service_name="svc2")])
+        utils.check_val_equal(len(cache.namespace.dictionary), 0)
+
+
+@runner.MAGPIE_TEST_LOCAL
+@runner.MAGPIE_TEST_SERVICES
+@utils.mocked_get_settings
+def test_service_admin_member():
+    """
+    Validate that the administrator group is matched by its configured name among the groups of the user.
+    """
+    admin_name = "unittest-admin-group"
+    svc = models.Service(resource_name="api", type=ServiceAPI.service_type, url="http://localhost")
+    request = utils.mock_request("/ows/proxy/api", settings={"magpie.admin_group": admin_name})
+    service = ServiceAPI(svc, request)
+    admin = models.Group(id=2, group_name=admin_name)
+    other = models.Group(id=3, group_name=get_constant("MAGPIE_ADMIN_GROUP"))
+    utils.check_val_equal(service._is_admin_member({3: other}), False)  # pylint: disable=W0212
+    utils.check_val_equal(service._is_admin_member({2: admin, 3: other}), True)  # pylint: disable=W0212
+    utils.check_val_equal(service._is_admin_member({}), False)  # pylint: disable=W0212
+
 
 @runner.MAGPIE_TEST_LOCAL
 @runner.MAGPIE_TEST_SERVICES
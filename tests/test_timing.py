@@ -0,0 +1,54 @@
+import mock
+import pytest
+import sqlalchemy as sa
+from pyramid.response import Response
+from pyramid.testing import DummyRequest
+
+from magpie import timing
+from tests import runner
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_UTILS
+def test_timed_without_request_ignored():
+    with timing.timed("parse"):
+        timing.record_cache("acl", True)
+    assert timing.get_request_timings() is None
+
+
+@runner.MAGPIE_TEST_PERFORMANCE
+@runner.MAGPIE_TEST_UTILS
+def test_request_timings_tween():
+    timing.register_sql_timings()
+    engine = sa.create_engine("sqlite://")
+
+    @timing.timed("effective")
+    def resolve():
+        with engine.connect() as conn:
+            conn.execute(sa.text("SELECT 1"))
+            conn.execute(sa.text("SELECT 2"))
+
+    def handler(_request):
+        with timing.timed("parse"):
+            timing.record_cache("acl", False)
+        resolve()
+        with engine.connect() as conn:
+            with pytest.raises(sa.exc.OperationalError):
+                conn.execute(sa.text("SELECT * FROM unknown"))  # failed statement must not be measured
+        resolve()
+        timing.record_cache("acl", True)
+        return Response()
+
+    with mock.patch("magpie.timing._is_admin_request", return_value=False):
+        resp = timing.request_timings_tween(handler, None)(DummyRequest())
+    assert "Server-Timing" not in resp.headers, "breakdown must only be returned to administrators"
+    with mock.patch("magpie.timing._is_admin_request", return_value=True):
+        resp = timing.request_timings_tween(handler, None)(DummyRequest())
+    assert timing.get_request_timings() is None, "measurements must not leak outside the request"
+
+    metrics = [metric.split(";") for metric in resp.headers["Server-Timing"].split(", ")]
+    names = [metric[0] for metric in metrics]
+    assert names == ["parse", "effective", "sql", "cache-acl", "total"]
+    assert metrics[1][2] == "desc=\"2 calls\""
+    assert metrics[2][2] == "desc=\"4 statements\""
+    assert metrics[3][1] == "desc=\"1 hit / 1 miss\""